@@ -5,6 +5,9 @@
 
 # configured to use pyinstaller with options for Windows env
 
+# the app is built as a folder rather than a single executable, so that
+# it starts without unpacking itself into a temporary folder on each launch
+
 if [[ "$#" -ne 1 ]]; then
   echo "This script builds the app, intended for distribution."
   echo "Intended for developer usage only."
@@ -14,17 +17,28 @@ if [[ "$#" -ne 1 ]]; then
   exit 1
 fi
 
+# this script must reside in project root dir
+ROOT="$(dirname $0)"
+PYTHON="$(command -v python3 || command -v python)"
+
+# check the import budget of the headless package (see tests/test_imports.py)
+if ! "$PYTHON" -m pytest -q "$ROOT"/tests/test_imports.py; then
+  echo "import budget check failed"
+  exit 1
+fi
+
 if [ -x "$(command -v pyinstaller)" ]; then
-  # this script must reside in project root dir
-  ROOT="$(dirname $0)"
-  DISTDIR="$ROOT"/dist/dtm-simulator
+  DISTDIR="$ROOT"/dist
   pyinstaller --distpath "$DISTDIR" \
               --workpath "$ROOT"/build \
               --specpath "$ROOT" \
+              --paths "$ROOT"/src \
               --noconsole \
-              --onefile \
+              --onedir \
+              --noconfirm \
               --name dtm-simulator \
               "$ROOT"/src/"$1"
+  DISTDIR="$DISTDIR"/dtm-simulator
   # copy license into dist dir if not exists
   if ! [ -f "$DISTDIR"/LICENSE.txt ]; then
     cp "$ROOT"/LICENSE.txt "$DISTDIR"
@@ -0,0 +1,13 @@
+"""
+A tool that can help design and test a deterministic Turing machine.
+
+The package is headless: importing it, or any module but gui, never imports
+tkinter, so scripts and worker processes start quickly. The application is
+started by gui.main(), e.g. with `python3 -m dtm_simulator`.
+"""
+
+from .core import (Machine, MachineSnapshot, RunResult, Tape, MappedTape, Transition, TestingState,
+    input_tape, save_machine, load_machine, count_strings, nth_string, iter_strings,
+    SEMI_INFINITE, TWO_WAY, ACCEPT, LEFT_EDGE, NO_TRANSITION, ABORTED, BUDGET, LOOPS)
+
+__version__ = '1.0.0'
@@ -0,0 +1,5 @@
+"""Start the application with `python3 -m dtm_simulator`."""
+
+from .gui import main
+
+main()
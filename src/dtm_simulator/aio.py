@@ -0,0 +1,129 @@
+"""
+Computations run cooperatively in an asyncio event loop.
+
+A computation runs in slices of a number of steps, yielding to the event
+loop between slices, so many of them can share one loop, and thread, with
+other tasks. A computation is cancelled like any other task, at the end of
+its current slice, so asyncio.wait_for() and the other timeouts of asyncio
+apply to it as they are.
+
+Each computation runs on a snapshot of the machine taken when it starts, so
+the machine can be edited while it runs.
+"""
+
+import asyncio
+from .core import RunResult, MappedTape, input_tape, BUDGET, TWO_WAY
+
+# number of steps a computation takes before yielding to the event loop
+SLICE_STEPS = 10000
+
+async def compute_async(machine, string, as_function=False, slice_steps=SLICE_STEPS):
+    """Compute the given string like core.Machine.compute(), yielding to the
+    event loop every slice_steps steps, and return the same result.
+
+    Parameters:
+        machine (core.Machine): The machine to run. Must be deterministic.
+        string (str): The string to compute, or another input accepted by
+            core.input_tape().
+        as_function (bool): Whether or not to use the machine as a function.
+            (default False)
+        slice_steps (int): The number of steps taken between yields to the
+            event loop. (default SLICE_STEPS)
+    """
+    _check(machine)
+    tape = input_tape(string, machine.blank, machine.tape_model == TWO_WAY)
+    if not isinstance(tape, MappedTape) or tape.complete:
+        tape[tape.end] = machine.blank
+    result = await _run(machine.snapshot(), tape, as_function, None, None, slice_steps)
+    return result.summary()
+
+async def run_async(machine, string, as_function=False, max_steps=None, coverage=None,
+        slice_steps=SLICE_STEPS):
+    """Run the machine on the given string like core.Machine.run(), yielding to
+    the event loop every slice_steps steps, and return a core.RunResult.
+
+    The elapsed time of the result is the time spent running the machine, not
+    waiting for the event loop.
+
+    Parameters:
+        machine (core.Machine): The machine to run. Must be deterministic.
+        string (str): The string to compute, or another input accepted by
+            core.input_tape().
+        as_function (bool): Whether or not to use the machine as a function.
+            (default False)
+        max_steps (int): The number of steps to run at most, None for no limit.
+            (default None)
+        coverage (set): If given, (state, read symbol) of every transition
+            used is added to this set. (default None)
+        slice_steps (int): The number of steps taken between yields to the
+            event loop. (default SLICE_STEPS)
+    """
+    _check(machine)
+    tape = input_tape(string, machine.blank, machine.tape_model == TWO_WAY)
+    return await _run(machine.snapshot(), tape, as_function, max_steps, coverage, slice_steps)
+
+def _check(machine):
+    # raise an Exception if the machine cannot be run
+    if len(machine.states) == 0:
+        raise Exception('empty machine')
+    if machine.nondeterministic:
+        raise Exception('Non-deterministic machine cannot be run, use search()')
+
+async def _run(machine, tape, as_function, max_steps, coverage, slice_steps):
+    # run the machine from its initial state on the tape, a slice of steps at a
+    # time, and return the RunResult of the whole run
+    state = machine.init_state
+    min_index = max_index = index = steps = 0
+    elapsed = 0.0
+    while True:
+        budget = slice_steps if max_steps is None else min(slice_steps, max_steps - steps)
+        result = machine._execute(tape, state, index, as_function, budget, coverage, steps)
+        state, index, steps = result.state, result.index, result.steps
+        min_index = min(min_index, result.min_index)
+        max_index = max(max_index, result.max_index)
+        elapsed += result.elapsed
+        if result.reason != BUDGET or steps == max_steps:
+            break
+        await asyncio.sleep(0)
+    return RunResult(result.reason, as_function, state, index, steps, tape, min_index, max_index,
+        elapsed, tracks=machine.tracks)
+
+async def run_many(machine, strings, as_function=False, max_steps=None, limit=16,
+        slice_steps=SLICE_STEPS):
+    """Run the machine on each of the given strings with run_async(), at most
+    limit of them at a time, and return their core.RunResult objects in the
+    order of the strings.
+
+    Strings are taken from the iterable as runs finish, so it can be a
+    generator of more strings than fit in memory at once. If a run raises an
+    exception or this is cancelled, the other runs are cancelled.
+
+    Parameters:
+        machine (core.Machine): The machine to run. Must be deterministic.
+        strings (iterable): The strings to compute.
+        as_function (bool): Whether or not to use the machine as a function.
+            (default False)
+        max_steps (int): The number of steps each run can take at most, None
+            for no limit. (default None)
+        limit (int): The number of runs in progress at most. (default 16)
+        slice_steps (int): The number of steps a run takes between yields to
+            the event loop. (default SLICE_STEPS)
+    """
+    _check(machine)
+    machine = machine.snapshot()
+    strings = iter(strings)
+    results = []
+    async def worker():
+        # run strings one at a time until there are none left
+        for string in strings:
+            results.append(None)
+            i = len(results) - 1
+            tape = input_tape(string, machine.blank, machine.tape_model == TWO_WAY)
+            results[i] = await _run(machine, tape, as_function, max_steps, None, slice_steps)
+    tasks = [asyncio.ensure_future(worker()) for _ in range(limit)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+    return results
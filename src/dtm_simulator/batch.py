@@ -0,0 +1,264 @@
+"""
+Batches of inputs run in the background, on a pool of worker processes.
+
+A BatchRun runs its inputs in chunks and appends a row per input to its
+results as the chunks complete, in the order of the inputs, so a display
+can show them while the batch is still running.
+"""
+
+import os
+import threading
+import time
+from .core import Tape, TWO_WAY, ACCEPT, LEFT_EDGE, NO_TRANSITION, ABORTED, BUDGET, LOOPS
+
+# number of tape cells kept of each run
+TAPE_PREFIX_LENGTH = 32
+
+# indices of the fields of a row of results
+INPUT = 0
+OUTCOME = 1
+TAPE = 2
+STEPS = 3
+ELAPSED = 4
+
+def run_chunk(machine, strings, as_function, max_steps, cancelled=None):
+    """Return the rows of results of the machine on the given strings.
+
+    A row is a tuple (input, outcome, tape, steps, elapsed): outcome is 'accept'
+    or 'reject', 'halt' for a function, or the reason the run was stopped (see
+    core.RunResult), and tape the first cells of the tape left, their tracks
+    separated by '|' on a multi-track tape. If the function cancelled is given,
+    it is called between runs and the rows so far are returned once it
+    returns True.
+    """
+    rows = []
+    for string in strings:
+        if cancelled is not None and cancelled():
+            break
+        result = machine.run(string, as_function, max_steps)
+        tape = result.tape
+        rows.append(_row(machine, string, result.reason, as_function,
+            tape.to_string(tape.start, tape.start + TAPE_PREFIX_LENGTH), result.steps, result.elapsed))
+    return rows
+
+def run_chunk_shared(machine, strings, as_function, max_steps, cancelled=None):
+    """Return the same rows of results as run_chunk(), taking the steps the
+    runs of strings with a common prefix share only once.
+
+    A run reads the cells of its input from left to right, so up to the first
+    cell past a prefix, the runs of the strings starting with it take the same
+    steps. The strings are sorted into a trie, and a run of each node of the
+    trie takes those steps, then forks at that cell into a run per child,
+    each on its own copy of the tape. A run halting before the cell is the run
+    of all the strings of its node, which differ only by the cells it did not
+    read. The elapsed time of a row is the time taken by the runs along the
+    path of its string. If the function cancelled is given, it is called
+    between runs and, once it returns True, the rows are returned with None
+    for the strings not run.
+    """
+    if len(strings) == 0:
+        return []
+    rows = [None] * len(strings)
+    order = sorted(range(len(strings)), key=strings.__getitem__)
+    dispatch = machine._compile()
+    blank = machine.blank
+    limit = -1 if max_steps is None else max_steps
+    tape = Tape('', blank, machine.tape_model == TWO_WAY)
+    # runs left to take: the range of order of the strings of a node, the
+    # length of their common prefix already on the tape, and the run at the
+    # first cell past it
+    pending = [(0, len(order), 0, tape, machine.init_state, 0, 0, 0.0)]
+    while pending:
+        if cancelled is not None and cancelled():
+            break
+        lo, hi, depth, tape, state, index, steps, elapsed = pending.pop()
+        # the strings of the node share the prefix of its first and last
+        first = strings[order[lo]]
+        last = strings[order[hi - 1]]
+        end = depth
+        while end < len(first) and end < len(last) and first[end] == last[end]:
+            tape[end] = first[end]
+            end += 1
+        started = time.perf_counter()
+        reason, state, index, steps = _run_to(machine, dispatch, tape, state, index, steps, limit,
+            as_function, end)
+        elapsed += time.perf_counter() - started
+        if reason is not None:
+            cells = tape.to_string(tape.start, end)
+            for k in range(lo, hi):
+                string = strings[order[k]]
+                # a run of a string ending at the cell reached would have
+                # added a blank cell there
+                rest = string[end:] if len(string) > end or index != end or end == 0 else blank
+                rows[order[k]] = _row(machine, string, reason, as_function,
+                    (cells + rest[:TAPE_PREFIX_LENGTH])[:TAPE_PREFIX_LENGTH], steps, elapsed)
+            continue
+        # the strings ending at the cell, then a child per symbol on it
+        branches = []
+        k = lo
+        while k < hi and len(strings[order[k]]) == end:
+            k += 1
+        if k > lo:
+            branches.append((lo, k))
+        while k < hi:
+            child = k
+            symbol = strings[order[k]][end]
+            while k < hi and strings[order[k]][end] == symbol:
+                k += 1
+            branches.append((child, k))
+        for n, (child, child_end) in enumerate(branches):
+            branch_tape = tape if n == len(branches) - 1 else tape.copy()
+            if len(strings[order[child]]) > end:
+                pending.append((child, child_end, end, branch_tape, state, index, steps, elapsed))
+                continue
+            if end > 0:
+                branch_tape[end] = blank
+            result = machine._execute(branch_tape, state, index, as_function,
+                None if max_steps is None else max_steps - steps, steps=steps)
+            prefix = branch_tape.to_string(branch_tape.start, branch_tape.start + TAPE_PREFIX_LENGTH)
+            for k in range(child, child_end):
+                rows[order[k]] = _row(machine, strings[order[k]], result.reason, as_function,
+                    prefix, result.steps, elapsed + result.elapsed)
+    return rows
+
+def _run_to(machine, dispatch, tape, state, index, steps, limit, as_function, frontier):
+    # run the machine from the given configuration as Machine._execute() does,
+    # until it halts or its head reaches the cell at index frontier, past the
+    # cells of the tape, returning (reason, state, index, steps), reason being
+    # None if it reached the cell
+    final_states = machine.final_states
+    two_way = tape.two_way
+    blank = machine.blank
+    while True:
+        if not as_function and final_states[state]:
+            return (ACCEPT, state, index, steps)
+        if steps == limit:
+            return (BUDGET, state, index, steps)
+        if machine.abort:
+            return (ABORTED, state, index, steps)
+        if index == frontier:
+            return (None, state, index, steps)
+        target = dispatch[state][tape[index]]
+        if target is None:
+            return (NO_TRANSITION, state, index, steps)
+        write, step, state = target
+        tape[index] = write
+        index += step
+        steps += 1
+        if index < 0 and not two_way:
+            return (LEFT_EDGE, state, index, steps)
+        if index < tape.start:
+            tape[index] = blank
+
+def _row(machine, string, reason, as_function, prefix, steps, elapsed):
+    # return the row of results of a run of the string
+    if reason in (ABORTED, BUDGET, LOOPS):
+        outcome = reason
+    elif as_function:
+        outcome = 'halt'
+    else:
+        outcome = 'accept' if reason == ACCEPT else 'reject'
+    if machine.tracks is not None:
+        prefix = '|'.join(machine.tracks.split(prefix))
+    return (string, outcome, prefix, steps, elapsed)
+
+class BatchRun():
+    """This is a class to run a batch of inputs on a machine in the background.
+
+    Attributes:
+        strings (list): The inputs of the batch.
+        as_function (bool): Whether or not the machine is used as a function.
+        max_steps (int): The number of steps each run can take at most.
+        rows (list): The rows of results so far, in the order of the inputs
+            (see run_chunk()). Only appended to, so it can be read while the
+            batch is running.
+        done (bool): Whether or not the batch has finished or was cancelled.
+        error (str): Why the batch stopped early, None if it did not.
+        elapsed (float): The wall time the batch took so far, in seconds.
+    """
+
+    def __init__(self, machine, strings, as_function=False, max_steps=10000, workers=None, chunk_size=256,
+            share_prefixes=False):
+        """Start running the given inputs on a snapshot of the machine.
+
+        Parameters:
+            machine (core.Machine): The machine to run. Must be deterministic.
+            strings (iterable): The inputs to run.
+            as_function (bool): Whether or not to use the machine as a function.
+                (default False)
+            max_steps (int): The number of steps each run can take at most.
+                (default 10000)
+            workers (int): The number of worker processes, 1 to run the inputs
+                on a thread of this process. (default the number of CPUs)
+            chunk_size (int): The number of inputs given to a worker at a time.
+                (default 256)
+            share_prefixes (bool): Whether or not to run the inputs of a chunk
+                with run_chunk_shared(), which takes the steps shared by inputs
+                with a common prefix once; the larger the chunks, the more steps
+                are shared. (default False)
+        """
+        if len(machine.states) == 0:
+            raise Exception('empty machine')
+        if machine.nondeterministic:
+            raise Exception('Non-deterministic machine cannot be run, use search()')
+        self.strings = list(strings)
+        self.as_function = as_function
+        self.max_steps = max_steps
+        self.rows = []
+        self.done = False
+        self.error = None
+        self.elapsed = 0.0
+        self._machine = machine.snapshot()
+        self._workers = (os.cpu_count() or 1) if workers is None else workers
+        self._chunk_size = chunk_size
+        self._run_chunk = run_chunk_shared if share_prefixes else run_chunk
+        self._cancelled = False
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Stop the batch, keeping the rows of results so far."""
+        self._cancelled = True
+        self._machine.abort = True
+
+    def wait(self, timeout=None):
+        """Wait until the batch is done, at most timeout seconds if given."""
+        self._thread.join(timeout)
+        return self.done
+
+    def _run(self):
+        # run the chunks of the batch, appending their rows as they complete
+        chunks = ((self.strings[start:start + self._chunk_size], self.as_function, self.max_steps)
+            for start in range(0, len(self.strings), self._chunk_size))
+        try:
+            if self._workers == 1:
+                for chunk in chunks:
+                    rows = self._run_chunk(self._machine, *chunk, cancelled=self._is_cancelled)
+                    # the rows of a chunk cut short are dropped
+                    if self._cancelled:
+                        break
+                    self._add(rows)
+            else:
+                from .parallel import imap_chunks
+                chunk_rows = imap_chunks(self._run_chunk, chunks, self._workers, (self._machine.to_dict(),))
+                try:
+                    for rows in chunk_rows:
+                        if self._cancelled:
+                            break
+                        self._add(rows)
+                finally:
+                    chunk_rows.close()
+        except Exception as e:
+            self.error = str(e)
+        self.elapsed = time.monotonic() - self._started
+        self.done = True
+
+    def _is_cancelled(self):
+        # whether or not the batch was cancelled, checked between runs
+        return self._cancelled
+
+    def _add(self, rows):
+        # append the rows of a chunk that completed
+        self.rows.extend(rows)
+        self.elapsed = time.monotonic() - self._started
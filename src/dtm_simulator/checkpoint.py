@@ -0,0 +1,129 @@
+"""
+Checkpoints of long-running computations, so they can be resumed after the
+process dies or the user stops them.
+
+A checkpoint holds the fingerprint of the machine, the configuration of the
+computation and its tape as runs of equal symbols, compressed with zlib. It
+is written to a temporary file that then replaces the checkpoint file, so a
+checkpoint file is never left half-written.
+"""
+
+import json
+import os
+import tempfile
+import time
+import zlib
+from .core import Tape
+
+# first bytes of a checkpoint file
+_MAGIC = b'DTMC1\n'
+
+class Checkpoint():
+    """This is a class to represent a checkpoint of a computation.
+
+    Attributes:
+        fingerprint (str): The fingerprint of the machine computing.
+        state (int): The current state of the machine.
+        index (int): The current index on the tape.
+        steps (int): The number of steps taken so far.
+        as_function (bool): Whether or not the machine is used as a function.
+        tape (core.Tape): The tape of the computation.
+    """
+
+    def __init__(self, fingerprint, state, index, steps, as_function, tape):
+        """Initialize this checkpoint with the given values."""
+        self.fingerprint = fingerprint
+        self.state = state
+        self.index = index
+        self.steps = steps
+        self.as_function = as_function
+        self.tape = tape
+
+    def save(self, path):
+        """Write this checkpoint to the file at path, replacing it atomically."""
+        data = {
+            'fingerprint': self.fingerprint,
+            'state': self.state,
+            'index': self.index,
+            'steps': self.steps,
+            'as_function': self.as_function,
+            'blank': self.tape.blank,
+            'two_way': self.tape.two_way,
+            'start': self.tape.start,
+            'runs': list(self.tape.runs())
+        }
+        content = _MAGIC + zlib.compress(json.dumps(data, separators=(',', ':')).encode('utf-8'), 1)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.checkpoint-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """Return the checkpoint saved in the file at path."""
+        with open(path, 'rb') as f:
+            content = f.read()
+        if not content.startswith(_MAGIC):
+            raise Exception('Invalid checkpoint file')
+        try:
+            data = json.loads(zlib.decompress(content[len(_MAGIC):]).decode('utf-8'))
+            tape = Tape.from_runs(data['runs'], data['start'], data['blank'], data['two_way'])
+            return cls(data['fingerprint'], data['state'], data['index'], data['steps'],
+                data['as_function'], tape)
+        except (zlib.error, ValueError, KeyError, TypeError):
+            raise Exception('Invalid checkpoint file')
+
+class Checkpointer():
+    """This is a class to write the checkpoints of one computation periodically.
+
+    A checkpoint is due every interval seconds, or less often if writing the
+    last checkpoint took longer than max_overhead of that interval, so that
+    writing checkpoints costs at most about max_overhead of the running time.
+
+    Attributes:
+        path (str): The path of the checkpoint file.
+        interval (float): The number of seconds between checkpoints.
+        max_overhead (float): The largest share of time to spend writing.
+        last (Checkpoint): The last checkpoint written, None if there is none.
+    """
+
+    def __init__(self, path, interval=60.0, max_overhead=0.01):
+        """Initialize this checkpointer to write to the file at path.
+
+        Parameters:
+            path (str): The path of the checkpoint file.
+            interval (float): The number of seconds between checkpoints.
+                (default 60.0)
+            max_overhead (float): The largest share of time to spend writing.
+                (default 0.01)
+        """
+        self.path = path
+        self.interval = interval
+        self.max_overhead = max_overhead
+        self.last = None
+        self._fingerprint = None
+        self._next_due = time.monotonic() + interval
+
+    def due(self):
+        """Return True if the next checkpoint is due."""
+        return time.monotonic() >= self._next_due
+
+    def save(self, machine, state, index, steps, as_function, tape):
+        """Write a checkpoint of the computation of the given machine.
+
+        The machine's fingerprint is computed on the first checkpoint only,
+        as the machine is assumed not to change during the computation.
+        """
+        started = time.monotonic()
+        if self._fingerprint is None:
+            self._fingerprint = machine.fingerprint()
+        self.last = Checkpoint(self._fingerprint, state, index, steps, as_function, tape)
+        self.last.save(self.path)
+        finished = time.monotonic()
+        self._next_due = finished + max(self.interval, (finished - started) / self.max_overhead)
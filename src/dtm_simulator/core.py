@@ -0,0 +1,1830 @@
+"""
+Classes to represent the DTM, transitions within it and a testing state
+during computation
+"""
+
+import re
+import os
+import json
+import itertools
+import time
+
+# tape models of the machine
+SEMI_INFINITE = 'semi-infinite'
+TWO_WAY = 'two-way'
+
+# reasons for a computation to halt
+ACCEPT = 'accept'
+LEFT_EDGE = 'left-edge'
+NO_TRANSITION = 'no-transition'
+ABORTED = 'aborted'
+BUDGET = 'budget'
+LOOPS = 'loops'
+
+# number of steps between checks of whether a checkpoint is due
+CHECKPOINT_CHECK_STEPS = 4096
+
+# write symbol of a transition that writes back the symbol it read
+WRITE_SAME = '[=]'
+
+# a MappedTape copies the cells of its input in pages of 2 ** TAPE_PAGE_BITS
+# cells when they are first written
+TAPE_PAGE_BITS = 12
+TAPE_PAGE_SIZE = 1 << TAPE_PAGE_BITS
+TAPE_PAGE_MASK = TAPE_PAGE_SIZE - 1
+
+# the symbol of each byte of a MappedTape
+_BYTE_SYMBOLS = tuple(chr(i) for i in range(256))
+
+# cells of a multi-track tape holding symbols on other tracks than the first are
+# characters of the Unicode private use planes, from TRACK_BASE on (see TrackLayout)
+TRACK_BASE = 0xF0000
+TRACK_CODES = 0x110000 - TRACK_BASE
+
+# characters that cannot be track symbols, as they delimit the configuration of
+# a multi-track transition
+TRACK_RESERVED = '|,[]^=()'
+
+class Machine():
+    """This is a class to simulate a deterministic Turing machine, with either
+    a semi-infinite or a two-way infinite tape. The machine can optionally be
+    non-deterministic.
+
+    Attributes:
+        num_states (int): The number of states in the machine.
+        max_state_num (int): The largest state number in the machine.
+        blank (str): The character representing the blank symbol on the tape.
+            (default '#')
+        transitions (dict): Dictionary equivalent to an adjacency list, mapping
+            their state numbers and storing a set of all transitions between
+            them
+        states (set): A set containing all the current state numbers.
+        init_state (int): State number of the initial state. (default 0 for
+            no inital state set)
+        final_states (dict): Dictionary mapping each state number to True
+            if it is a final state, False otherwise.
+        tape_model (str): Either SEMI_INFINITE, where the machine halts and
+            rejects when moving left of index 0, or TWO_WAY, where the tape is
+            infinite in both directions. (default SEMI_INFINITE)
+        nondeterministic (bool): Whether or not a state can have more than one
+            transition on the same read symbol. Use set_nondeterministic()
+            to change it. (default False)
+        tracks (TrackLayout): The tracks of the tape, None for a single track.
+            Use set_tracks() to change it. (default None)
+        abort (bool): Flag to indicate aborting a computation test. Should
+            only be set to True to stop the machine from further executing
+            an infinite loop during the compute() function.
+
+    The per-state transition maps are shared with any snapshots taken of the
+    machine (see snapshot()) and are only copied when they are next modified.
+    """
+
+    def __init__(self, num_states, blank_symbol='#', init_state=0, tape_model=SEMI_INFINITE,
+            nondeterministic=False):
+        """Initialize machine with the given number of states, blank symbol,
+        inital state, tape model and determinism.
+
+        Parameters:
+            num_states (int): Initial number of states in the machine. Cannot
+                be negative.
+            blank_symbol (str): Character to represent the blank symbol on the
+                tape. (default '#') Only first character of the string is set.
+            init_state (int): State number of the initial state. (default 0)
+                Must be in range(num_states+1), else set to 0.
+            tape_model (str): Either SEMI_INFINITE or TWO_WAY.
+                (default SEMI_INFINITE)
+            nondeterministic (bool): Whether or not the machine is
+                non-deterministic. (default False)
+        """
+        if type(num_states) is not int:
+            raise TypeError('num_states arg must be an integer')
+        if num_states < 0:
+            raise Exception('num_states arg cannot be less than zero')
+        if tape_model not in (SEMI_INFINITE, TWO_WAY):
+            raise Exception('Invalid tape model')
+        self.num_states = num_states
+        self.max_state_num = num_states
+        self.blank = blank_symbol[0]
+        self.transitions = {}
+        self.states = set([])
+        self.init_state = init_state if init_state in range(num_states+1) else 0
+        self.final_states = {}
+        self.tape_model = tape_model
+        self.nondeterministic = nondeterministic
+        self.tracks = None
+        self.abort = False
+        # per-state lookup of the transition to use for each read symbol,
+        # built on demand by _compile() and dropped whenever transitions change
+        self._dispatch = None
+        # incremented on every snapshot; a state's transition map is only
+        # writable in place if it was created or copied in the current epoch
+        self._cow_epoch = 0
+        self._map_epochs = {}
+        # functions called after every change to the machine (see add_listener())
+        self._listeners = []
+        # per-state indices of the transitions, kept up to date by every change:
+        # the non-negated transitions reading each symbol, the negated ones, each
+        # transition by (to_state, cnf), and the sources of the transitions into
+        # each state, so that changes cost O(degree) rather than O(states)
+        self._readers = {}
+        self._negated = {}
+        self._by_cnf = {}
+        self._sources = {}
+        for i in range(1, num_states+1):
+            self.transitions[i] = {}
+            self._map_epochs[i] = self._cow_epoch
+            self.final_states[i] = False
+            self.states.add(i)
+            self._new_indices(i)
+    
+    def get_info(self):
+        """Return a dictionary containing machine information.
+
+        Keys of the dictionary include: '# of states', 'Non-final states',
+        'Final states', '# of non-final states', '# of final states',
+        '# of transitions', 'Transitions'.
+        """
+        info = {}
+        info['# of states'] = self.num_states
+        final_states = []
+        nonfinal_states = []
+        for state_num in self.final_states:
+            if self.final_states[state_num]:
+                final_states.append(str(state_num))
+            else:
+                nonfinal_states.append(str(state_num))
+        info['Non-final states'] = ' '.join(nonfinal_states)
+        info['Final states'] = ' '.join(final_states)
+        info['Initial state'] = self.init_state
+        info['# of non-final states'] = len(nonfinal_states)
+        info['# of final states'] = len(final_states)
+        transition_cnt = 0
+        for s in self.transitions.values():
+            transition_cnt += len(s)
+        info['# of transitions'] = transition_cnt
+        transition_info = '\n'
+        for from_state in self.transitions:
+            for to_state in self.transitions[from_state]:
+                transition_info += '  {} -> {}: '.format(from_state, to_state)
+                for transition in self.transitions[from_state][to_state]:
+                    transition_info += str(transition) + ' '
+                transition_info += '\n'
+        info['Transitions'] = transition_info[:-2] if transition_info != '\n' else 'None'
+        return info
+
+    def get_transitions(self, from_state, to_state):
+        """Return a list containing the transitions in from_state -> to_state"""
+        try:
+            return list(str(t) for t in self.transitions[from_state][to_state])
+        except KeyError:
+            return []
+
+    def get_transition_count(self, from_state, to_state):
+        """Return the number of transitions in from_state -> to_state"""
+        try:
+            return len(self.transitions[from_state][to_state])
+        except KeyError:
+            return 0
+
+    def add_state(self):
+        """Add a state to the machine.
+
+        The new state's number will be the current max_state_num + 1,
+        setting the new max_state_num and becoming the initial state
+        if it is the only state in the machine.
+        """
+        self.num_states += 1
+        self.max_state_num += 1
+        self.final_states[self.max_state_num] = False
+        self.transitions[self.max_state_num] = {}
+        self._map_epochs[self.max_state_num] = self._cow_epoch
+        self._dispatch = None
+        self.states.add(self.max_state_num)
+        self._new_indices(self.max_state_num)
+        if self.num_states == 1:
+            self.init_state = self.max_state_num
+        self._notify('add_state', self.max_state_num)
+
+    def del_state(self, state_num):
+        """Delete the state with the specified number.
+
+        Returns True if state_num is a valid state number, False otherwise;
+        both cases representing whether or not the state was properly deleted.
+        """
+        if state_num not in self.states:
+            return False
+        else:
+            self.states.remove(state_num)
+            del self.final_states[state_num]
+            self.num_states -= 1
+            if state_num == self.init_state:
+                self.init_state = min(self.states) if len(self.states) > 0 else 0
+            while self.max_state_num > 0 and self.max_state_num not in self.states:
+                self.max_state_num -= 1
+            for to_state in self.transitions.pop(state_num):
+                self._sources[to_state].discard(state_num)
+            del self._map_epochs[state_num]
+            self._dispatch = None
+            for f in self._sources.pop(state_num):
+                if f != state_num:
+                    for transition in self.transitions[f][state_num]:
+                        self._unindex(transition)
+                    del self._writable_transitions(f)[state_num]
+            del self._readers[state_num]
+            del self._negated[state_num]
+            del self._by_cnf[state_num]
+            self._notify('del_state', state_num)
+            return True
+
+    def add_transition(self, from_state, to_state, cnf):
+        """Add a transition to the machine.
+
+        Parameters:
+            from_state (int): The source of the transition. Must be a valid state
+                number in the machine.
+            to_state (int): The target of the transition. Must be a valid state
+                number in the machine.
+            cnf (str): The configuration of the transition. Must be of the form
+                '(r,w,m)' where r is the input symbol, w is the write symbol and
+                m is either 'l' or 'r' case-insensitive to indicate where to move.
+                r can also be a pattern (see Transition) and w can be WRITE_SAME.
+                On a multi-track tape, r and w have a part per track separated by
+                '|', such as '(a|[^x],b|[=],R)'.
+
+        Unless the machine is non-deterministic, from_state cannot already have
+        a transition reading any of the same symbols.
+        """
+        if from_state not in self.states:
+            raise Exception('Invalid source')
+        if to_state not in self.states:
+            raise Exception('Invalid target')
+        if type(cnf) is not str:
+            raise TypeError('Configuration must be string')
+        transition = Transition(from_state, to_state, cnf, self.tracks)
+        if not self.nondeterministic and self._overlaps(from_state, transition):
+            raise Exception('Non-determinism')
+        if transition in self.transitions[from_state].get(to_state, ()):
+            raise Exception('Duplicate transition')
+        targets = self._writable_transitions(from_state)
+        try:
+            targets[to_state].add(transition)
+        except KeyError:
+            targets[to_state] = set([transition])
+        self._index(transition)
+        self._dispatch = None
+        self._notify('add_transition', from_state, transition)
+
+    def del_transition(self, from_state, to_state, cnf):
+        """Delete a transition in the machine.
+
+        Returns True if a transition was successfully deleted, False otherwise.
+        """
+        target = self._by_cnf.get(from_state, {}).get((to_state, cnf))
+        if target is None:
+            return False
+        targets = self._writable_transitions(from_state)
+        targets[to_state].remove(target)
+        if len(targets[to_state]) == 0:
+            del targets[to_state]
+            self._sources[to_state].discard(from_state)
+        self._unindex(target)
+        self._dispatch = None
+        self._notify('del_transition', from_state, target)
+        return True
+
+    def set_nondeterministic(self, nondeterministic):
+        """Set whether or not the machine is non-deterministic.
+
+        A machine cannot be made deterministic while a state has more than one
+        transition on the same read symbol, in which case an Exception is raised.
+        """
+        if not nondeterministic:
+            for from_state in self.states:
+                readers = self._readers[from_state]
+                negated = self._negated[from_state]
+                if len(negated) > 1 or any(len(r) > 1 for r in readers.values()):
+                    raise Exception('Non-determinism')
+                if len(negated) == 1 and not readers.keys() <= negated[0].symbols:
+                    raise Exception('Non-determinism')
+        self.nondeterministic = nondeterministic
+        self._notify('set_nondeterministic')
+
+    def _new_indices(self, state_num):
+        # start the empty transition indices of a new state
+        self._readers[state_num] = {}
+        self._negated[state_num] = []
+        self._by_cnf[state_num] = {}
+        self._sources[state_num] = set([])
+
+    def _overlaps(self, state_num, transition):
+        # return True if a transition of the given state reads a symbol the
+        # given transition also reads
+        readers = self._readers[state_num]
+        negated = self._negated[state_num]
+        if transition.negated:
+            return len(negated) != 0 or not readers.keys() <= transition.symbols
+        return (any(symbol in readers for symbol in transition.symbols)
+            or any(not transition.symbols <= other.symbols for other in negated))
+
+    def _index(self, transition):
+        # add a transition just added to the machine to the indices
+        from_state = transition.from_state
+        if transition.negated:
+            self._negated[from_state].append(transition)
+        else:
+            readers = self._readers[from_state]
+            for symbol in transition.symbols:
+                readers.setdefault(symbol, []).append(transition)
+        self._by_cnf[from_state][(transition.to_state, transition.cnf)] = transition
+        self._sources[transition.to_state].add(from_state)
+
+    def _unindex(self, transition):
+        # remove a transition just deleted from the machine from the indices of
+        # its source; the sources of its target are left to the caller, as other
+        # transitions may remain between the two states. Equal transitions to other
+        # states can be indexed too, so transitions are told apart by identity
+        from_state = transition.from_state
+        if transition.negated:
+            negated = self._negated[from_state]
+            negated[:] = [t for t in negated if t is not transition]
+        else:
+            readers = self._readers[from_state]
+            for symbol in transition.symbols:
+                remaining = [t for t in readers[symbol] if t is not transition]
+                if len(remaining) == 0:
+                    del readers[symbol]
+                else:
+                    readers[symbol] = remaining
+        del self._by_cnf[from_state][(transition.to_state, transition.cnf)]
+
+    def set_tape_model(self, tape_model):
+        """Set the tape model of the machine, either SEMI_INFINITE or TWO_WAY."""
+        if tape_model not in (SEMI_INFINITE, TWO_WAY):
+            raise Exception('Invalid tape model')
+        self.tape_model = tape_model
+        self._notify('set_tape_model')
+
+    def set_tracks(self, count, alphabet=''):
+        """Set the number of tracks of the tape and the symbols they can hold.
+
+        A machine can only change its tracks while it has no transitions, as they
+        are read differently, otherwise an Exception is raised.
+
+        Parameters:
+            count (int): The number of tracks, 1 for a single track.
+            alphabet (str): The symbols the tracks can hold, other than the
+                blank; ignored for a single track. (default '')
+        """
+        if any(len(targets) != 0 for targets in self.transitions.values()):
+            raise Exception('Tracks can only be set without transitions')
+        self.tracks = None if count == 1 else TrackLayout(count, alphabet, self.blank)
+        self._notify('set_tracks')
+
+    def add_listener(self, listener):
+        """Call listener(change, state_num, transition) after every change to the machine.
+
+        change is the name of the method that made the change: 'add_state', 'del_state',
+        'add_transition', 'del_transition', 'set_init_state', 'set_final_state',
+        'set_nonfinal_state', 'set_nondeterministic', 'set_tape_model' or 'set_tracks'.
+        state_num is
+        the state changed, or the source of the transition added or deleted, and None for
+        changes to the whole machine. transition is the Transition added or deleted,
+        otherwise None. Listeners are called in the thread that changed the machine.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Stop calling a listener given to add_listener()."""
+        self._listeners.remove(listener)
+
+    def _notify(self, change, state_num=None, transition=None):
+        # call the listeners about a change just made to the machine
+        for listener in self._listeners:
+            listener(change, state_num, transition)
+
+    def _writable_transitions(self, state_num):
+        # return the transition map of the given state, copying it first if it
+        # is still shared with a snapshot taken of this machine
+        if self._map_epochs[state_num] != self._cow_epoch:
+            self.transitions[state_num] = {
+                to_state: set(s) for to_state, s in self.transitions[state_num].items()}
+            self._map_epochs[state_num] = self._cow_epoch
+        return self.transitions[state_num]
+
+    def snapshot(self):
+        """Return a read-only snapshot of the machine in its current form.
+
+        The snapshot shares the per-state transition maps with this machine;
+        a map is only copied by this machine the next time it is modified, so
+        taking a snapshot costs no more than copying the top-level dictionaries.
+        Computations on the snapshot are unaffected by later edits to this machine.
+        """
+        snapshot = MachineSnapshot(self)
+        self._cow_epoch += 1
+        return snapshot
+
+    def input_alphabet(self):
+        """Return the symbols read by the transitions of the machine, other than
+        the blank symbol, as a sorted string. Symbols excluded by a pattern such as
+        '[^ab]' are included, but not the symbols such a pattern matches."""
+        symbols = set([])
+        for from_state in self.transitions:
+            for s in self.transitions[from_state].values():
+                for t in s:
+                    symbols.update(t.symbols)
+        symbols.discard(self.blank)
+        if self.tracks is not None:
+            symbols = set(symbol for symbol in symbols if ord(symbol) < TRACK_BASE)
+        return ''.join(sorted(symbols))
+
+    def _compile(self):
+        # return a dictionary mapping each state number to a _Reads mapping
+        # each read symbol to (write, step, to_state) of the transition to use,
+        # step being +1 or -1, or None if there is none; built once until the
+        # transitions change. Symbol sets are expanded into an entry per
+        # symbol, and a pattern matching all but some symbols becomes the
+        # default of its state, so that a lookup is a single dict access
+        dispatch = self._dispatch
+        if dispatch is None:
+            dispatch = {}
+            for from_state in self.transitions:
+                reads = dispatch[from_state] = _Reads()
+                for transition_set in self.transitions[from_state].values():
+                    for t in transition_set:
+                        step = 1 if t.move == 'r' or t.move == 'R' else -1
+                        if t.negated:
+                            if reads.default is None:
+                                reads.set_default(t, step)
+                            continue
+                        for symbol in t.symbols:
+                            reads.setdefault(symbol, (t.write_for(symbol), step, t.to_state))
+            self._dispatch = dispatch
+        return dispatch
+
+    def to_dict(self):
+        """Return a dictionary describing the machine.
+
+        The dictionary holds only lists, strings, numbers and booleans so it
+        can be saved as JSON; Machine.from_dict() rebuilds the machine from it.
+        """
+        transitions = []
+        for from_state in sorted(self.transitions):
+            for to_state in sorted(self.transitions[from_state]):
+                for cnf in sorted(t.cnf for t in self.transitions[from_state][to_state]):
+                    transitions.append([from_state, to_state, cnf])
+        data = {
+            'states': sorted(self.states),
+            'init_state': self.init_state,
+            'final_states': sorted(s for s in self.states if self.final_states[s]),
+            'blank': self.blank,
+            'tape_model': self.tape_model,
+            'nondeterministic': self.nondeterministic,
+            'transitions': transitions
+        }
+        if self.tracks is not None:
+            data['tracks'] = [self.tracks.count, self.tracks.alphabet]
+        return data
+
+    def fingerprint(self):
+        """Return a hash identifying the machine, the same for any two machines
+        with the same states, transitions, blank symbol and modes."""
+        import hashlib
+        text = json.dumps(self.to_dict(), sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def from_dict(cls, data):
+        """Return a new machine built from a dictionary given by to_dict().
+
+        State numbers are kept as they are in the dictionary. An Exception is
+        raised if the dictionary does not describe a valid machine.
+        """
+        try:
+            machine = cls(0, data.get('blank', '#'), tape_model=data.get('tape_model', SEMI_INFINITE),
+                nondeterministic=data.get('nondeterministic', False))
+            if 'tracks' in data:
+                machine.set_tracks(*data['tracks'])
+            states = set(data['states'])
+            for _ in range(max(states) if len(states) != 0 else 0):
+                machine.add_state()
+            for state_num in range(1, machine.max_state_num+1):
+                if state_num not in states:
+                    machine.del_state(state_num)
+            if data.get('init_state', 0) != 0:
+                machine.set_init_state(data['init_state'])
+            for state_num in data.get('final_states', []):
+                machine.set_final_state(state_num)
+            for from_state, to_state, cnf in data.get('transitions', []):
+                machine.add_transition(from_state, to_state, cnf)
+        except (KeyError, TypeError, ValueError):
+            raise Exception('Invalid machine description')
+        return machine
+
+    def print_transitions(self):
+        """Print each transition in the machine.
+
+        What's printed on each line is 'f -> t: ' where f is the source and
+        t is the target, followed be the configuration of each pertaining transition,
+        separated by a whitespace.
+        """
+        for from_state in self.transitions:
+            for to_state in self.transitions[from_state]:
+                print(from_state, ' -> ', to_state, ': ', sep='', end='')
+                for transition in self.transitions[from_state][to_state]:
+                    print(str(transition), end=' ')
+                print()
+
+    def set_init_state(self, state_num):
+        """Set the specified state as the inital state.
+
+        The specified state_num must be valid, otherwise an Exception
+        is raised.
+        """
+        if state_num in self.states:
+            self.init_state = state_num
+            self._notify('set_init_state', state_num)
+        else:
+            raise Exception('Invalid state number')
+
+    def set_final_state(self, state_num):
+        """Set the specified state as a final state.
+
+        The specified state_num must be valid, otherwise an Exception
+        is raised.
+        """
+        if state_num in self.states:
+            self.final_states[state_num] = True
+            self._notify('set_final_state', state_num)
+        else:
+            raise Exception('Invalid state number')
+
+    def set_nonfinal_state(self, state_num):
+        """Set the specified state as non-final
+
+        The specified state_num must be valid, otherwise an Exception
+        is raised.
+        """
+        if state_num in self.states:
+            self.final_states[state_num] = False
+            self._notify('set_nonfinal_state', state_num)
+        else:
+            raise Exception('Invalid state number')
+
+    def is_empty(self):
+        """Return True if the machine has zero states, False otherwise"""
+        return len(self.states) == 0
+
+    def compute(self, string, as_function=False, checkpointer=None, stats=None, detect_loops=False):
+        '''Compute the given string.
+
+        This function by default returns True if the string was accepted or False
+        if it was rejected, along with the final state of the tape. If as_function=True
+        then computation continues until the machine halts when no appropriate
+        transition can be used. In this case, only the final state of the tape is returned.
+
+        If the tape result is longer than 50 characters, only the first 50 are returned with
+        a question mark at the end to indicate this was the case.
+
+        A non-deterministic machine accepts the string if any of its branches does (see
+        search()), returning the tape of that branch. An Exception is raised if the search
+        stops before deciding, and if the machine is used as a function, checkpointed,
+        measured with stats or checked for loops, which only a deterministic machine can be.
+
+        If a checkpoint.Checkpointer is given, checkpoints of the computation are written
+        periodically and when it ends, to be continued with resume(). If a stats dictionary
+        is given, it is updated with the statistics of the run (see RunResult.stats()).
+
+        If detect_loops=True, a run that is found to repeat itself forever is stopped and
+        rejected, or returns its tape so far as a function (see run()).
+
+        The string can also be a file path, a bytes-like object or an iterator of chunks,
+        read lazily a byte per cell (see input_tape()), for inputs too large to hold as a
+        string.
+        '''
+        if len(self.states) == 0:
+            raise Exception('empty machine')
+        if self.nondeterministic:
+            if as_function:
+                raise Exception('Non-deterministic machine cannot be used as a function')
+            if checkpointer is not None:
+                raise Exception('Non-deterministic machine cannot be checkpointed')
+            if stats is not None:
+                raise Exception('Non-deterministic machine has no run statistics')
+            if detect_loops:
+                raise Exception('Non-deterministic machine cannot detect loops')
+            if not isinstance(string, str):
+                raise Exception('Non-deterministic machine can only compute a string')
+            result = self.search(string)
+            if result.accepted is None:
+                raise Exception('Search stopped before deciding: {}'.format(result.reason))
+            if result.accepted is False:
+                return (False, self.blank + '...')
+            # replay the accepting branch on a tape grown as a deterministic
+            # computation grows it, so that both show the same tape
+            tape = Tape(string + self.blank, self.blank, self.tape_model == TWO_WAY)
+            index = 0
+            for t in result.path:
+                tape[index] = t.write_for(tape[index])
+                index += 1 if t.move.upper() == 'R' else -1
+                if index == tape.end or index < tape.start:
+                    tape[index] = self.blank
+            return RunResult(ACCEPT, False, result.path[-1].to_state if result.path else self.init_state,
+                index, result.steps, tape, tracks=self.tracks).summary()
+        tape = input_tape(string, self.blank, self.tape_model == TWO_WAY)
+        if not isinstance(tape, MappedTape) or tape.complete:
+            tape[tape.end] = self.blank
+        result = self._execute(tape, self.init_state, 0, as_function, checkpointer=checkpointer,
+            detect_loops=detect_loops)
+        if stats is not None:
+            stats.update(result.stats())
+        return result.summary()
+
+    def run(self, string, as_function=False, max_steps=None, coverage=None, checkpointer=None,
+            detect_loops=False):
+        '''Run the machine on the given string and return a RunResult.
+
+        Unlike compute(), the computation can be limited to a number of steps and the
+        whole tape is kept in the result. Only deterministic machines can be run.
+
+        If detect_loops=True, the run ends with reason LOOPS as soon as the machine is
+        found to return to a configuration it was in before, or to repeat the same
+        pattern moving right into blanks (see cycles.py). The start and length of the
+        repetition are kept in the result. Detecting loops makes each step slower.
+
+        Parameters:
+            string (str): The string to compute, or another input accepted by
+                input_tape().
+            as_function (bool): Whether or not to use the machine as a function.
+                (default False)
+            max_steps (int): The number of steps to run at most, None for no limit.
+                (default None)
+            coverage (set): If given, (state, read symbol) of every transition
+                used is added to this set. (default None)
+            checkpointer (checkpoint.Checkpointer): If given, checkpoints of the
+                computation are written periodically and when it ends. (default None)
+            detect_loops (bool): Whether or not to stop runs found to loop.
+                (default False)
+        '''
+        if len(self.states) == 0:
+            raise Exception('empty machine')
+        if self.nondeterministic:
+            raise Exception('Non-deterministic machine cannot be run, use search()')
+        tape = input_tape(string, self.blank, self.tape_model == TWO_WAY)
+        return self._execute(tape, self.init_state, 0, as_function, max_steps, coverage,
+            checkpointer=checkpointer, detect_loops=detect_loops)
+
+    async def compute_async(self, string, as_function=False, slice_steps=10000):
+        '''Compute the given string like compute(), as a coroutine that yields to the
+        asyncio event loop every slice_steps steps, and return the same result.
+
+        The computation runs on a snapshot of the machine and is cancelled like any
+        other task, so asyncio timeouts apply to it. Only deterministic machines can
+        be computed this way; see aio.py to run many strings at once.
+        '''
+        from .aio import compute_async
+        return await compute_async(self, string, as_function, slice_steps)
+
+    async def run_async(self, string, as_function=False, max_steps=None, coverage=None,
+            slice_steps=10000):
+        '''Run the machine on the given string like run(), as a coroutine that yields
+        to the asyncio event loop every slice_steps steps, and return a RunResult.'''
+        from .aio import run_async
+        return await run_async(self, string, as_function, max_steps, coverage, slice_steps)
+
+    def resume(self, checkpoint, max_steps=None, checkpointer=None, detect_loops=False):
+        '''Continue the computation saved in the given checkpoint and return a RunResult.
+
+        The checkpoint must have been written for this machine, as it is now, otherwise
+        an Exception is raised. The steps of the result include those taken before the
+        checkpoint.
+
+        Parameters:
+            checkpoint (checkpoint.Checkpoint or str): The checkpoint, or the path of
+                its file.
+            max_steps (int): The number of further steps to run at most, None for no
+                limit. (default None)
+            checkpointer (checkpoint.Checkpointer): If given, checkpoints of the
+                computation are written periodically and when it ends. (default None)
+            detect_loops (bool): Whether or not to stop the run if found to loop
+                (see run()). (default False)
+        '''
+        if isinstance(checkpoint, str):
+            from .checkpoint import Checkpoint
+            checkpoint = Checkpoint.load(checkpoint)
+        if len(self.states) == 0:
+            raise Exception('empty machine')
+        if checkpoint.fingerprint != self.fingerprint():
+            raise Exception('Checkpoint is of another machine')
+        return self._execute(checkpoint.tape, checkpoint.state, checkpoint.index,
+            checkpoint.as_function, max_steps, steps=checkpoint.steps, checkpointer=checkpointer,
+            detect_loops=detect_loops)
+
+    def enumerate_language(self, max_len, alphabet=None, as_function=False, max_steps=10000,
+            workers=1, chunk_size=2048):
+        '''Yield the strings of length up to max_len that the machine accepts, in
+        length-lexicographic order.
+
+        If as_function=True then (string, output) is yielded for every string instead,
+        the output being the tape left without the blanks on either end. Strings on which
+        the machine does not halt within max_steps steps are skipped. The strings are
+        generated lazily, so memory use does not depend on how many there are.
+
+        Parameters:
+            max_len (int): The length of the longest strings.
+            alphabet (str): The input symbols, in order. (default input_alphabet())
+            as_function (bool): Whether or not to use the machine as a function.
+                (default False)
+            max_steps (int): The number of steps each run can take at most.
+                (default 10000)
+            workers (int): The number of worker processes to run the strings on,
+                1 to run them in this process. (default 1)
+            chunk_size (int): The number of strings given to a worker at a time.
+                (default 2048)
+        '''
+        if len(self.states) == 0:
+            raise Exception('empty machine')
+        if self.nondeterministic:
+            raise Exception('Non-deterministic machine cannot be run, use search()')
+        alphabet = self.input_alphabet() if alphabet is None else alphabet
+        if workers == 1:
+            machine = self.snapshot()
+            for start in range(0, count_strings(alphabet, max_len), chunk_size):
+                yield from _language_chunk(machine, alphabet, max_len, start, start + chunk_size,
+                    as_function, max_steps)
+            return
+        from .parallel import imap_chunks
+        chunks = ((alphabet, max_len, start, start + chunk_size, as_function, max_steps)
+            for start in range(0, count_strings(alphabet, max_len), chunk_size))
+        chunk_results = imap_chunks(_language_chunk, chunks, workers, (self.to_dict(),))
+        try:
+            for chunk_result in chunk_results:
+                yield from chunk_result
+        finally:
+            chunk_results.close()
+
+    def _execute(self, tape, state, index, as_function, max_steps=None, coverage=None, steps=0,
+            checkpointer=None, detect_loops=False):
+        # run the machine from the given configuration, which has taken the
+        # given steps, until it halts, is aborted, has taken max_steps more
+        # steps or is found to loop, returning a RunResult; the tape is
+        # modified in place and always includes the head's cell
+        dispatch = self._compile()
+        final_states = self.final_states
+        two_way = tape.two_way
+        blank = self.blank
+        limit = -1 if max_steps is None else steps + max_steps
+        next_check = -1 if checkpointer is None else steps + CHECKPOINT_CHECK_STEPS
+        min_index = max_index = index
+        first_step = steps
+        detector = None
+        if detect_loops:
+            from .cycles import LoopDetector
+            detector = LoopDetector(self, tape, state, index, steps)
+        started = time.perf_counter()
+        self.abort = False
+        while True:
+            if not as_function and final_states[state]:
+                reason = ACCEPT
+                break
+            if steps == limit:
+                reason = BUDGET
+                break
+            if self.abort:
+                reason = ABORTED
+                break
+            symbol = tape[index]
+            target = dispatch[state][symbol]
+            if target is None:
+                reason = NO_TRANSITION
+                break
+            if coverage is not None:
+                coverage.add((state, symbol))
+            write, step, state = target
+            tape[index] = write
+            index += step
+            steps += 1
+            if index < 0 and not two_way:
+                reason = LEFT_EDGE
+                break
+            if index > max_index:
+                max_index = index
+            elif index < min_index:
+                min_index = index
+            if index == tape.end or index < tape.start:
+                tape[index] = blank
+            if detector is not None and detector.step(state, index, steps, index - step, symbol, write):
+                reason = LOOPS
+                break
+            if steps == next_check:
+                next_check += CHECKPOINT_CHECK_STEPS
+                if checkpointer.due():
+                    checkpointer.save(self, state, index, steps, as_function, tape)
+        elapsed = time.perf_counter() - started
+        self.abort = False
+        if checkpointer is not None:
+            checkpointer.save(self, state, index, steps, as_function, tape)
+        result = RunResult(reason, as_function, state, index, steps, tape, min_index, max_index,
+            elapsed, steps - first_step, self.tracks)
+        if reason == LOOPS:
+            result.cycle_start = detector.cycle_start
+            result.cycle_length = detector.cycle_length
+            result.cycle_shift = detector.cycle_shift
+        return result
+
+    def search(self, string, max_steps=10000, max_frontier=100000, max_configurations=1000000):
+        '''Search the configurations of the machine on the given string breadth-first.
+
+        This works for both deterministic and non-deterministic machines. Returns a
+        ntm.SearchResult telling whether some branch accepted the string and, if so,
+        the path of transitions it took.
+
+        Parameters:
+            string (str): The string to compute.
+            max_steps (int): The number of steps to search at most. (default 10000)
+            max_frontier (int): The number of configurations a level of the search
+                can hold at most. (default 100000)
+            max_configurations (int): The number of configurations the search can
+                visit at most, which bounds its memory. (default 1000000)
+        '''
+        if len(self.states) == 0:
+            raise Exception('empty machine')
+        from .ntm import search
+        return search(self, string, max_steps, max_frontier, max_configurations)
+
+    def optimize(self, as_function=False):
+        '''Return an optimized copy of this deterministic machine and the mapping of
+        its states.
+
+        The copy has the states the initial state reaches only, with equivalent
+        states merged and bounces through states that just move collapsed, numbered
+        densely from 1 (the initial state). It computes every string the same way,
+        in as many steps or fewer. Returns (machine, mapping), mapping being a
+        dictionary from each kept state of this machine to its number in the copy.
+
+        Parameters:
+            as_function (bool): Whether or not the copy must also compute the same
+                when used as a function. (default False)
+        '''
+        from .optimize import optimize
+        return optimize(self, as_function)
+
+    def compute_one(self, testing_state):
+        '''Compute one input in the given testing_state.
+
+        This function adjusts the values in the testing state appropriately.
+
+        Parameters:
+            testing_state (TestingState): The state of a test to work on.
+                If it has a checkpointer, a checkpoint is written when one is due
+                and when the test is done.
+        '''
+        if len(self.states) == 0:
+            raise Exception('empty machine')
+        if self.nondeterministic:
+            raise Exception('Non-deterministic machine cannot be tested sequentially')
+        tape = testing_state.cells
+        index = testing_state.index
+        as_function = testing_state.as_function
+        current_state = testing_state.current_state
+        if not as_function and self.final_states[current_state]:
+            testing_state.done = True
+            testing_state.result = True
+            return
+        # find the target (transition) to use
+        target = self._compile()[current_state][tape[index]]
+        if target is not None:
+            write, step, to_state = target
+            testing_state.current_state = to_state
+            if not as_function and self.final_states[to_state]:
+                testing_state.done = True
+                testing_state.result = True
+            tape[index] = write
+            index += step
+            testing_state.steps += 1
+            if index < 0 and not tape.two_way:
+                testing_state.done = True
+                if not as_function: testing_state.result = False
+            elif index == tape.end or index < tape.start:
+                tape[index] = self.blank
+        else: # no transition found
+            testing_state.done = True
+            if not as_function: testing_state.result = False
+        testing_state.index = index
+        checkpointer = testing_state.checkpointer
+        if checkpointer is not None and (testing_state.done or checkpointer.due()):
+            checkpointer.save(self, testing_state.current_state, index, testing_state.steps,
+                as_function, tape)
+
+    def advance(self, testing_state, max_steps):
+        '''Compute up to max_steps inputs in the given testing_state, stopping early if the
+        test is done, and return the number of steps taken.
+
+        This has the same effect as calling compute_one() as many times, but runs the
+        steps in one go, so it suits taking many steps between redraws of a test.
+
+        Parameters:
+            testing_state (TestingState): The state of a test to work on.
+            max_steps (int): The number of steps to take at most.
+        '''
+        if len(self.states) == 0:
+            raise Exception('empty machine')
+        if self.nondeterministic:
+            raise Exception('Non-deterministic machine cannot be tested sequentially')
+        if testing_state.done:
+            return 0
+        steps = testing_state.steps
+        result = self._execute(testing_state.cells, testing_state.current_state, testing_state.index,
+            testing_state.as_function, max_steps, steps=steps)
+        testing_state.current_state = result.state
+        testing_state.index = result.index
+        testing_state.steps = result.steps
+        if result.reason != BUDGET and result.reason != ABORTED:
+            testing_state.done = True
+            if not testing_state.as_function:
+                testing_state.result = result.reason == ACCEPT
+        checkpointer = testing_state.checkpointer
+        if checkpointer is not None and (testing_state.done or checkpointer.due()):
+            checkpointer.save(self, testing_state.current_state, testing_state.index,
+                testing_state.steps, testing_state.as_function, testing_state.cells)
+        return result.steps - steps
+
+class MachineSnapshot(Machine):
+    """This is a class to represent a read-only snapshot of a machine.
+
+    A snapshot can compute strings like the machine it was taken from, but
+    any attempt to modify it raises an Exception. Its abort flag is its own,
+    so a computation on the snapshot must be aborted through the snapshot.
+    """
+
+    def __init__(self, machine):
+        """Initialize this snapshot from the given machine.
+
+        Parameters:
+            machine (Machine): The machine to take the snapshot of.
+        """
+        self.num_states = machine.num_states
+        self.max_state_num = machine.max_state_num
+        self.blank = machine.blank
+        self.transitions = dict(machine.transitions)
+        self.states = set(machine.states)
+        self.init_state = machine.init_state
+        self.final_states = dict(machine.final_states)
+        self.tape_model = machine.tape_model
+        self.nondeterministic = machine.nondeterministic
+        self.tracks = machine.tracks
+        self.abort = False
+        self._dispatch = machine._dispatch
+
+    def _read_only(self, *args, **kwargs):
+        raise Exception('Snapshot is read-only')
+
+    add_state = _read_only
+    del_state = _read_only
+    add_transition = _read_only
+    del_transition = _read_only
+    set_init_state = _read_only
+    set_final_state = _read_only
+    set_nonfinal_state = _read_only
+    set_nondeterministic = _read_only
+    set_tape_model = _read_only
+    set_tracks = _read_only
+
+    def snapshot(self):
+        """Return this snapshot, as it cannot change."""
+        return self
+
+class _Reads(dict):
+    # the dispatch of a state built by Machine._compile(), mapping each read
+    # symbol to (write, step, to_state) or None; a symbol not in it is looked
+    # up in the state's default, from a pattern such as '[^ab]', and cached
+
+    def __init__(self):
+        super().__init__()
+        self.default = None
+        self._excluded = frozenset()
+
+    def set_default(self, transition, step):
+        # use the given negated transition for the symbols not listed
+        self.default = (transition.write, step, transition.to_state)
+        self._excluded = transition.symbols
+
+    def __missing__(self, symbol):
+        default = self.default
+        if default is None or symbol in self._excluded:
+            target = None
+        elif default[0] == WRITE_SAME:
+            target = (symbol, default[1], default[2])
+        else:
+            target = default
+        self[symbol] = target
+        return target
+
+class RunResult():
+    """This is a class to represent the result of running the machine.
+
+    Attributes:
+        accepted (bool): True if the string was accepted, False if it was
+            rejected or the machine loops. None if the machine was used as a
+            function or the run was stopped before the machine halted.
+        as_function (bool): Whether or not the machine was used as a function.
+        reason (str): Why the run ended; ACCEPT, LEFT_EDGE when moving
+            left of index 0 on a semi-infinite tape, NO_TRANSITION, ABORTED,
+            BUDGET when the step limit was reached or LOOPS when the machine
+            was found to repeat itself forever.
+        state (int): The state the machine ended in.
+        index (int): The index on the tape the machine ended at.
+        steps (int): The number of steps the machine took.
+        tape (Tape): The tape the machine ended with.
+        min_index (int): The leftmost index the head was at.
+        max_index (int): The rightmost index the head was at.
+        elapsed (float): The wall time of the run in seconds.
+        run_steps (int): The number of steps taken in elapsed, which is
+            less than steps for a run resumed from a checkpoint.
+        cycle_start (int): The step the machine started repeating itself at,
+            if the reason is LOOPS, otherwise None.
+        cycle_length (int): The number of steps of each repetition, if the
+            reason is LOOPS, otherwise None.
+        cycle_shift (int): The number of cells the head moves right in each
+            repetition, if the reason is LOOPS, otherwise None.
+        tracks (TrackLayout): The tracks of the tape, None for a single track.
+    """
+
+    def __init__(self, reason, as_function, state, index, steps, tape, min_index=None,
+            max_index=None, elapsed=0.0, run_steps=None, tracks=None):
+        """Initialize this result with the given values.
+
+        Parameters:
+            reason (str): Why the run ended.
+            as_function (bool): Whether or not the machine was used as a function.
+            state (int): The state the machine ended in.
+            index (int): The index on the tape the machine ended at.
+            steps (int): The number of steps the machine took.
+            tape (Tape): The tape the machine ended with.
+            min_index (int): The leftmost index the head was at. (default index)
+            max_index (int): The rightmost index the head was at. (default index)
+            elapsed (float): The wall time of the run in seconds. (default 0.0)
+            run_steps (int): The number of steps taken in elapsed. (default steps)
+            tracks (TrackLayout): The tracks of the tape, None for a single
+                track. (default None)
+        """
+        self.reason = reason
+        self.as_function = as_function
+        if as_function or reason == ABORTED or reason == BUDGET:
+            self.accepted = None
+        else:
+            self.accepted = reason == ACCEPT
+        self.state = state
+        self.index = index
+        self.steps = steps
+        self.tape = tape
+        self.min_index = index if min_index is None else min_index
+        self.max_index = index if max_index is None else max_index
+        self.elapsed = elapsed
+        self.run_steps = steps if run_steps is None else run_steps
+        self.cycle_start = None
+        self.cycle_length = None
+        self.cycle_shift = None
+        self.tracks = tracks
+
+    @property
+    def halted(self):
+        """True if the machine halted, False if the run was stopped first."""
+        return self.reason != ABORTED and self.reason != BUDGET and self.reason != LOOPS
+
+    @property
+    def output(self):
+        """The contents of the tape without the blanks on either end; on a
+        multi-track tape, the tracks of those cells separated by '|'."""
+        output = self.tape.to_string().strip(self.tape.blank)
+        return output if self.tracks is None else '|'.join(self.tracks.split(output))
+
+    @property
+    def cells_spanned(self):
+        """The number of tape cells between the leftmost and rightmost index
+        the head was at, both included."""
+        return self.max_index - self.min_index + 1
+
+    @property
+    def steps_per_sec(self):
+        """The number of steps taken per second of wall time."""
+        return self.run_steps / self.elapsed if self.elapsed > 0 else 0.0
+
+    def stats(self):
+        """Return the statistics of this run as a dictionary of plain values,
+        ready to be written as JSON or CSV."""
+        return {
+            'reason': self.reason,
+            'accepted': self.accepted,
+            'steps': self.steps,
+            'elapsed': self.elapsed,
+            'steps_per_sec': self.steps_per_sec,
+            'max_index': self.max_index,
+            'cells_spanned': self.cells_spanned,
+            'final_state': self.state,
+            'cycle_start': self.cycle_start,
+            'cycle_length': self.cycle_length
+        }
+
+    def summary(self):
+        """Return this result in the form returned by Machine.compute(), the
+        tracks of a multi-track tape separated by '|'."""
+        tape = self.tape
+        long_string = len(tape) > 50
+        string = tape.to_string(tape.start, tape.start + 50) if long_string else tape.to_string()
+        end = '...?' if long_string else '...'
+        if self.tracks is None:
+            string += end
+        else:
+            string = '|'.join(track + end for track in self.tracks.split(string))
+        return string if self.as_function else (self.accepted is True, string)
+
+class Tape():
+    """This is a class to represent the tape of the machine.
+
+    The cells from index 0 rightwards are kept in one list and the cells left
+    of index 0 in another list, in reverse order, so the tape grows in
+    amortized constant time in either direction. Reading a cell that was
+    never written returns the blank symbol.
+
+    Attributes:
+        blank (str): The character representing the blank symbol on the tape.
+        two_way (bool): Whether or not the tape is infinite in both directions.
+            Only a two-way tape can have cells left of index 0.
+    """
+
+    def __init__(self, string, blank, two_way=False):
+        """Initialize this tape with the given string starting at index 0.
+
+        Parameters:
+            string (str): The initial contents of the tape.
+            blank (str): The character representing the blank symbol.
+            two_way (bool): Whether or not the tape is infinite in both
+                directions. (default False)
+        """
+        self.blank = blank
+        self.two_way = two_way
+        self._right = list(string)
+        self._left = []
+
+    @property
+    def start(self):
+        """The index of the leftmost cell in use."""
+        return -len(self._left)
+
+    @property
+    def end(self):
+        """The index past the rightmost cell in use."""
+        return len(self._right)
+
+    def __len__(self):
+        """Return the number of cells in use."""
+        return len(self._left) + len(self._right)
+
+    def __getitem__(self, index):
+        """Return the symbol at the given index, blank if never written."""
+        try:
+            return self._right[index] if index >= 0 else self._left[-index-1]
+        except IndexError:
+            return self.blank
+
+    def __setitem__(self, index, symbol):
+        """Write the symbol at the given index, growing the tape if needed."""
+        if index >= 0:
+            cells = self._right
+        elif self.two_way:
+            cells = self._left
+            index = -index-1
+        else:
+            raise IndexError('Left end of tape')
+        if index < len(cells):
+            cells[index] = symbol
+        else:
+            cells.extend(self.blank for _ in range(index - len(cells)))
+            cells.append(symbol)
+
+    def copy(self):
+        """Return a copy of this tape, written independently of this one."""
+        tape = Tape('', self.blank, self.two_way)
+        tape._right = self._right[:]
+        tape._left = self._left[:]
+        return tape
+
+    def runs(self):
+        """Yield (symbol, count) for each run of equal symbols on the tape,
+        from its start."""
+        for symbol, group in itertools.groupby(itertools.chain(reversed(self._left), self._right)):
+            yield symbol, sum(1 for _ in group)
+
+    @classmethod
+    def from_runs(cls, runs, start, blank, two_way=False):
+        """Return a tape built from the runs given by runs().
+
+        Parameters:
+            runs (iterable): (symbol, count) for each run of the tape.
+            start (int): The index of the first cell of the tape.
+            blank (str): The character representing the blank symbol.
+            two_way (bool): Whether or not the tape is infinite in both
+                directions. (default False)
+        """
+        cells = []
+        for symbol, count in runs:
+            cells.extend(itertools.repeat(symbol, count))
+        tape = cls('', blank, two_way)
+        tape._left = cells[:-start]
+        tape._left.reverse()
+        tape._right = cells[-start:]
+        return tape
+
+    def to_string(self, start=None, end=None):
+        """Return the cells in range(start, end) as a string, limited to the
+        cells in use.
+
+        Parameters:
+            start (int): The first index to include. (default start of the tape)
+            end (int): The index to stop at. (default end of the tape)
+        """
+        start = self.start if start is None else max(start, self.start)
+        end = self.end if end is None else min(end, self.end)
+        left = self._left[max(-end, 0):max(-start, 0)]
+        left.reverse()
+        return ''.join(left) + ''.join(self._right[max(start, 0):max(end, 0)])
+
+class MappedTape(Tape):
+    """This is a class to represent a tape whose input is read lazily, a byte
+    per cell.
+
+    The input is either a bytes-like object, such as an mmap of a file, or an
+    iterator of chunks of bytes or strings, read as the head reaches them.
+    The cells of the input are read from it until written: a page of
+    TAPE_PAGE_SIZE cells is copied to an overlay when one of its cells is
+    first written a different symbol, so the memory used grows with the
+    cells the machine changes rather than the size of the input. The cells
+    beyond the input and left of index 0 are kept as by Tape.
+
+    Attributes:
+        blank (str): The character representing the blank symbol on the tape.
+        two_way (bool): Whether or not the tape is infinite in both directions.
+            Only a two-way tape can have cells left of index 0.
+    """
+
+    def __init__(self, source, blank, two_way=False):
+        """Initialize this tape with the given input starting at index 0.
+
+        Parameters:
+            source (bytes-like or iterator): The input, a bytes-like object or
+                an iterator of chunks of bytes, or of strings of characters that
+                fit in a byte.
+            blank (str): The character representing the blank symbol.
+            two_way (bool): Whether or not the tape is infinite in both
+                directions. (default False)
+        """
+        super().__init__('', blank, two_way)
+        # the bytes of the input read so far, the iterator of the chunks still
+        # to read, None once all of the input is read, and the pages of cells
+        # copied from the input, as bytearrays until written a symbol that does
+        # not fit in a byte and lists of symbols then
+        self._chunks = None
+        try:
+            self._buffer = memoryview(source).cast('B')
+        except TypeError:
+            try:
+                self._chunks = iter(source)
+            except TypeError:
+                raise TypeError('Input must be a string, path, bytes-like object or iterator of chunks')
+            self._buffer = bytearray()
+        self._length = len(self._buffer)
+        self._pages = {}
+        self._load(0)
+
+    @property
+    def complete(self):
+        """Whether or not all of the input has been read."""
+        return self._chunks is None
+
+    @property
+    def end(self):
+        """The index past the rightmost cell in use, the input read so far
+        counting as in use."""
+        return self._length + len(self._right)
+
+    def __len__(self):
+        """Return the number of cells in use."""
+        return len(self._left) + self.end
+
+    def __getitem__(self, index):
+        """Return the symbol at the given index, blank if never written."""
+        if index < 0:
+            return super().__getitem__(index)
+        if index >= self._length - 1 and self._chunks is not None:
+            self._load(index)
+        if index < self._length:
+            page = self._pages.get(index >> TAPE_PAGE_BITS)
+            cell = self._buffer[index] if page is None else page[index & TAPE_PAGE_MASK]
+            return _BYTE_SYMBOLS[cell] if type(cell) is int else cell
+        index -= self._length
+        return self._right[index] if index < len(self._right) else self.blank
+
+    def __setitem__(self, index, symbol):
+        """Write the symbol at the given index, growing the tape if needed."""
+        if index < 0:
+            super().__setitem__(index, symbol)
+            return
+        if index >= self._length - 1 and self._chunks is not None:
+            self._load(index)
+        if index >= self._length:
+            cells = self._right
+            index -= self._length
+            if index < len(cells):
+                cells[index] = symbol
+            else:
+                cells.extend(self.blank for _ in range(index - len(cells)))
+                cells.append(symbol)
+            return
+        number = index >> TAPE_PAGE_BITS
+        code = ord(symbol)
+        page = self._pages.get(number)
+        if page is None:
+            if code == self._buffer[index]:
+                return
+            page = self._pages[number] = bytearray(self._buffer[number << TAPE_PAGE_BITS:
+                (number + 1) << TAPE_PAGE_BITS])
+        if type(page) is bytearray:
+            if code < 256:
+                page[index & TAPE_PAGE_MASK] = code
+                return
+            page = self._pages[number] = [_BYTE_SYMBOLS[cell] for cell in page]
+        page[index & TAPE_PAGE_MASK] = symbol
+
+    def copy(self):
+        """Return a copy of this tape, written independently of this one,
+        reading all of the input, which the copy shares."""
+        self._load(None)
+        tape = object.__new__(MappedTape)
+        tape.__dict__.update(self.__dict__)
+        tape._right = self._right[:]
+        tape._left = self._left[:]
+        tape._pages = {number: page[:] for number, page in self._pages.items()}
+        return tape
+
+    def runs(self):
+        """Yield (symbol, count) for each run of equal symbols on the tape,
+        from its start, reading all of the input."""
+        self._load(None)
+        cells = itertools.chain.from_iterable(self.to_string(start, start + TAPE_PAGE_SIZE)
+            for start in range(self.start, self.end, TAPE_PAGE_SIZE))
+        for symbol, group in itertools.groupby(cells):
+            yield symbol, sum(1 for _ in group)
+
+    def to_string(self, start=None, end=None):
+        """Return the cells in range(start, end) as a string, limited to the
+        cells in use, reading the input up to end.
+
+        Parameters:
+            start (int): The first index to include. (default start of the tape)
+            end (int): The index to stop at. (default end of the tape, reading
+                all of the input)
+        """
+        if self._chunks is not None:
+            self._load(None if end is None else end - 1)
+        start = self.start if start is None else max(start, self.start)
+        end = self.end if end is None else min(end, self.end)
+        parts = []
+        if start < 0:
+            left = self._left[max(-end, 0):-start]
+            left.reverse()
+            parts.append(''.join(left))
+        index = max(start, 0)
+        stop = min(end, self._length)
+        while index < stop:
+            number = index >> TAPE_PAGE_BITS
+            page_start = number << TAPE_PAGE_BITS
+            page_stop = min(page_start + TAPE_PAGE_SIZE, stop)
+            page = self._pages.get(number)
+            if page is None:
+                parts.append(str(self._buffer[index:page_stop], 'latin-1'))
+            elif type(page) is bytearray:
+                parts.append(str(page[index - page_start:page_stop - page_start], 'latin-1'))
+            else:
+                parts.append(''.join(page[index - page_start:page_stop - page_start]))
+            index = page_stop
+        if end > self._length:
+            parts.append(''.join(self._right[max(start - self._length, 0):end - self._length]))
+        return ''.join(parts)
+
+    def _load(self, index):
+        # read chunks of the input until the cell after the given index is read,
+        # all of them if index is None, so that a cell past the end of the tape
+        # is never one of the input still to read
+        while self._chunks is not None and (index is None or self._length <= index + 1):
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self._chunks = None
+                return
+            if isinstance(chunk, str):
+                try:
+                    chunk = chunk.encode('latin-1')
+                except UnicodeEncodeError:
+                    raise Exception('Input symbols must fit in a byte')
+            # the last page may have been copied before the input reached its end
+            number = self._length >> TAPE_PAGE_BITS
+            self._buffer += chunk
+            self._length = len(self._buffer)
+            page = self._pages.get(number)
+            if page is not None and len(page) < TAPE_PAGE_SIZE:
+                rest = self._buffer[(number << TAPE_PAGE_BITS) + len(page):(number + 1) << TAPE_PAGE_BITS]
+                page.extend(rest if type(page) is bytearray else (_BYTE_SYMBOLS[cell] for cell in rest))
+
+class Transition():
+    """This is a class to represent a transition in the machine.
+
+    The read symbol can also be a pattern: '[abc]' reads any of a, b and c,
+    '[^abc]' reads any symbol but a, b and c, and '[^]' reads any symbol. The
+    write symbol can be WRITE_SAME, '[=]', to write back the symbol read.
+
+    On a multi-track tape, the read and write symbols have a part per track,
+    separated by '|': '(a|[^x],b|[=],R)' reads a on the first track and any
+    symbol but x on the second, writes b on the first track and leaves the
+    second as it is. The transition then reads the packed cells (see
+    TrackLayout) of every combination of the symbols read on each track.
+
+    Attributes:
+        from_state (int): The source of this transition.
+        to_state (int): The target of this transition.
+        cnf (str): The configuration of this transition.
+        read (str): The character in which represents the input, or the
+            pattern with its symbols sorted; the parts of each track
+            separated by '|' on a multi-track tape.
+        write (str): The character in which represent the output
+            onto the tape, or WRITE_SAME; the parts of each track separated
+            by '|' on a multi-track tape.
+        move (str): Either 'l' or 'r' case-insensitive indicating
+            the move the machine will make.
+        symbols (frozenset): The symbols read, or those not read if negated.
+        negated (bool): Whether or not the pattern reads all but symbols.
+    """
+
+    def __init__(self, from_state, to_state, cnf, tracks=None):
+        '''Initialize this transition with the given arguments.
+
+        Initialize a transition between from_state to to_state.
+        Both from_state and to_state are assumed to be valid.
+        cnf: configuration for the transition, matching the regular
+            expression: (r,w,m) where r is the input symbol, w is
+            what to write, and m is either L or R case-insensitive
+            (don't forget the parentheses, and spaces can separate
+            the commas from the next character for readability; (r, w, m))
+            r can be a pattern and w can be WRITE_SAME.
+        tracks: the TrackLayout of a multi-track tape, the parts of r and
+            w for each track being separated by '|'. (default None)
+        '''
+        self._tracks = tracks
+        if tracks is not None:
+            self._init_tracks(from_state, to_state, cnf, tracks)
+            return
+        match = re.fullmatch(r'\((\[\^?[^\]\s]*\]|\S),\s*(\[=\]|\S),\s*([lLrR])\)', cnf)
+        if match is None or match[1] == '[]':
+            raise Exception('Invalid configuration')
+        else:
+            self.from_state = from_state
+            self.to_state = to_state
+            self.cnf = re.sub(' ', '', cnf)
+            self.write = match[2]
+            self.move = match[3]
+            read = match[1]
+            if len(read) == 1:
+                self.symbols = frozenset(read)
+                self.negated = False
+                self.read = read
+            else:
+                self.negated = read[1] == '^'
+                self.symbols = frozenset(read[2:-1] if self.negated else read[1:-1])
+                self.read = '[{}{}]'.format('^' if self.negated else '', ''.join(sorted(self.symbols)))
+
+    def __str__(self):
+        """Return the configuration of this transition."""
+        return self.cnf
+
+    def matches(self, symbol):
+        """Return True if this transition reads the given symbol."""
+        return (symbol in self.symbols) != self.negated
+
+    def write_for(self, symbol):
+        """Return the symbol this transition writes when reading the given symbol."""
+        if self._tracks is not None:
+            return self._tracks.pack(tuple(read if write == WRITE_SAME else write
+                for read, write in zip(self._tracks.unpack(symbol), self._writes)))
+        return symbol if self.write == WRITE_SAME else self.write
+
+    def _init_tracks(self, from_state, to_state, cnf, tracks):
+        # initialize this transition from the configuration of a multi-track
+        # tape, reading the packed cells of every combination of the symbols
+        # read on each track
+        match = re.fullmatch(r'\(([^,\s]+),\s*([^,\s]+),\s*([lLrR])\)', cnf)
+        if match is None:
+            raise Exception('Invalid configuration')
+        reads = match[1].split('|')
+        writes = match[2].split('|')
+        if len(reads) != tracks.count or len(writes) != tracks.count:
+            raise Exception('Invalid configuration')
+        symbols = tracks.symbols
+        read_sets = []
+        for i, read in enumerate(reads):
+            if len(read) != 1 and re.fullmatch(r'\[\^?[^\]]*\]', read) is None or read == '[]':
+                raise Exception('Invalid configuration')
+            if len(read) == 1:
+                read_set = set(read)
+            elif read[1] == '^':
+                read_set = set(symbols) - set(read[2:-1])
+            else:
+                read_set = set(read[1:-1])
+            if not read_set <= set(symbols):
+                raise Exception('Symbol not in track alphabet')
+            if len(read) != 1:
+                reads[i] = '[{}{}]'.format('^' if read[1] == '^' else '', ''.join(sorted(set(
+                    read[2:-1] if read[1] == '^' else read[1:-1]))))
+            read_sets.append(sorted(read_set))
+        for write in writes:
+            if write != WRITE_SAME and (len(write) != 1 or write not in symbols):
+                raise Exception('Symbol not in track alphabet' if len(write) == 1 else 'Invalid configuration')
+        self.from_state = from_state
+        self.to_state = to_state
+        self.cnf = re.sub(' ', '', cnf)
+        self.read = '|'.join(reads)
+        self.write = '|'.join(writes)
+        self.move = match[3]
+        self.symbols = frozenset(tracks.pack(cell) for cell in itertools.product(*read_sets))
+        self.negated = False
+        self._writes = tuple(writes)
+
+    def overlaps(self, other):
+        """Return True if this transition and the other read a symbol in common."""
+        if self.negated and other.negated:
+            return True
+        if self.negated:
+            return not other.symbols <= self.symbols
+        if other.negated:
+            return not self.symbols <= other.symbols
+        return not self.symbols.isdisjoint(other.symbols)
+    
+    def __hash__(self):
+        """Return a hash of this transition's configuration"""
+        return hash((self.read, self.write, self.move.upper()))
+
+    def __eq__(self, other):
+        """Return whether or not this transition is equal to other.
+
+        Two transitions are equivalent if and only if their read, write
+        and move are equivalent, the move being case-insensitive.
+        """
+        if isinstance(other, self.__class__):
+            return (self.read == other.read and self.write == other.write
+                and self.move.upper() == other.move.upper())
+        else:
+            return False
+
+    def __ne__(self, other):
+        """Return True if this transition is not equal to other, False otherwise."""
+        return not self.__eq__(other)
+
+class TrackLayout():
+    """This is a class to represent the tracks of a multi-track tape.
+
+    A cell of the tape holds a symbol per track, packed into a single character
+    so that a machine steps through several tracks as fast as through one. A
+    cell whose tracks after the first are blank is the symbol of its first
+    track, so a string is an input on the first track. Any other cell is the
+    character TRACK_BASE + n, n numbering the symbols of its tracks in base
+    len(alphabet) + 1, the first track being the lowest digit.
+
+    Attributes:
+        count (int): The number of tracks.
+        alphabet (str): The symbols the tracks can hold, other than the blank.
+        blank (str): The character representing the blank symbol.
+        symbols (str): The blank followed by the alphabet.
+    """
+
+    def __init__(self, count, alphabet, blank):
+        """Initialize this layout with the given number of tracks and symbols.
+
+        An Exception is raised if a symbol of the alphabet is repeated, is the
+        blank, a space or one of TRACK_RESERVED, or if there are too many
+        combinations of symbols to pack into a character.
+
+        Parameters:
+            count (int): The number of tracks, at least 2.
+            alphabet (str): The symbols the tracks can hold, other than the blank.
+            blank (str): The character representing the blank symbol.
+        """
+        if type(count) is not int or count < 2:
+            raise Exception('Invalid number of tracks')
+        if (len(set(alphabet)) != len(alphabet) or blank in alphabet
+                or any(symbol.isspace() or symbol in TRACK_RESERVED for symbol in alphabet)):
+            raise Exception('Invalid track alphabet')
+        if (len(alphabet) + 1) ** count > TRACK_CODES:
+            raise Exception('Too many track symbols')
+        self.count = count
+        self.alphabet = alphabet
+        self.blank = blank
+        self.symbols = blank + alphabet
+        self._digits = {symbol: digit for digit, symbol in enumerate(self.symbols)}
+        self._blanks = (blank,) * (count - 1)
+
+    def pack(self, symbols):
+        """Return the cell holding the given tuple of symbols, one per track."""
+        if symbols[1:] == self._blanks:
+            return symbols[0]
+        code = 0
+        base = len(self.symbols)
+        for symbol in reversed(symbols):
+            code = code * base + self._digits[symbol]
+        return chr(TRACK_BASE + code)
+
+    def unpack(self, cell):
+        """Return the tuple of symbols held by the given cell, one per track."""
+        code = ord(cell) - TRACK_BASE
+        if code < 0:
+            return (cell,) + self._blanks
+        symbols = []
+        base = len(self.symbols)
+        for _ in range(self.count):
+            code, digit = divmod(code, base)
+            symbols.append(self.symbols[digit])
+        return tuple(symbols)
+
+    def split(self, string):
+        """Return the tracks of the given string of cells, as a string per track."""
+        if len(string) == 0:
+            return [''] * self.count
+        return [''.join(track) for track in zip(*(self.unpack(cell) for cell in string))]
+
+class TestingState():
+    """This is a class to represent a testing state in the sequential tests.
+
+    Attributes:
+        result (bool): The result of the test; True indicating acceptance and
+            False indicating rejection. This will not be None only if
+            done is True. If as_function is True, then this will always be None.
+        done (bool): Boolean to indicate the test is done.
+        index (int): The current index on the tape.
+        current_state (int): The current state of the machine.
+        cells (Tape): The tape of the machine.
+        as_function (bool): Boolean value to indicate the machine is
+            being used as a function.
+        steps (int): The number of steps taken so far.
+        checkpointer (checkpoint.Checkpointer): If not None, writes checkpoints
+            of the test when due.
+    """
+
+    def __init__(self, string, as_function, init_state, blank='#', two_way=False):
+        """Initialize this testing state.
+
+        The test always starts at index 0 on the string/tape.
+
+        Parameters:
+            string (str): The string that the machine will test, or another
+                input accepted by input_tape().
+            as_function (bool): Boolean value to indicate the machine is
+                being used as a function.
+            init_state (int): The state number of the initial state of the machine.
+            blank (str): The blank symbol of the machine. (default '#')
+            two_way (bool): Whether or not the machine has a two-way infinite
+                tape. (default False)
+        """
+        self.result = None
+        self.done = False
+        self.index = 0
+        self.current_state = init_state
+        self.cells = input_tape(string, blank, two_way)
+        self.as_function = as_function
+        self.steps = 0
+        self.checkpointer = None
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint):
+        """Return a testing state continuing the computation of the given
+        checkpoint.Checkpoint."""
+        testing_state = cls('', checkpoint.as_function, checkpoint.state)
+        testing_state.cells = checkpoint.tape
+        testing_state.index = checkpoint.index
+        testing_state.steps = checkpoint.steps
+        return testing_state
+
+    @property
+    def tape(self):
+        """The current status of the tape as a string, ending with the blank
+        symbol and '...' once the test is done."""
+        tape = self.cells.to_string()
+        return tape + self.cells.blank + '...' if self.done else tape
+
+    @property
+    def tape_index(self):
+        """The position of the current index within the tape string."""
+        return self.index - self.cells.start
+
+def _language_chunk(machine, alphabet, max_len, start, stop, as_function, max_steps):
+    # return the part of Machine.enumerate_language() for the strings in
+    # positions range(start, stop)
+    found = []
+    for string in iter_strings(alphabet, max_len, start, stop):
+        result = machine.run(string, as_function, max_steps)
+        if as_function and result.halted:
+            found.append((string, result.output))
+        elif result.accepted:
+            found.append(string)
+    return found
+
+def input_tape(source, blank, two_way=False):
+    """Return a tape holding the given input from index 0.
+
+    A string is kept as a Tape. Any other input is read lazily into a
+    MappedTape, a byte per cell: a file path given as a pathlib.Path or other
+    os.PathLike (a str being the input itself) is mapped into memory, and a
+    bytes-like object, such as bytes or an mmap, or an iterator of chunks of
+    bytes or strings is read as it is.
+
+    Parameters:
+        source (str, os.PathLike, bytes-like or iterator): The input.
+        blank (str): The character representing the blank symbol.
+        two_way (bool): Whether or not the tape is infinite in both
+            directions. (default False)
+    """
+    if isinstance(source, str):
+        return Tape(source, blank, two_way)
+    if isinstance(source, os.PathLike):
+        import mmap
+        with open(source, 'rb') as f:
+            try:
+                source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # an empty file cannot be mapped
+                source = b''
+    return MappedTape(source, blank, two_way)
+
+def save_machine(machine, path):
+    """Save the given machine as JSON to the file at path.
+
+    Parameters:
+        machine (Machine): The machine to save.
+        path (str): The path of the file to write.
+    """
+    with open(path, 'w') as f:
+        json.dump(machine.to_dict(), f, indent=1)
+
+def load_machine(path):
+    """Return the machine saved as JSON in the file at path.
+
+    Parameters:
+        path (str): The path of the file to read.
+    """
+    with open(path) as f:
+        try:
+            data = json.load(f)
+        except ValueError:
+            raise Exception('Invalid machine file')
+    return Machine.from_dict(data)
+
+def count_strings(alphabet, max_len):
+    """Return the number of strings over alphabet of length up to max_len."""
+    return sum(len(alphabet) ** n for n in range(max_len+1))
+
+def nth_string(alphabet, n):
+    """Return the string at position n (from 0) in the length-lexicographic
+    order of all strings over alphabet.
+
+    Parameters:
+        alphabet (str): The symbols of the strings, in order.
+        n (int): The position of the string, 0 being the empty string.
+    """
+    symbols = []
+    while n > 0:
+        n, digit = divmod(n - 1, len(alphabet))
+        symbols.append(alphabet[digit])
+    symbols.reverse()
+    return ''.join(symbols)
+
+def iter_strings(alphabet, max_len, start=0, stop=None):
+    """Yield the strings over alphabet of length up to max_len in
+    length-lexicographic order, from position start up to position stop.
+
+    Parameters:
+        alphabet (str): The symbols of the strings, in order.
+        max_len (int): The length of the longest strings.
+        start (int): The position of the first string to yield. (default 0)
+        stop (int): The position to stop at. (default None for all strings)
+    """
+    total = count_strings(alphabet, max_len)
+    stop = total if stop is None else min(stop, total)
+    last = len(alphabet) - 1
+    digits = [alphabet.index(symbol) for symbol in nth_string(alphabet, start)]
+    for _ in range(start, stop):
+        yield ''.join(alphabet[d] for d in digits)
+        # advance to the next string, adding a symbol once every digit overflows
+        i = len(digits) - 1
+        while i >= 0 and digits[i] == last:
+            digits[i] = 0
+            i -= 1
+        if i < 0:
+            digits.append(0)
+        else:
+            digits[i] += 1
@@ -0,0 +1,192 @@
+"""
+Detection of runs that never halt because they repeat themselves, so they can
+be stopped at once instead of at a step limit.
+
+Two kinds of repetition are detected, both of which prove the machine loops:
+
+- a cycle, where the machine returns to a configuration (state, index and
+  tape, up to blanks) it was in before; found with Brent's algorithm, which
+  keeps a single saved configuration
+- a translated cycle, where the machine moves right into blanks repeating the
+  same pattern; the machine is in the same state at two records (steps where
+  the head moves onto a cell right of every cell it was at or the input, so
+  only blanks are to its right) and the cells from the leftmost index reached since the first record
+  up to the head are the same at both records
+"""
+
+import itertools
+from collections import deque
+from .core import MappedTape
+
+# number of past records kept to find translated cycles
+TRANSLATED_RECORDS = 64
+# number of cells left of the head kept with each record; translated cycles
+# reaching further left than this are not found
+TRANSLATED_WINDOW = 256
+
+def _cell_hash(index, symbol, blank):
+    # hash of a cell of the tape; blank cells hash to 0, so that the hash of
+    # a tape, the XOR of those of its cells, does not depend on its extent
+    return 0 if symbol == blank else hash((index, symbol))
+
+def tape_key(tape):
+    """Return a value that is equal for two tapes only if they have the same
+    symbol at every index, taking the cells off a tape to be blanks."""
+    string = tape.to_string()
+    content = string.lstrip(tape.blank)
+    return (tape.start + len(string) - len(content), content.rstrip(tape.blank))
+
+class LoopDetector():
+    """This is a class to detect that a run of a deterministic machine loops.
+
+    Attributes:
+        cycle_start (int): The step the repetition starts at, once found.
+        cycle_length (int): The number of steps of each repetition, once found.
+        cycle_shift (int): The number of cells the head moves right in each
+            repetition; 0 for a cycle, positive for a translated cycle.
+    """
+
+    def __init__(self, machine, tape, state, index, steps):
+        """Initialize this detector for a run of the given machine from the
+        given configuration, which has taken the given steps.
+
+        The detector keeps the cells the run changes, not a copy of the tape,
+        so a tape whose input is read lazily is not read ahead of the head.
+
+        Parameters:
+            machine (core.Machine): The machine running.
+            tape (core.Tape): The tape of the run, which the run modifies.
+            state (int): The state the run starts in.
+            index (int): The index the run starts at.
+            steps (int): The steps taken before the run.
+        """
+        self.cycle_start = None
+        self.cycle_length = None
+        self.cycle_shift = None
+        self._machine = machine
+        self._tape = tape
+        # starting configuration, and the symbol each cell the run changed had
+        # then, to find where a cycle starts
+        self._origin = (state, index, steps)
+        self._undo = {}
+        # hash of the changes of the tape since the start, updated at each step
+        self._hash = 0
+        # configuration saved by Brent's algorithm, the symbol each cell changed
+        # since had then, and the number of steps until it is replaced
+        self._saved = (state, index, self._hash)
+        self._since = {}
+        self._power = 1
+        self._length = 0
+        # past records as [state, index, steps, window start, window, lowest
+        # index until the next record], newest last
+        self._records = deque(maxlen=TRANSLATED_RECORDS)
+        self._low = index
+        self._high = index
+
+    def step(self, state, index, steps, cell, read, write):
+        """Return True if the run is found to loop, after a step that wrote write
+        over read at the given cell and left it in the given configuration."""
+        tape = self._tape
+        if read != write:
+            blank = tape.blank
+            self._hash ^= _cell_hash(cell, read, blank) ^ _cell_hash(cell, write, blank)
+            if cell not in self._undo:
+                self._undo[cell] = read
+            if cell not in self._since:
+                self._since[cell] = read
+        if index < self._low:
+            self._low = index
+        self._length += 1
+        saved = self._saved
+        if (state == saved[0] and index == saved[1] and self._hash == saved[2]
+                and all(tape[cell] == symbol for cell, symbol in self._since.items())):
+            self.cycle_length = self._length
+            self.cycle_shift = 0
+            self.cycle_start = self._find_start()
+            return True
+        if self._length == self._power:
+            self._saved = (state, index, self._hash)
+            self._since = {}
+            self._power *= 2
+            self._length = 0
+        if index > self._high:
+            self._high = index
+            # only blanks are right of the head once it is past the input
+            if index == tape.end - 1 and (not isinstance(tape, MappedTape) or tape.complete):
+                return self._record(state, index, steps)
+        return False
+
+    def _record(self, state, index, steps):
+        # check the record the run is at against the past records, then keep it
+        tape = self._tape
+        records = self._records
+        if len(records) != 0:
+            records[-1][5] = self._low
+        low = index
+        for record in reversed(records):
+            low = min(low, record[5])
+            if record[0] != state or low < record[3]:
+                continue
+            shift = index - record[1]
+            if tape.to_string(low + shift, index + 1) == record[4][low - record[3]:]:
+                self.cycle_start = record[2]
+                self.cycle_length = steps - record[2]
+                self.cycle_shift = shift
+                return True
+        window_start = max(tape.start, index - TRANSLATED_WINDOW + 1)
+        records.append([state, index, steps, window_start, tape.to_string(window_start, index + 1), index])
+        self._low = index
+        return False
+
+    def _find_start(self):
+        # return the first step of the cycle of length cycle_length, running
+        # two copies of the run from its start cycle_length steps apart
+        # until they are in the same configuration; a copy keeps the cells it
+        # wrote and reads the others as they were at the start
+        state, index, steps = self._origin
+        tape = self._tape
+        undo = self._undo
+        def origin(cell):
+            return undo[cell] if cell in undo else tape[cell]
+        dispatch = self._machine._compile()
+        first = _Replay(origin, state, index)
+        second = _Replay(origin, state, index)
+        for _ in range(self.cycle_length):
+            second.advance(dispatch)
+        while not first.same(second):
+            first.advance(dispatch)
+            second.advance(dispatch)
+            steps += 1
+        return steps
+
+class _Replay():
+    # a copy of a run replayed from its start, which it is known to take,
+    # over a function returning the symbols of the cells at the start
+
+    def __init__(self, origin, state, index):
+        self._origin = origin
+        self._cells = {}
+        self._hash = 0
+        self.state = state
+        self.index = index
+
+    def read(self, cell):
+        # return the symbol at the cell
+        cells = self._cells
+        return cells[cell] if cell in cells else self._origin(cell)
+
+    def advance(self, dispatch):
+        # take one step, using the dispatch map of Machine._compile()
+        read = self.read(self.index)
+        write, step, self.state = dispatch[self.state][read]
+        if read != write:
+            self._hash ^= hash((self.index, read)) ^ hash((self.index, write))
+            self._cells[self.index] = write
+        self.index += step
+
+    def same(self, other):
+        # whether or not the two copies are in the same configuration
+        if self.state != other.state or self.index != other.index or self._hash != other._hash:
+            return False
+        return all(self.read(cell) == other.read(cell)
+            for cell in itertools.chain(self._cells, other._cells))
@@ -0,0 +1,162 @@
+"""
+Space-time diagrams of a computation, written as PNG or PPM images.
+
+Row i of the image is the tape after some number of steps, from the first
+step at the top down to the last; column j is a tape cell, colored by its
+symbol, the blank being white. The cell under the head is colored by the
+current state instead, in darker colors than the symbols.
+
+The image is streamed row by row, so memory stays bounded however long the
+run. A first run measures the number of steps and the cells the head
+reaches, fixing the size of the image: beyond the given width and height, a
+row shows one step out of every few and a column several cells, showing the
+first of them that is not blank.
+
+Usage: python3 -m dtm_simulator.diagram machine.json input diagram.png --max-steps 1000000
+"""
+
+import argparse
+import colorsys
+import struct
+import zlib
+from .core import load_machine, TestingState, TWO_WAY
+
+# color of the blank symbol
+BLANK_COLOR = b'\xff\xff\xff'
+# bytes of compressed pixel data held before writing a PNG chunk
+PNG_CHUNK_SIZE = 1 << 16
+
+def write_diagram(machine, string, path, as_function=False, max_steps=1000000, width=1024, height=1024):
+    """Write the space-time diagram of the machine computing the given string to the
+    image file at path, a PNG if it ends with '.png' or a PPM if it ends with '.ppm'.
+    Returns the core.RunResult of the computation.
+
+    Parameters:
+        machine (core.Machine): The machine to run. Must be deterministic.
+        string (str): The input of the computation.
+        path (str): The path of the image file to write.
+        as_function (bool): Whether or not to use the machine as a function.
+            (default False)
+        max_steps (int): The number of steps to run at most. (default 1000000)
+        width (int): The largest width of the image, in pixels. (default 1024)
+        height (int): The largest height of the image, in pixels. (default 1024)
+    """
+    if path.lower().endswith('.png'):
+        writer_class = _PNGWriter
+    elif path.lower().endswith('.ppm'):
+        writer_class = _PPMWriter
+    else:
+        raise Exception('Unknown image format')
+    if machine.nondeterministic:
+        raise Exception('Non-deterministic machine cannot be drawn')
+    result = machine.run(string, as_function, max_steps)
+    first = min(result.min_index, 0)
+    last = max(result.max_index, len(string) - 1)
+    # steps per row and cells per column, rounded up
+    steps_per_row = -(-(result.steps + 1) // height)
+    rows = -(-(result.steps + 1) // steps_per_row)
+    cells_per_column = -(-(last - first + 1) // width)
+    columns = -(-(last - first + 1) // cells_per_column)
+    testing_state = TestingState(string, as_function, machine.init_state, machine.blank,
+        machine.tape_model == TWO_WAY)
+    symbol_colors = {machine.blank: BLANK_COLOR}
+    state_colors = {}
+    with open(path, 'wb') as f:
+        writer = writer_class(f, columns, rows)
+        for row in range(rows):
+            machine.advance(testing_state, row * steps_per_row - testing_state.steps)
+            tape = testing_state.cells
+            cells = tape.to_string(first, last + 1)
+            cells = machine.blank * (max(tape.start, first) - first) + cells
+            cells += machine.blank * (last + 1 - first - len(cells))
+            pixels = bytearray()
+            for column in range(columns):
+                group = cells[column * cells_per_column:(column + 1) * cells_per_column]
+                symbol = group.strip(machine.blank)[:1] or machine.blank
+                if symbol not in symbol_colors:
+                    symbol_colors[symbol] = _color(len(symbol_colors), 0.45, 0.95)
+                pixels += symbol_colors[symbol]
+            state = testing_state.current_state
+            if state not in state_colors:
+                state_colors[state] = _color(len(state_colors), 1.0, 0.55)
+            # the head is off the tape after moving left of a semi-infinite tape
+            if testing_state.index >= first:
+                head = (testing_state.index - first) // cells_per_column
+                pixels[3 * head:3 * head + 3] = state_colors[state]
+            writer.write_row(pixels)
+        writer.close()
+    return result
+
+def _color(n, saturation, value):
+    # return the RGB bytes of the nth color of a sequence of well spread hues
+    red, green, blue = colorsys.hsv_to_rgb((n * 0.618033988749895) % 1.0, saturation, value)
+    return bytes([int(red * 255), int(green * 255), int(blue * 255)])
+
+class _PPMWriter():
+    # writes a binary PPM image row by row to a file
+
+    def __init__(self, f, width, height):
+        self._f = f
+        f.write('P6\n{} {}\n255\n'.format(width, height).encode('ascii'))
+
+    def write_row(self, pixels):
+        self._f.write(pixels)
+
+    def close(self):
+        pass
+
+class _PNGWriter():
+    # writes an 8-bit RGB PNG image row by row to a file, compressing the
+    # rows as they come and writing the compressed data in chunks
+
+    def __init__(self, f, width, height):
+        self._f = f
+        self._compressor = zlib.compressobj()
+        self._pending = []
+        self._pending_size = 0
+        f.write(b'\x89PNG\r\n\x1a\n')
+        self._write_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+
+    def write_row(self, pixels):
+        self._add(self._compressor.compress(b'\x00' + bytes(pixels)))
+
+    def close(self):
+        self._add(self._compressor.flush())
+        self._flush()
+        self._write_chunk(b'IEND', b'')
+
+    def _add(self, data):
+        self._pending.append(data)
+        self._pending_size += len(data)
+        if self._pending_size >= PNG_CHUNK_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if self._pending_size != 0:
+            self._write_chunk(b'IDAT', b''.join(self._pending))
+        self._pending = []
+        self._pending_size = 0
+
+    def _write_chunk(self, kind, data):
+        self._f.write(struct.pack('>I', len(data)) + kind + data)
+        self._f.write(struct.pack('>I', zlib.crc32(kind + data)))
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Write the space-time diagram of a computation as a PNG or PPM image.')
+    parser.add_argument('machine', help='JSON file of the machine')
+    parser.add_argument('input', help='input string of the computation')
+    parser.add_argument('image', help='image file to write, ending with .png or .ppm')
+    parser.add_argument('-f', '--as-function', action='store_true', help='use the machine as a function')
+    parser.add_argument('-s', '--max-steps', type=int, default=1000000, help='step limit of the run')
+    parser.add_argument('--width', type=int, default=1024, help='largest width of the image')
+    parser.add_argument('--height', type=int, default=1024, help='largest height of the image')
+    args = parser.parse_args()
+    machine = load_machine(args.machine)
+    result = write_diagram(machine, args.input, args.image, args.as_function, args.max_steps,
+        args.width, args.height)
+    print('{} steps, {} ({} cells spanned)'.format(result.steps, result.reason, result.cells_spanned))
+    return 0
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,198 @@
+"""
+Check two machines for equivalence on every input up to a given length.
+
+The inputs are enumerated in length-lexicographic order and split into
+chunks that are run on a pool of worker processes. Chunks are collected in
+order, so the counterexamples reported are always the first ones, and the
+chunks not yet run are cancelled as soon as enough counterexamples are found.
+
+Usage: python3 -m dtm_simulator.equivalence machine_a.json machine_b.json -a ab -n 12
+"""
+
+import argparse
+import os
+from .core import load_machine, count_strings, iter_strings
+from .parallel import imap_chunks
+
+class Counterexample():
+    """This is a class to represent an input the two machines disagree on.
+
+    Attributes:
+        string (str): The input.
+        outcome_a (tuple): The outcome of the first machine; see outcome().
+        outcome_b (tuple): The outcome of the second machine.
+    """
+
+    def __init__(self, string, outcome_a, outcome_b):
+        """Initialize this counterexample with the given input and outcomes."""
+        self.string = string
+        self.outcome_a = outcome_a
+        self.outcome_b = outcome_b
+
+    def __str__(self):
+        """Return a line describing this counterexample."""
+        return '{!r}: {} vs {}'.format(self.string, _describe(self.outcome_a), _describe(self.outcome_b))
+
+class EquivalenceResult():
+    """This is a class to represent the result of an equivalence check.
+
+    Attributes:
+        counterexamples (list): The first inputs the machines disagree on,
+            as Counterexample objects in length-lexicographic order.
+        undecided (list): The first inputs on which a machine reached the
+            step limit, so the machines could not be compared.
+        undecided_count (int): The number of undecided inputs found.
+        checked (int): The number of inputs checked.
+        total (int): The number of inputs up to the given length.
+    """
+
+    def __init__(self, total):
+        """Initialize an empty result for the given number of inputs."""
+        self.counterexamples = []
+        self.undecided = []
+        self.undecided_count = 0
+        self.checked = 0
+        self.total = total
+
+    @property
+    def equivalent(self):
+        """True if no counterexample was found."""
+        return len(self.counterexamples) == 0
+
+def outcome(machine, string, as_function, compare_tapes, max_steps):
+    """Return the outcome of running the machine on the string, to be compared
+    with the outcome of another machine.
+
+    The outcome is a tuple (verdict, output) where verdict is 'accept',
+    'reject', 'halt' when used as a function, or 'budget' if the machine did
+    not halt within max_steps steps. The output is the tape without the blanks
+    on either end if as_function or compare_tapes is True, None otherwise.
+    """
+    result = machine.run(string, as_function, max_steps)
+    if not result.halted:
+        return ('budget', None)
+    verdict = 'halt' if as_function else ('accept' if result.accepted else 'reject')
+    return (verdict, result.output if as_function or compare_tapes else None)
+
+def _describe(outcome):
+    # return the given outcome as text
+    verdict, output = outcome
+    return verdict if output is None else '{} {!r}'.format(verdict, output)
+
+def _check_chunk(machine_a, machine_b, alphabet, max_len, start, stop, options):
+    # compare the machines on the inputs in positions range(start, stop);
+    # returns (counterexamples, undecided, undecided count, checked count)
+    as_function, compare_tapes, max_steps, max_counterexamples, max_undecided = options
+    counterexamples = []
+    undecided = []
+    undecided_count = 0
+    checked = 0
+    for string in iter_strings(alphabet, max_len, start, stop):
+        checked += 1
+        outcome_a = outcome(machine_a, string, as_function, compare_tapes, max_steps)
+        outcome_b = outcome(machine_b, string, as_function, compare_tapes, max_steps)
+        if outcome_a[0] == 'budget' or outcome_b[0] == 'budget':
+            undecided_count += 1
+            if len(undecided) < max_undecided:
+                undecided.append(string)
+        elif outcome_a != outcome_b:
+            counterexamples.append(Counterexample(string, outcome_a, outcome_b))
+            if len(counterexamples) == max_counterexamples:
+                break
+    return counterexamples, undecided, undecided_count, checked
+
+def check_equivalence(machine_a, machine_b, alphabet, max_len, as_function=False,
+        compare_tapes=False, max_steps=10000, workers=None, max_counterexamples=1,
+        max_undecided=10, chunk_size=2048):
+    """Compare two machines on every string over alphabet of length up to max_len.
+
+    In accept/reject mode the machines must agree on accepting each input, and
+    also on the tape left if compare_tapes is True. As functions, they must
+    agree on the tape left. Inputs on which a machine does not halt within
+    max_steps steps are counted as undecided rather than as counterexamples.
+    Returns an EquivalenceResult.
+
+    Parameters:
+        machine_a (core.Machine): The first machine.
+        machine_b (core.Machine): The second machine.
+        alphabet (str): The input symbols, in order.
+        max_len (int): The length of the longest inputs.
+        as_function (bool): Whether or not to use the machines as functions.
+            (default False)
+        compare_tapes (bool): Whether or not to compare the tapes left in
+            accept/reject mode. (default False)
+        max_steps (int): The number of steps each run can take at most.
+            (default 10000)
+        workers (int): The number of worker processes, 1 to check in this
+            process. (default None for the number of CPUs)
+        max_counterexamples (int): The number of counterexamples to find
+            before stopping. (default 1)
+        max_undecided (int): The number of undecided inputs to keep.
+            (default 10)
+        chunk_size (int): The number of inputs given to a worker at a time.
+            (default 2048)
+    """
+    if len(alphabet) == 0 or len(set(alphabet)) != len(alphabet):
+        raise Exception('Invalid alphabet')
+    total = count_strings(alphabet, max_len)
+    result = EquivalenceResult(total)
+    options = (as_function, compare_tapes, max_steps, max_counterexamples, max_undecided)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = ((alphabet, max_len, start, start + chunk_size, options)
+        for start in range(0, total, chunk_size))
+
+    def merge(chunk_result):
+        # add the result of a chunk, returning True once enough counterexamples are found
+        counterexamples, undecided, undecided_count, checked = chunk_result
+        needed = max_counterexamples - len(result.counterexamples)
+        result.counterexamples.extend(counterexamples[:needed])
+        result.undecided.extend(undecided[:max_undecided - len(result.undecided)])
+        result.undecided_count += undecided_count
+        result.checked += checked
+        return len(result.counterexamples) == max_counterexamples
+
+    if workers == 1:
+        machine_a = machine_a.snapshot()
+        machine_b = machine_b.snapshot()
+        chunk_results = (_check_chunk(machine_a, machine_b, *chunk) for chunk in chunks)
+    else:
+        chunk_results = imap_chunks(_check_chunk, chunks, workers,
+            (machine_a.to_dict(), machine_b.to_dict()))
+    for chunk_result in chunk_results:
+        if merge(chunk_result):
+            break
+    chunk_results.close()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Check two machines for equivalence on every input up to a given length.')
+    parser.add_argument('machine_a', help='JSON file of the first machine')
+    parser.add_argument('machine_b', help='JSON file of the second machine')
+    parser.add_argument('-a', '--alphabet', required=True, help='input symbols, e.g. ab')
+    parser.add_argument('-n', '--max-len', type=int, required=True, help='length of the longest inputs')
+    parser.add_argument('-f', '--as-function', action='store_true', help='use the machines as functions')
+    parser.add_argument('-t', '--compare-tapes', action='store_true',
+        help='also compare the tapes left when accepting or rejecting')
+    parser.add_argument('-s', '--max-steps', type=int, default=10000, help='step limit of each run')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='number of worker processes')
+    parser.add_argument('-k', '--counterexamples', type=int, default=1,
+        help='number of counterexamples to find before stopping')
+    args = parser.parse_args()
+    result = check_equivalence(load_machine(args.machine_a), load_machine(args.machine_b),
+        args.alphabet, args.max_len, args.as_function, args.compare_tapes, args.max_steps,
+        args.workers, args.counterexamples)
+    for counterexample in result.counterexamples:
+        print(counterexample)
+    if result.undecided_count > 0:
+        print('{} undecided input(s) reached the step limit, first: {}'.format(
+            result.undecided_count, ', '.join(repr(s) for s in result.undecided)))
+    if result.equivalent:
+        print('Equivalent on all {} inputs'.format(result.checked))
+    else:
+        print('Not equivalent ({} of {} inputs checked)'.format(result.checked, result.total))
+    return 0 if result.equivalent else 1
+
+if __name__ == '__main__':
+    exit(main())
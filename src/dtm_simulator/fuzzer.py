@@ -0,0 +1,187 @@
+"""
+Coverage-guided fuzzing of a machine's inputs, to find inputs on which the
+machine loops or takes the most steps.
+
+Inputs are mutated by inserting, deleting and replacing symbols of the
+machine's alphabet. A mutated input is kept in the corpus, to be mutated
+further, if it uses a transition no input used before or takes more steps
+than any input before it.
+
+Usage: python3 -m dtm_simulator.fuzzer machine.json --duration 60
+"""
+
+import argparse
+import heapq
+import random
+import time
+from .core import load_machine, BUDGET
+
+class FuzzReport():
+    """This is a class to represent the findings of a fuzzing session.
+
+    Attributes:
+        corpus (list): The inputs kept for using new transitions or taking
+            more steps, in the order they were found.
+        coverage (set): The (state, read symbol) of every transition used.
+        hangs (list): The inputs that reached the step limit, which likely
+            make the machine loop, in the order they were found.
+        worst (list): (steps, input) of the inputs that took the most steps
+            without reaching the step limit, most steps first.
+        runs (int): The number of inputs run.
+        elapsed (float): The duration of the session in seconds.
+    """
+
+    def __init__(self):
+        """Initialize an empty report."""
+        self.corpus = []
+        self.coverage = set([])
+        self.hangs = []
+        self.worst = []
+        self.runs = 0
+        self.elapsed = 0.0
+
+    @property
+    def runs_per_sec(self):
+        """The number of inputs run per second."""
+        return self.runs / self.elapsed if self.elapsed > 0 else 0.0
+
+class Fuzzer():
+    """This is a class to fuzz the inputs of a machine.
+
+    Attributes:
+        machine (core.Machine): The machine being fuzzed; a snapshot of the
+            machine given, so it can be edited during a session.
+        alphabet (str): The symbols used to mutate inputs.
+        as_function (bool): Whether or not the machine is used as a function.
+        max_steps (int): The number of steps a run can take at most.
+        max_len (int): The length of the longest input to try.
+    """
+
+    def __init__(self, machine, alphabet=None, as_function=False, max_steps=10000,
+            max_len=64, seed=None, max_hangs=20, max_worst=10):
+        """Initialize this fuzzer for the given machine.
+
+        Parameters:
+            machine (core.Machine): The machine to fuzz. Must be deterministic.
+            alphabet (str): The symbols used to mutate inputs.
+                (default the machine's input alphabet)
+            as_function (bool): Whether or not to use the machine as a function.
+                (default False)
+            max_steps (int): The number of steps a run can take at most.
+                (default 10000)
+            max_len (int): The length of the longest input to try. (default 64)
+            seed (int): Seed of the random mutations. (default None)
+            max_hangs (int): The number of inputs reaching the step limit to
+                report. (default 20)
+            max_worst (int): The number of slowest inputs to report. (default 10)
+        """
+        self.machine = machine.snapshot()
+        self.alphabet = machine.input_alphabet() if alphabet is None else alphabet
+        if len(self.alphabet) == 0:
+            raise Exception('Empty alphabet')
+        self.as_function = as_function
+        self.max_steps = max_steps
+        self.max_len = max_len
+        self._random = random.Random(seed)
+        self._max_hangs = max_hangs
+        self._max_worst = max_worst
+        self.report = FuzzReport()
+        # (steps, input) of the slowest inputs, as a min-heap of bounded size
+        self._worst = []
+        self._seen = set([])
+        self._most_steps = -1
+
+    def add_seed(self, string):
+        """Run the given input and add it to the corpus, whatever it covers."""
+        self._try(string, force=True)
+
+    def _mutate(self, string):
+        # return the string with one to four random insertions, deletions
+        # or replacements of a symbol
+        symbols = list(string)
+        for _ in range(self._random.randint(1, 4)):
+            action = self._random.randrange(3)
+            if action == 0 or len(symbols) == 0:
+                if len(symbols) < self.max_len:
+                    symbols.insert(self._random.randint(0, len(symbols)), self._random.choice(self.alphabet))
+            elif action == 1:
+                del symbols[self._random.randrange(len(symbols))]
+            else:
+                symbols[self._random.randrange(len(symbols))] = self._random.choice(self.alphabet)
+        return ''.join(symbols)
+
+    def _try(self, string, force=False):
+        # run the input, keeping it in the corpus if it is interesting
+        coverage = set([])
+        result = self.machine.run(string, self.as_function, self.max_steps, coverage)
+        report = self.report
+        report.runs += 1
+        new_coverage = not coverage <= report.coverage
+        report.coverage |= coverage
+        if result.reason == BUDGET:
+            if string not in self._seen and len(report.hangs) < self._max_hangs:
+                report.hangs.append(string)
+        elif string not in self._seen:
+            if len(self._worst) < self._max_worst:
+                heapq.heappush(self._worst, (result.steps, string))
+            elif result.steps > self._worst[0][0]:
+                heapq.heapreplace(self._worst, (result.steps, string))
+        more_steps = result.steps > self._most_steps
+        self._most_steps = max(self._most_steps, result.steps)
+        if (force or new_coverage or more_steps) and string not in self._seen:
+            report.corpus.append(string)
+        self._seen.add(string)
+
+    def run(self, iterations=None, duration=None):
+        """Fuzz the machine and return the FuzzReport of the whole session.
+
+        The session can be continued by calling this again. If the corpus is
+        empty, the empty input and each symbol of the alphabet are run first.
+
+        Parameters:
+            iterations (int): The number of mutated inputs to run. (default None)
+            duration (float): The number of seconds to fuzz for. (default None)
+                If neither is given, 10000 inputs are run.
+        """
+        if iterations is None and duration is None:
+            iterations = 10000
+        started = time.monotonic()
+        deadline = None if duration is None else started + duration
+        if len(self.report.corpus) == 0:
+            for string in [''] + list(self.alphabet):
+                self.add_seed(string)
+        count = 0
+        while iterations is None or count < iterations:
+            if deadline is not None and count % 64 == 0 and time.monotonic() > deadline:
+                break
+            self._try(self._mutate(self._random.choice(self.report.corpus)))
+            count += 1
+        self.report.elapsed += time.monotonic() - started
+        self.report.worst = sorted(self._worst, reverse=True)
+        return self.report
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Fuzz the inputs of a machine to find loops and slow inputs.')
+    parser.add_argument('machine', help='JSON file of the machine')
+    parser.add_argument('-a', '--alphabet', default=None, help='input symbols, e.g. ab')
+    parser.add_argument('-f', '--as-function', action='store_true', help='use the machine as a function')
+    parser.add_argument('-s', '--max-steps', type=int, default=10000, help='step limit of each run')
+    parser.add_argument('-l', '--max-len', type=int, default=64, help='length of the longest input')
+    parser.add_argument('-n', '--iterations', type=int, default=None, help='number of inputs to run')
+    parser.add_argument('-t', '--duration', type=float, default=None, help='seconds to fuzz for')
+    parser.add_argument('--seed', type=int, default=None, help='seed of the random mutations')
+    args = parser.parse_args()
+    machine = load_machine(args.machine)
+    fuzzer = Fuzzer(machine, args.alphabet, args.as_function, args.max_steps, args.max_len, args.seed)
+    report = fuzzer.run(args.iterations, args.duration)
+    print('{} runs in {:.1f}s ({:.0f}/s), {} transitions used, corpus of {}'.format(
+        report.runs, report.elapsed, report.runs_per_sec, len(report.coverage), len(report.corpus)))
+    for string in report.hangs:
+        print('reached step limit: {!r}'.format(string))
+    for steps, string in report.worst:
+        print('{} steps: {!r}'.format(steps, string))
+    return 1 if len(report.hangs) != 0 else 0
+
+if __name__ == '__main__':
+    exit(main())
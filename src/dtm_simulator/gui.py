@@ -0,0 +1,2003 @@
+"""
+Classes to organize the sections of the GUI: display, info and control.
+
+Display implements a canvas for the user to graphically view the machine,
+info shows the main information of the machine along with the currently
+selected transition's info and a status bar, and control implements
+three panels to control the states and transitions of the machine, along
+with a panel to test some strings with the machine, a panel to run a batch
+of strings and a panel for a regression test suite rerun as the machine is
+edited.
+
+This is the only module that imports tkinter; main() starts the application.
+"""
+
+from tkinter import Tk, Frame, Button, Label, Entry, OptionMenu, Checkbutton, StringVar, BooleanVar, Canvas, Scrollbar, Scale, Listbox
+from tkinter.ttk import LabelFrame, Notebook
+from .core import Machine, TestingState, Tape, SEMI_INFINITE, TWO_WAY
+from .checkpoint import Checkpoint, Checkpointer
+from .regression import RegressionSuite, PENDING, PASSED, FAILED
+from .batch import BatchRun, INPUT
+from .journal import Journal
+from .jflap import import_jff, export_jff
+from math import sqrt, atan, sin, cos
+from random import randrange
+import os
+import threading
+import time
+
+# file the testing panel writes checkpoints of tests to and resumes them from
+CHECKPOINT_PATH = os.path.join(os.path.expanduser('~'), '.dtm-simulator-checkpoint')
+# file the edits of the machine are journaled to, and recovered from at start
+JOURNAL_PATH = os.path.join(os.path.expanduser('~'), '.dtm-simulator-journal')
+# milliseconds between frames of a sequential test on autoplay, about 30 per second
+FRAME_MS = 33
+# longest time, in seconds, the steps of a single frame are owed for; time
+# the interface was busy beyond this is skipped rather than caught up on
+MAX_FRAME_LAG = 0.1
+# width and height of a cell of the tape view, in pixels
+TAPE_CELL_SIZE = 22
+# milliseconds between refreshes of the suite panel, and the number of
+# failed tests it lists at most
+SUITE_REFRESH_MS = 200
+SUITE_MAX_LISTED = 500
+# milliseconds between refreshes of the batch panel while a batch runs
+BATCH_REFRESH_MS = 200
+# inputs given to a worker at a time when a batch shares the steps of their prefixes
+BATCH_SHARED_CHUNK_SIZE = 4096
+# height of a row of the results table, and the rows it shows at a time
+TABLE_ROW_HEIGHT = 18
+TABLE_ROWS = 8
+
+class StatesPanel(Frame):
+    """This is a class to represent the section where the user can
+    manipulate the states of the machine.
+
+    Attributes:
+        machine (core.Machine): The machine of the user.
+        info_manager (InfoManager): The object that handles the info
+            section of the GUI.
+        display_manager (Display): The object that handles the display
+            to the user.
+    """
+
+    def __init__(self, master, machine, info_manager, display_manager):
+        """Initialize the states panel with the user's machine and appropriate
+        managers.
+
+        The states panel provides the interface for actions pertaining to the
+        states of the machine. This panel implements an entry for the user to
+        specify which state number to work on, and buttons to add a state, delete
+        a state, set a state as initial, final and non-final, and optimize the
+        machine, along with an entry for a JFLAP file to import the machine
+        from or export it to.
+
+        Parameters:
+            machine (core.Machine): The machine of the user.
+            info_manager (InfoManager): The object that handles the info
+                section of the GUI.
+            display_manager (Display): The object that handles the display
+                to the user.
+        """
+        super().__init__(master=master)
+        self.pack(fill='x')
+        self.machine = machine
+        self.info_manager = info_manager
+        self.display_manager = display_manager
+        # first row
+        self._add_state_btn = Button(self, text='Add state', command=self._add_state)
+        self._add_state_btn.grid(row=0,column=0,pady=4)
+        self._optimize_btn = Button(self, text='Optimize', command=self._optimize)
+        self._optimize_btn.grid(row=0,column=2,pady=4)
+        # second row
+        self._state_entry_label = Label(self, text='Enter state number')
+        self._state_entry_label.grid(row=1,column=0)
+        self._state_entry = Entry(self, width=3)
+        self._state_entry.grid(row=1,column=1)
+        self._set_init_btn = Button(self, text='Set as initial', command=self._set_init)
+        self._set_init_btn.grid(row=1,column=2,padx=2)
+        self._set_final_btn = Button(self, text='Set as final', command=self._set_final)
+        self._set_final_btn.grid(row=1,column=3,padx=2)
+        self._set_nonfinal_btn = Button(self, text='Set as non-final', command=self._set_nonfinal)
+        self._set_nonfinal_btn.grid(row=1,column=4,padx=2)
+        self._del_state_btn = Button(self, text='Delete state', command=self._del_state)
+        self._del_state_btn.grid(row=1,column=5,padx=2)
+        # third row
+        self._jflap_entry_label = Label(self, text='JFLAP file')
+        self._jflap_entry_label.grid(row=2,column=0)
+        self._jflap_entry = Entry(self)
+        self._jflap_entry.grid(row=2,column=1,columnspan=3,sticky='we')
+        self._import_btn = Button(self, text='Import', command=self._import_jff)
+        self._import_btn.grid(row=2,column=4,padx=2,pady=4)
+        self._export_btn = Button(self, text='Export', command=self._export_jff)
+        self._export_btn.grid(row=2,column=5,padx=2,pady=4)
+
+    def _add_state(self):
+        # add a state to the machine, calling functions in the display and info
+        # managers to update the GUI
+        self.machine.add_state()
+        self.info_manager.update_info()
+        added_init_state = self.machine.init_state == self.machine.max_state_num
+        self.display_manager.add_state(self.machine.max_state_num, as_init=added_init_state)
+
+    def _optimize(self):
+        # replace the machine with its optimized copy, which also computes the
+        # same as a function, drawing each of its states where the first state
+        # mapped to it was
+        try:
+            optimized, mapping = self.machine.optimize(as_function=True)
+        except Exception as e:
+            self.info_manager.update_status(str(e))
+            return
+        positions = {}
+        for state in sorted(mapping):
+            positions.setdefault(mapping[state], self.display_manager.state_position(state))
+        self._replace_machine(optimized, positions)
+        self.info_manager.update_status('Optimized to {} states'.format(len(optimized.states)))
+
+    def _import_jff(self):
+        # replace the machine with the one in the JFLAP file of the entry,
+        # drawing its states where JFLAP did and showing the first of the
+        # warnings of the import, if any
+        try:
+            imported, positions, warnings = import_jff(self._jflap_entry.get(), self.machine.blank)
+        except OSError:
+            self.info_manager.update_status('Cannot read file')
+            return
+        except Exception as e:
+            self.info_manager.update_status(str(e))
+            return
+        self._replace_machine(imported, positions)
+        if len(warnings) == 0:
+            self.info_manager.update_status('Imported {} states'.format(len(imported.states)))
+        else:
+            self.info_manager.update_status('{} ({} warnings)'.format(warnings[0], len(warnings)))
+
+    def _export_jff(self):
+        # export the machine to the JFLAP file of the entry, as drawn
+        positions = {state: self.display_manager.state_position(state) for state in self.machine.states}
+        try:
+            warnings = export_jff(self.machine, self._jflap_entry.get(), positions)
+        except OSError:
+            self.info_manager.update_status('Cannot write file')
+            return
+        if len(warnings) == 0:
+            self.info_manager.update_status('Exported machine')
+        else:
+            self.info_manager.update_status('{} ({} warnings)'.format(warnings[0], len(warnings)))
+
+    def _replace_machine(self, other, positions):
+        # replace the states and transitions of the machine with those of the
+        # other machine through the machine's methods, so that its listeners
+        # see every change, drawing the states at the given positions
+        for state in sorted(self.machine.states):
+            init_deleted = state == self.machine.init_state
+            self.machine.del_state(state)
+            self.display_manager.del_state(state, init_deleted)
+        if self.machine.nondeterministic != other.nondeterministic:
+            self.machine.set_nondeterministic(other.nondeterministic)
+        if self.machine.tape_model != other.tape_model:
+            self.machine.set_tape_model(other.tape_model)
+        if self.machine.tracks is not None or other.tracks is not None:
+            self.machine.set_tracks(1 if other.tracks is None else other.tracks.count,
+                '' if other.tracks is None else other.tracks.alphabet)
+        numbers = {}
+        for state in sorted(other.states):
+            self.machine.add_state()
+            numbers[state] = self.machine.max_state_num
+            self.display_manager.add_state(numbers[state], state == other.init_state, positions.get(state))
+            if state == other.init_state:
+                self.machine.set_init_state(numbers[state])
+            if other.final_states[state]:
+                self.machine.set_final_state(numbers[state])
+                self.display_manager.set_final(numbers[state])
+        for from_state in other.transitions:
+            for to_state, transition_set in other.transitions[from_state].items():
+                for transition in transition_set:
+                    self.machine.add_transition(numbers[from_state], numbers[to_state], transition.cnf)
+                    self.display_manager.add_transition(numbers[from_state], numbers[to_state],
+                        transition.cnf)
+        self.info_manager.update_info()
+        self.info_manager.hide_transitions()
+
+    def _del_state(self):
+        # delete a state from the machine according to the user's entry
+        # in the GUI, clearing the entry and updating the status bar appropriately
+        try:
+            target_state = int(self._state_entry.get())
+            init_deleted = target_state == self.machine.init_state
+            deleted = self.machine.del_state(target_state)
+            if deleted: self.display_manager.del_state(target_state, init_deleted)
+        except ValueError:
+            self.info_manager.update_status('Enter state number')
+        self._state_entry.delete(0, 'end')
+        self.info_manager.update_info()
+        self.info_manager.hide_transitions()
+
+    def _set_init(self):
+        # set the specified state in the GUI's entry as initial,
+        # clearing the entry and updating the status bar appropriately
+        try:
+            target_state = int(self._state_entry.get())
+            self.machine.set_init_state(target_state)
+            self.display_manager.set_init(target_state)
+        except ValueError:
+            self.info_manager.update_status('Enter state number')
+        except Exception as e:
+            self.info_manager.update_status(str(e))
+        self._state_entry.delete(0, 'end')
+        self.info_manager.update_info()
+
+    def _set_final(self):
+        # set the specified state in the GUI's entry as final,
+        # clearing the entry and updating the status bar appropriately
+        try:
+            target_state = int(self._state_entry.get())
+            self.machine.set_final_state(target_state)
+            self.display_manager.set_final(target_state)
+        except ValueError:
+            self.info_manager.update_status('Enter state number')
+        except Exception as e:
+            self.info_manager.update_status(str(e))
+        self._state_entry.delete(0, 'end')
+        self.info_manager.update_info()
+
+    def _set_nonfinal(self):
+        # set the specified state in the GUI's entry as non-final,
+        # clearing the entry and updating the status bar appropriately
+        try:
+            target_state = int(self._state_entry.get())
+            self.machine.set_nonfinal_state(target_state)
+            self.display_manager.set_nonfinal(target_state)
+        except ValueError:
+            self.info_manager.update_status('Enter state number')
+        except Exception as e:
+            self.info_manager.update_status(str(e))
+        self._state_entry.delete(0, 'end')
+        self.info_manager.update_info()
+
+class TransitionsPanel(Frame):
+    """This is a class to represent the section where the user
+    can add and delete transitions in the machine.
+
+    Attributes:
+        machine (core.Machine): The machine of the user.
+        info_manager (InfoManager): The object that handles the info
+            section of the GUI.
+        display_manager (Display): The object that handles the display
+            to the user.
+    """
+
+    def __init__(self, master, machine, info_manager, display_manager):
+        """Initialize the transitions panel with the user's machine and
+        appropriate managers
+
+        The transitions panel provides the interface where the user can
+        add and delete transitions in the machine, and set the tracks of its
+        tape; on a multi-track tape, the read and write entries take a part
+        per track separated by '|'.
+
+        Parameters:
+            machine (core.Machine): The machine of the user.
+            info_manager (InfoManager): The object that handles the info
+                section of the GUI.
+            display_manager (Display): The object that handles the display
+                to the user.
+        """
+        super().__init__(master=master)
+        self.pack(fill='x')
+        self.machine = machine
+        self.info_manager = info_manager
+        self.display_manager = display_manager
+        # states prompts
+        self._t_prompt1 = Label(self, text='Source state')
+        self._t_prompt1.grid(row=0,column=0,padx=5)
+        self._t_prompt2 = Label(self, text='Target state')
+        self._t_prompt2.grid(row=0,column=1,padx=5)
+        # configuration prompts
+        self._cnf_prompt1 = Label(self, text='R')
+        self._cnf_prompt1.grid(row=0,column=2)
+        self._cnf_prompt2 = Label(self, text='W')
+        self._cnf_prompt2.grid(row=0,column=3)
+        self._cnf_prompt3 = Label(self, text='M')
+        self._cnf_prompt3.grid(row=0,column=4)
+        # state entries
+        self._f_state_entry = Entry(self, width=3)
+        self._f_state_entry.grid(row=1,column=0)
+        self._t_state_entry = Entry(self, width=3)
+        self._t_state_entry.grid(row=1,column=1)
+        # configuration entry restrictions
+        self._cnf_var1 = StringVar()
+        self._cnf_var1.trace('w', lambda *args: self._restrict_entry(self._cnf_var1,*args))
+        self._cnf_var2 = StringVar()
+        self._cnf_var2.trace('w', lambda *args: self._restrict_entry(self._cnf_var2,*args))
+        # configuration entries
+        self._cnf_read_entry = Entry(self, width=6, textvariable=self._cnf_var1)
+        self._cnf_read_entry.grid(row=1,column=2)
+        self._cnf_write_entry = Entry(self, width=3, textvariable=self._cnf_var2)
+        self._cnf_write_entry.grid(row=1,column=3)
+        self._cnf_move_var = StringVar(self)
+        self._cnf_move_var.set('R')
+        self._cnf_move_entry = OptionMenu(self, self._cnf_move_var, 'L', 'R')
+        self._cnf_move_entry.grid(row=1,column=4)
+        # buttons
+        self._add_transition_btn = Button(self, text='Add', command=self._add_transition)
+        self._add_transition_btn.grid(row=1,column=5,padx=2)
+        self._del_transition_btn = Button(self, text='Delete', command=self._del_transition)
+        self._del_transition_btn.grid(row=1,column=6,padx=2)
+        # check box for a non-deterministic machine
+        self._nondet_var = BooleanVar(self, value=machine.nondeterministic)
+        self._nondet_btn = Checkbutton(self, text='non-deterministic', variable=self._nondet_var,
+            command=self._set_nondeterministic)
+        self._nondet_btn.grid(row=1,column=7)
+        # entries for the number of tracks and their symbols
+        self._tracks_prompt = Label(self, text='Tracks')
+        self._tracks_prompt.grid(row=2,column=0,pady=4)
+        self._tracks_entry = Entry(self, width=3)
+        self._tracks_entry.grid(row=2,column=1)
+        self._track_symbols_prompt = Label(self, text='Track symbols')
+        self._track_symbols_prompt.grid(row=2,column=2,columnspan=2)
+        self._track_symbols_entry = Entry(self, width=12)
+        self._track_symbols_entry.grid(row=2,column=4,columnspan=2)
+        self._set_tracks_btn = Button(self, text='Set tracks', command=self._set_tracks)
+        self._set_tracks_btn.grid(row=2,column=6,padx=2)
+        self._show_tracks()
+        machine.add_listener(self._machine_changed)
+
+    def _machine_changed(self, change, state_num, transition):
+        # listener of the machine; keep the check box and the track entries in
+        # step when the machine's determinism or tracks are set elsewhere, as
+        # by an import
+        if change == 'set_nondeterministic':
+            self._nondet_var.set(self.machine.nondeterministic)
+        elif change == 'set_tracks':
+            self._show_tracks()
+
+    def _show_tracks(self):
+        # show the tracks of the machine in the track entries, widening the
+        # read and write entries to fit a part per track
+        tracks = self.machine.tracks
+        count = 1 if tracks is None else tracks.count
+        self._tracks_entry.delete(0, 'end')
+        self._tracks_entry.insert(0, str(count))
+        self._track_symbols_entry.delete(0, 'end')
+        if tracks is not None:
+            self._track_symbols_entry.insert(0, tracks.alphabet)
+        self._cnf_read_entry.config(width=6*count)
+        self._cnf_write_entry.config(width=4*count-1)
+
+    def _set_tracks(self):
+        # set the tracks of the machine according to the track entries
+        try:
+            self.machine.set_tracks(int(self._tracks_entry.get()), self._track_symbols_entry.get())
+            tracks = self.machine.tracks
+            self.info_manager.update_status('1 track' if tracks is None else '{} tracks'.format(tracks.count))
+        except ValueError:
+            self.info_manager.update_status('Enter number of tracks')
+            self._show_tracks()
+        except Exception as e:
+            self.info_manager.update_status(str(e))
+            self._show_tracks()
+    
+    def _restrict_entry(self, entry, *args):
+        # restrict the given entry to one character in length only, or to
+        # a pattern in brackets such as [^#], for each track separated by '|'
+        # on a multi-track tape
+        tracks = self.machine.tracks
+        parts = [entry.get()] if tracks is None else entry.get().split('|')[:tracks.count]
+        for i, val in enumerate(parts):
+            if val.startswith('['):
+                end = val.find(']')
+                if end != -1 and end != len(val) - 1: parts[i] = val[:end+1]
+            elif len(val) > 1: parts[i] = val[0]
+        if '|'.join(parts) != entry.get(): entry.set('|'.join(parts))
+
+    def _add_transition(self):
+        # add a transition to the machine according to the info
+        # specified by the user, clear the entries and update the statuse bar
+        try:
+            f_state = self._f_state_entry.get()
+            if f_state == '':
+                raise Exception('Enter source')
+            else:
+                f_state = int(f_state)
+            t_state = self._t_state_entry.get()
+            if t_state != '':
+                t_state = int(t_state)
+            else:
+                raise Exception('Enter target')
+            cnf = '({},{},{})'.format(
+                self._cnf_read_entry.get(),self._cnf_write_entry.get(),self._cnf_move_var.get())
+            self.machine.add_transition(f_state, t_state, cnf)
+            self.display_manager.add_transition(f_state, t_state, cnf)
+            self.info_manager.update_status('Added transition')
+            self.info_manager.show_transitions(f_state, t_state)
+        except ValueError:
+            self.info_manager.update_status('Invalid input')
+        except Exception as e:
+            self.info_manager.update_status(str(e))
+        self._f_state_entry.delete(0, 'end')
+        self._t_state_entry.delete(0, 'end')
+        self._cnf_read_entry.delete(0, 'end')
+        self._cnf_write_entry.delete(0, 'end')
+        self.info_manager.update_info()
+
+    def _set_nondeterministic(self):
+        # set whether or not the machine is non-deterministic according to the
+        # check box, unchecking it again if the machine has non-determinism
+        try:
+            self.machine.set_nondeterministic(self._nondet_var.get())
+            self.info_manager.update_status(
+                'Non-deterministic' if self.machine.nondeterministic else 'Deterministic')
+        except Exception as e:
+            self._nondet_var.set(self.machine.nondeterministic)
+            self.info_manager.update_status(str(e))
+
+    def _del_transition(self):
+        # delete a transition from the machine according to the info
+        # specified by the user, clear the entries and update the status bar
+        try:
+            f_state = self._f_state_entry.get()
+            if f_state == '':
+                raise Exception('Enter source')
+            else:
+                f_state = int(f_state)
+            t_state = self._t_state_entry.get()
+            if t_state != '':
+                t_state = int(t_state)
+            else:
+                raise Exception('Enter target')
+            cnf = '({},{},{})'.format(
+                self._cnf_read_entry.get(),self._cnf_write_entry.get(),self._cnf_move_var.get())
+            deleted = self.machine.del_transition(f_state, t_state, cnf)
+            self.display_manager.del_transition(f_state, t_state, cnf)
+            result = 'Deleted transition' if deleted else 'Transition not found'
+            self.info_manager.update_status(result)
+            if deleted: self.info_manager.show_transitions(f_state, t_state)
+        except ValueError:
+            self.info_manager.update_status('Invalid input')
+        except Exception as e:
+            self.info_manager.update_status(str(e))
+        self._f_state_entry.delete(0, 'end')
+        self._t_state_entry.delete(0, 'end')
+        self._cnf_read_entry.delete(0, 'end')
+        self._cnf_write_entry.delete(0, 'end')
+        self._cnf_move_var.set('R')
+        self.info_manager.update_info()
+
+class TestingPanel(Frame):
+    """This is a class to represent the interface where the user can
+    test strings with the machine.
+
+    The user can test their given string with the machine for acceptance or
+    rejection, or work on that string using the machine as a function to just
+    output the results. In both cases the user can optionally choose to run
+    the test sequentially; as in they can see the machine in-action with a
+    button to advance it.
+
+    Attributes:
+        machine (core.Machine): The machine of the user.
+        info_manager (InfoManager): The object that handles the info
+            section of the GUI.
+        display_manager (Display): The object that handles the display
+            to the user.
+    """
+
+    def __init__(self, master, machine, info_manager, display_manager):
+        """Initialize this testing panel with the user's machine and
+        the necessary managers.
+
+        Parameters:
+            machine (core.Machine): The machine of the user.
+            info_manager (InfoManager): The object that handles the info
+                section of the GUI.
+            display_manager (Display): The object that handles the display
+                to the user.
+        """
+        super().__init__(master=master)
+        self.grid_columnconfigure(1, weight=1)
+        self.pack(fill='x')
+        self.machine = machine
+        self.info_manager = info_manager
+        self.display_manager = display_manager
+        # TestingState object to be used in sequential tests
+        self._testing_state = None
+        # snapshot of the machine taken when the current test started,
+        # so that the user can keep editing the machine during the test
+        self._test_machine = None
+        # prompt and entry for the test string
+        self._test_str_prompt = Label(self, text='Enter test string')
+        self._test_str_prompt.grid(row=0,column=0)
+        self._test_str_entry = Entry(self, width=50)
+        self._test_str_entry.grid(stick='we',row=0,column=1)
+        # check boxes for "as function" and "sequential test"
+        self._as_function_var = BooleanVar(self)
+        self._as_func_btn = Checkbutton(self, text='as function', variable=self._as_function_var)
+        self._as_func_btn.grid(row=0,column=2)
+        self._seq_var = BooleanVar(self)
+        self._seq_btn = Checkbutton(self, text='sequential test', variable=self._seq_var)
+        self._seq_btn.grid(row=0,column=3,columnspan=2)
+        # check box for the tape model of the machine
+        self._two_way_var = BooleanVar(self, value=machine.tape_model == TWO_WAY)
+        self._two_way_btn = Checkbutton(self, text='two-way tape', variable=self._two_way_var,
+            command=self._set_tape_model)
+        self._two_way_btn.grid(row=2,column=2)
+        # check box to write checkpoints of tests, and button to resume the last one
+        self._checkpoint_var = BooleanVar(self)
+        self._checkpoint_btn = Checkbutton(self, text='checkpoints', variable=self._checkpoint_var)
+        self._checkpoint_btn.grid(row=2,column=3,columnspan=2)
+        self._resume_btn = Button(self, text='Resume', command=self._resume)
+        self._resume_btn.grid(row=2,column=5)
+        # check box to stop tests found to loop forever
+        self._detect_loops_var = BooleanVar(self, value=True)
+        self._detect_loops_btn = Checkbutton(self, text='detect loops', variable=self._detect_loops_var)
+        self._detect_loops_btn.grid(row=2,column=1,sticky='e')
+        # run test button
+        self._test_btn = Button(self, text='Run test', command=self._run_test)
+        self._test_btn.grid(row=0,column=5)
+        # tape result label
+        self._tape_result_lbl = Label(self, text='Tape result')
+        self._tape_result_lbl.grid(row=1,column=0)
+        self._tape_view = TapeView(self)
+        self._tape_view.set_tracks(machine.tracks)
+        self._tape_view.grid(sticky='we',row=1,column=1,pady=6)
+        # result label (acceptance/rejection)
+        self._result = Label(self, width=10, fg='white')
+        self._btn_og_color = self._result.cget('bg')
+        self._result.grid(row=1,column=2)
+        # buttons to be used during the tests
+        self._next_btn = Button(self, text='Next', command=self._next)
+        self._next_btn.grid(row=1,column=3)
+        self._next_btn.grid_remove()
+        self._stop_btn = Button(self, text='Stop', command=self._stop)
+        self._stop_btn.grid(row=1,column=4)
+        self._stop_btn.grid_remove()
+        self._clear_btn = Button(self, text='Clear', command=self._clear)
+        self._clear_btn.grid(row=1,column=5)
+        self._clear_btn.grid_remove()
+        # play/pause button and speed slider for sequential tests, the
+        # speed being 10 ** slider value steps per second
+        self._play_btn = Button(self, text='Play', width=5, command=self._play)
+        self._play_btn.grid(row=1,column=6)
+        self._play_btn.grid_remove()
+        self._speed_scale = Scale(self, from_=0, to=6, resolution=0.1, orient='horizontal',
+            showvalue=0, command=self._set_speed)
+        self._speed_scale.grid(row=2,column=6,columnspan=2)
+        self._speed_lbl = Label(self, width=12)
+        self._speed_lbl.grid(row=3,column=6,columnspan=2)
+        self._speed_scale.set(1)
+        self._set_speed(1)
+        # identifier of the next frame of autoplay, None if not playing,
+        # the time of the last frame and the fraction of a step owed
+        self._play_job = None
+        self._last_frame = 0.0
+        self._owed_steps = 0.0
+        # testing thread that is running the test,
+        # meant to allow the user to exit infinite loop machines
+        self._test_thread = None
+        machine.add_listener(self._machine_changed)
+
+    def _machine_changed(self, change, state_num, transition):
+        # listener of the machine; keep the check box in step when the
+        # machine's tape model is set elsewhere, as by an import, and the
+        # tape view in step with its tracks
+        if change == 'set_tape_model':
+            self._two_way_var.set(self.machine.tape_model == TWO_WAY)
+        elif change == 'set_tracks':
+            self._tape_view.set_tracks(self.machine.tracks)
+
+    def _test_task(self, test_machine, as_function):
+        # task function to be executed by the testing thread;
+        # execute the computation and update the appropriate labels
+        self._stop_btn.grid()
+        if test_machine.nondeterministic:
+            return self._search_task(test_machine)
+        result = test_machine.run(self._test_str_entry.get(), as_function,
+            checkpointer=self._new_checkpointer(), detect_loops=self._detect_loops_var.get())
+        self._show_results(result)
+
+    def _resume_task(self, test_machine, checkpoint):
+        # task function to be executed by the testing thread when resuming
+        # a checkpoint; continue the computation and update the labels
+        self._stop_btn.grid()
+        result = test_machine.resume(checkpoint, checkpointer=self._new_checkpointer(),
+            detect_loops=self._detect_loops_var.get())
+        self._show_results(result)
+
+    def _show_results(self, result):
+        # show the core.RunResult of a non-sequential test, and the
+        # statistics of its run in the status bar
+        self._stop_btn.grid_remove()
+        self._test_btn.config(state='normal')
+        self._resume_btn.config(state='normal')
+        self._tape_view.show(result.tape, result.index)
+        if result.reason == 'loops':
+            self._result.config(text='Loops', bg='orange')
+            self.info_manager.update_status('Loops every {} steps from step {}'.format(
+                result.cycle_length, result.cycle_start))
+            self._test_thread = None
+            return
+        if not result.as_function:
+            if result.accepted:
+                self._result.config(text='Accepted', bg='green')
+            else:
+                self._result.config(text='Rejected', bg='red')
+        self.info_manager.update_status('{} steps in {:.3f}s ({:.0f}/s), {} cells spanned'.format(
+            result.steps, result.elapsed, result.steps_per_sec, result.cells_spanned))
+        self._test_thread = None
+
+    def _search_task(self, test_machine):
+        # task function to be executed by the testing thread for a
+        # non-deterministic machine; search for an accepting branch and
+        # show its path in the status bar
+        result = test_machine.search(self._test_str_entry.get())
+        self._stop_btn.grid_remove()
+        self._test_btn.config(state='normal')
+        self._resume_btn.config(state='normal')
+        if result.reason == 'aborted':
+            return
+        if result.accepted:
+            self._tape_view.show(Tape(result.tape, test_machine.blank, test_machine.tape_model == TWO_WAY))
+            self._result.config(text='Accepted', bg='green')
+            self.info_manager.update_status('Path: ' + ' -> '.join(str(s) for s in result.path_states()))
+        elif result.accepted is None:
+            self._result.config(text='Unknown', bg='gray')
+            self.info_manager.update_status('Search budget exceeded')
+        else:
+            self._result.config(text='Rejected', bg='red')
+        self._test_thread = None
+
+    def _run_test(self):
+        # run the test according to the data given by the user
+        self._result.config(text='', bg=self._btn_og_color)
+        if self.machine.is_empty():
+            self.info_manager.update_status('Empty machine')
+            return
+        sequential = self._seq_var.get()
+        as_function = self._as_function_var.get()
+        if self.machine.nondeterministic and (sequential or as_function):
+            self.info_manager.update_status('Non-deterministic machine cannot be tested {}'.format(
+                'sequentially' if sequential else 'as a function'))
+            return
+        self.info_manager.update_status('{} is blank symbol'.format(self.machine.blank))
+        self._test_btn.config(state='disabled')
+        self._resume_btn.config(state='disabled')
+        self.display_manager.clear_highlight()
+        self._clear_btn.grid_remove()
+        self._test_machine = self.machine.snapshot()
+        if not sequential:
+            self._tape_view.clear()
+            self._test_thread = threading.Thread(target=self._test_task, args=(self._test_machine, as_function))
+            self._test_thread.daemon = True
+            self._test_thread.start()
+        else: # sequential test
+            self._testing_state = TestingState(self._test_str_entry.get(), as_function,
+                self._test_machine.init_state, self._test_machine.blank,
+                self._test_machine.tape_model == TWO_WAY)
+            self._start_sequential()
+
+    def test_sequentially(self, string, as_function):
+        """Start a sequential test of the given string, unless a test is running.
+
+        Parameters:
+            string (str): The string to test.
+            as_function (bool): Whether or not to use the machine as a function.
+        """
+        if self._test_btn.cget('state') == 'disabled':
+            self.info_manager.update_status('A test is running')
+            return
+        self._test_str_entry.delete(0, 'end')
+        self._test_str_entry.insert(0, string)
+        self._as_function_var.set(as_function)
+        self._seq_var.set(True)
+        self._run_test()
+
+    def _start_sequential(self):
+        # show the testing state of a sequential test that is starting
+        self._testing_state.checkpointer = self._new_checkpointer()
+        self._tape_view.clear()
+        self._tape_view.show(self._testing_state.cells, self._testing_state.index)
+        self._next_btn.grid()
+        self._play_btn.grid()
+        self._stop_btn.grid()
+        self.display_manager.clear_highlight()
+        self.display_manager.highlight_state(self._testing_state.current_state)
+
+    def _new_checkpointer(self):
+        # return a checkpointer for a test if the checkpoints box is checked
+        return Checkpointer(CHECKPOINT_PATH) if self._checkpoint_var.get() else None
+
+    def _resume(self):
+        # continue the test saved in the last checkpoint, sequentially
+        # if the sequential test box is checked
+        self._result.config(text='', bg=self._btn_og_color)
+        if self.machine.is_empty():
+            self.info_manager.update_status('Empty machine')
+            return
+        try:
+            checkpoint = Checkpoint.load(CHECKPOINT_PATH)
+        except OSError:
+            self.info_manager.update_status('No checkpoint')
+            return
+        except Exception as e:
+            self.info_manager.update_status(str(e))
+            return
+        if checkpoint.fingerprint != self.machine.fingerprint():
+            self.info_manager.update_status('Checkpoint is of another machine')
+            return
+        self.info_manager.update_status('Resumed at step {}'.format(checkpoint.steps))
+        self._test_btn.config(state='disabled')
+        self._resume_btn.config(state='disabled')
+        self.display_manager.clear_highlight()
+        self._clear_btn.grid_remove()
+        self._test_machine = self.machine.snapshot()
+        if not self._seq_var.get():
+            self._tape_view.clear()
+            self._test_thread = threading.Thread(target=self._resume_task, args=(self._test_machine, checkpoint))
+            self._test_thread.daemon = True
+            self._test_thread.start()
+        else:
+            self._testing_state = TestingState.from_checkpoint(checkpoint)
+            self._start_sequential()
+
+    def _next(self):
+        # advance the machine; "next" computation in the sequential test
+        self._test_machine.compute_one(self._testing_state)
+        self._show_testing_state()
+
+    def _play(self):
+        # start or pause advancing the sequential test on its own
+        if self._play_job is not None:
+            self._pause()
+            return
+        self._play_btn.config(text='Pause')
+        self._last_frame = time.monotonic()
+        self._owed_steps = 0.0
+        self._play_job = self.after(FRAME_MS, self._play_frame)
+
+    def _pause(self):
+        # stop advancing the sequential test on its own
+        if self._play_job is not None:
+            self.after_cancel(self._play_job)
+            self._play_job = None
+        self._play_btn.config(text='Play')
+
+    def _play_frame(self):
+        # take the steps owed since the last frame at the current speed in
+        # one batch, then redraw the test once
+        self._play_job = None
+        now = time.monotonic()
+        self._owed_steps += self._speed * min(now - self._last_frame, MAX_FRAME_LAG)
+        self._last_frame = now
+        steps = int(self._owed_steps)
+        self._owed_steps -= steps
+        if steps != 0:
+            self._test_machine.advance(self._testing_state, steps)
+            self._show_testing_state()
+        if self._testing_state is not None:
+            self._play_job = self.after(FRAME_MS, self._play_frame)
+        else:
+            self._play_btn.config(text='Play')
+
+    def _set_speed(self, value):
+        # set the speed of autoplay from the value of the slider
+        self._speed = 10 ** float(value)
+        self._speed_lbl.config(text='{:,.0f} steps/s'.format(self._speed))
+
+    def _show_testing_state(self):
+        # show the tape and state of the sequential test, and its result
+        # once it is done
+        self._tape_view.show(self._testing_state.cells, self._testing_state.index)
+        self.display_manager.highlight_state(self._testing_state.current_state)
+        if self._testing_state.done:
+            self._pause()
+            if not self._testing_state.as_function:
+                if self._testing_state.result:
+                    self._result.config(text='Accepted', bg='green')
+                else:
+                    self._result.config(text='Rejected', bg='red')
+            self._next_btn.grid_remove()
+            self._play_btn.grid_remove()
+            self._stop_btn.grid_remove()
+            self._clear_btn.grid()
+            self._test_btn.config(state='normal')
+            self._resume_btn.config(state='normal')
+            self._testing_state = None
+
+    def _stop(self):
+        # stop the test; aborting the computation of the testing thread's machine
+        if self._test_thread is not None: # non-sequential test
+            self._test_machine.abort = True
+            self._test_thread = None
+            self._stop_btn.grid_remove()
+            self._test_btn.config(state='normal')
+            self._resume_btn.config(state='normal')
+            self.info_manager.update_status('Aborted test')
+        else: # sequential test
+            self._pause()
+            testing_state = self._testing_state
+            if testing_state.checkpointer is not None:
+                testing_state.checkpointer.save(self._test_machine, testing_state.current_state,
+                    testing_state.index, testing_state.steps, testing_state.as_function, testing_state.cells)
+            self._testing_state = None
+            self._tape_view.clear()
+            self._next_btn.grid_remove()
+            self._play_btn.grid_remove()
+            self._stop_btn.grid_remove()
+            self._test_btn.config(state='normal')
+            self._resume_btn.config(state='normal')
+            self.display_manager.clear_highlight()
+            self.info_manager.update_status('Stopped test')
+
+    def _set_tape_model(self):
+        # set the tape model of the machine according to the check box,
+        # taking effect from the next test
+        self.machine.set_tape_model(TWO_WAY if self._two_way_var.get() else SEMI_INFINITE)
+        self.info_manager.update_status('{} tape'.format(self.machine.tape_model.capitalize()))
+
+    def _clear(self):
+        # clear the highlighted state in the display, if any
+        self.display_manager.clear_highlight()
+        self._clear_btn.grid_remove()
+
+class BatchPanel(Frame):
+    """This is a class to represent the section where the user can run a
+    batch of strings in the background and look through their results.
+
+    Attributes:
+        machine (core.Machine): The machine of the user.
+        info_manager (InfoManager): The object that handles the info
+            section of the GUI.
+        testing_panel (TestingPanel): The panel a string is tested
+            sequentially in when its row of results is clicked.
+        batch (batch.BatchRun): The batch running or last run, None if
+            there is none.
+    """
+
+    def __init__(self, master, machine, info_manager, testing_panel):
+        """Initialize this batch panel with the user's machine, the info manager
+        and the testing panel.
+
+        The batch panel provides an entry for the path of a file of strings, one
+        per line, buttons to load them or paste them from the clipboard, an entry
+        for the step limit of each string, a button to run or stop the batch, a
+        check box to share the steps of strings with common prefixes, and a
+        table of the results filled in as the batch runs.
+
+        Parameters:
+            machine (core.Machine): The machine of the user.
+            info_manager (InfoManager): The object that handles the info
+                section of the GUI.
+            testing_panel (TestingPanel): The panel a string is tested
+                sequentially in when its row of results is clicked.
+        """
+        super().__init__(master=master)
+        self.grid_columnconfigure(1, weight=1)
+        self.pack(fill='x')
+        self.machine = machine
+        self.info_manager = info_manager
+        self.testing_panel = testing_panel
+        self.batch = None
+        # strings of the next batch
+        self._strings = []
+        # first row
+        self._path_lbl = Label(self, text='Inputs file')
+        self._path_lbl.grid(row=0,column=0)
+        self._path_entry = Entry(self)
+        self._path_entry.grid(sticky='we',row=0,column=1)
+        self._load_btn = Button(self, text='Load', command=self._load)
+        self._load_btn.grid(row=0,column=2,padx=2)
+        self._paste_btn = Button(self, text='Paste', command=self._paste)
+        self._paste_btn.grid(row=0,column=3,padx=2)
+        # second row
+        self._steps_lbl = Label(self, text='Max steps')
+        self._steps_lbl.grid(row=1,column=0)
+        self._steps_entry = Entry(self, width=10)
+        self._steps_entry.insert(0, '10000')
+        self._steps_entry.grid(sticky='w',row=1,column=1)
+        self._as_function_var = BooleanVar(self)
+        self._as_func_btn = Checkbutton(self, text='as function', variable=self._as_function_var)
+        self._as_func_btn.grid(row=1,column=2)
+        self._run_btn = Button(self, text='Run batch', width=9, command=self._run)
+        self._run_btn.grid(row=1,column=3,padx=2)
+        self._progress_lbl = Label(self, text='No inputs')
+        self._progress_lbl.grid(sticky='w',row=2,column=0,columnspan=2)
+        self._share_var = BooleanVar(self)
+        self._share_btn = Checkbutton(self, text='share prefixes', variable=self._share_var)
+        self._share_btn.grid(row=2,column=2,columnspan=2)
+        # results
+        self._table = ResultsTable(self, [('Input', 160), ('Result', 70), ('Tape', 160),
+            ('Steps', 70), ('Time (ms)', 70)], [str, str, str, str, lambda t: '{:.3f}'.format(t * 1000)],
+            self._select)
+        self._table.grid(sticky='we',row=3,column=0,columnspan=4)
+
+    def _load(self):
+        # read the strings of the next batch from the file of the entry
+        try:
+            with open(self._path_entry.get()) as f:
+                self._set_strings(f.read())
+        except OSError:
+            self.info_manager.update_status('Cannot read inputs')
+
+    def _paste(self):
+        # take the strings of the next batch from the clipboard
+        try:
+            self._set_strings(self.clipboard_get())
+        except Exception:
+            self.info_manager.update_status('Clipboard is empty')
+
+    def _set_strings(self, text):
+        # set the strings of the next batch, one per line of the text
+        self._strings = text.splitlines()
+        self._progress_lbl.config(text='{} inputs'.format(len(self._strings)))
+
+    def _run(self):
+        # start a batch of the strings, or stop the batch running
+        if self.batch is not None and not self.batch.done:
+            self.batch.cancel()
+            return
+        try:
+            max_steps = int(self._steps_entry.get())
+            share = self._share_var.get()
+            self.batch = BatchRun(self.machine, self._strings, self._as_function_var.get(), max_steps,
+                chunk_size=BATCH_SHARED_CHUNK_SIZE if share else 256, share_prefixes=share)
+        except ValueError:
+            self.info_manager.update_status('Enter max steps')
+            return
+        except Exception as e:
+            self.info_manager.update_status(str(e))
+            return
+        self._run_btn.config(text='Stop')
+        self._table.set_rows(self.batch.rows)
+        self.after(BATCH_REFRESH_MS, self._refresh)
+
+    def _refresh(self):
+        # show the results so far of the batch running
+        batch = self.batch
+        self._table.refresh()
+        self._progress_lbl.config(text='{} of {} inputs in {:.1f}s'.format(
+            len(batch.rows), len(batch.strings), batch.elapsed))
+        if not batch.done:
+            self.after(BATCH_REFRESH_MS, self._refresh)
+            return
+        self._run_btn.config(text='Run batch')
+        if batch.error is not None:
+            self.info_manager.update_status(batch.error)
+
+    def _select(self, row):
+        # test the string of a clicked row of results sequentially
+        self.testing_panel.test_sequentially(row[INPUT], self.batch.as_function)
+        self.master.select(self.testing_panel)
+
+class ResultsTable(Frame):
+    """This is a class to show rows of results in a table that can be sorted
+    by clicking the header of a column.
+
+    Only the rows in view are drawn, as text items on a canvas reused as the
+    table scrolls, so the number of rows does not matter.
+
+    Attributes:
+        rows (list): The rows shown, as tuples with a value per column. The
+            list can grow; refresh() shows the rows added.
+    """
+
+    def __init__(self, master, columns, formats, command):
+        """Initialize an empty table.
+
+        Parameters:
+            columns (list): The (title, width in pixels) of each column.
+            formats (list): The function turning a value of each column into text.
+            command (function): The function called with a row when it is clicked.
+        """
+        super().__init__(master=master)
+        self.rows = []
+        self._formats = formats
+        self._command = command
+        self.grid_columnconfigure(0, weight=1)
+        self._canvas = Canvas(self, height=TABLE_ROW_HEIGHT * (TABLE_ROWS + 1), bg='white',
+            highlightthickness=0)
+        self._canvas.grid(sticky='we',row=0,column=0)
+        self._ysb = Scrollbar(self, orient='vertical', command=self._scroll)
+        self._ysb.grid(sticky='ns',row=0,column=1)
+        # order the rows are shown in as indices of rows, None for their own
+        # order, and the column sorted by and whether in reverse
+        self._order = None
+        self._sort_column = None
+        self._sort_reverse = False
+        # index in the order of the first row in view
+        self._first = 0
+        # text items of the rows in view, and the texts shown in them
+        self._items = []
+        self._texts = []
+        x = 0
+        for column, (title, width) in enumerate(columns):
+            header = self._canvas.create_text(x + 4, TABLE_ROW_HEIGHT // 2, text=title, anchor='w',
+                font=('TkDefaultFont', 9, 'bold'))
+            self._canvas.tag_bind(header, '<Button-1>', lambda e, c=column: self._sort(c))
+            x += width
+        self._canvas.create_line(0, TABLE_ROW_HEIGHT, x, TABLE_ROW_HEIGHT)
+        for i in range(TABLE_ROWS):
+            y = TABLE_ROW_HEIGHT * (i + 1) + TABLE_ROW_HEIGHT // 2
+            x = 0
+            items = []
+            for _, width in columns:
+                items.append(self._canvas.create_text(x + 4, y, text='', anchor='w'))
+                x += width
+            self._items.append(items)
+            self._texts.append([''] * len(columns))
+        self._canvas.bind('<Button-1>', self._click)
+        self._canvas.bind('<MouseWheel>', lambda event: self._scroll('scroll', -1 if event.delta > 0 else 1, 'units'))
+        self._canvas.bind('<Button-4>', lambda event: self._scroll('scroll', -1, 'units'))
+        self._canvas.bind('<Button-5>', lambda event: self._scroll('scroll', 1, 'units'))
+
+    def set_rows(self, rows):
+        """Show the given list of rows, from the top and in their own order."""
+        self.rows = rows
+        self._order = None
+        self._sort_column = None
+        self._first = 0
+        self.refresh()
+
+    def refresh(self):
+        """Show the rows added since the last refresh, keeping the sort order."""
+        if self._order is not None and len(self._order) != len(self.rows):
+            self._order = self._sorted()
+        self._redraw()
+
+    def _sorted(self):
+        # return the indices of the rows in the order of the sorted column
+        column = self._sort_column
+        rows = self.rows
+        return sorted(range(len(rows)), key=lambda i: rows[i][column], reverse=self._sort_reverse)
+
+    def _sort(self, column):
+        # sort by the clicked column, in reverse if it was sorted by already
+        self._sort_reverse = self._sort_column == column and not self._sort_reverse
+        self._sort_column = column
+        self._order = self._sorted()
+        self._first = 0
+        self._redraw()
+
+    def _row(self, position):
+        # return the row at the given position in the order shown
+        return self.rows[position if self._order is None else self._order[position]]
+
+    def _redraw(self):
+        # update the texts in view that changed, and the scrollbar
+        count = len(self.rows) if self._order is None else len(self._order)
+        self._first = max(min(self._first, count - TABLE_ROWS), 0)
+        for offset, items in enumerate(self._items):
+            position = self._first + offset
+            row = self._row(position) if position < count else None
+            texts = self._texts[offset]
+            for column, item in enumerate(items):
+                text = '' if row is None else self._formats[column](row[column])
+                if text != texts[column]:
+                    self._canvas.itemconfig(item, text=text)
+                    texts[column] = text
+        if count <= TABLE_ROWS:
+            self._ysb.set(0, 1)
+        else:
+            self._ysb.set(self._first / count, (self._first + TABLE_ROWS) / count)
+
+    def _scroll(self, action, amount, unit=None):
+        # scroll the view as told by the scrollbar or the mouse wheel
+        if action == 'moveto':
+            count = len(self.rows) if self._order is None else len(self._order)
+            self._first = int(float(amount) * count)
+        elif unit == 'pages':
+            self._first += int(amount) * (TABLE_ROWS - 1)
+        else:
+            self._first += int(amount)
+        self._redraw()
+
+    def _click(self, event):
+        # call the command with the clicked row, if any
+        offset = int(self._canvas.canvasy(event.y)) // TABLE_ROW_HEIGHT - 1
+        count = len(self.rows) if self._order is None else len(self._order)
+        if 0 <= offset < TABLE_ROWS and self._first + offset < count:
+            self._command(self._row(self._first + offset))
+
+class SuitePanel(Frame):
+    """This is a class to represent the section where the user can attach
+    a regression test suite to the machine and see its results live.
+
+    Attributes:
+        machine (core.Machine): The machine of the user.
+        info_manager (InfoManager): The object that handles the info
+            section of the GUI.
+        suite (regression.RegressionSuite): The suite attached to the
+            machine, None if there is none.
+    """
+
+    def __init__(self, master, machine, info_manager):
+        """Initialize this suite panel with the user's machine and the info manager.
+
+        The suite panel provides an entry for the path of a suite file, buttons
+        to load the suite in it and save the suite to it, entries to add a test,
+        the counts of passed, failed and pending tests and a list of failed tests.
+
+        Parameters:
+            machine (core.Machine): The machine of the user.
+            info_manager (InfoManager): The object that handles the info
+                section of the GUI.
+        """
+        super().__init__(master=master)
+        self.grid_columnconfigure(1, weight=1)
+        self.pack(fill='x')
+        self.machine = machine
+        self.info_manager = info_manager
+        self.suite = None
+        # version of the suite last shown
+        self._shown_version = None
+        # first row
+        self._path_lbl = Label(self, text='Suite file')
+        self._path_lbl.grid(row=0,column=0)
+        self._path_entry = Entry(self)
+        self._path_entry.grid(sticky='we',row=0,column=1,columnspan=3)
+        self._load_btn = Button(self, text='Load', command=self._load)
+        self._load_btn.grid(row=0,column=4,padx=2)
+        self._save_btn = Button(self, text='Save', command=self._save)
+        self._save_btn.grid(row=0,column=5,padx=2)
+        # second row
+        self._input_lbl = Label(self, text='Input')
+        self._input_lbl.grid(row=1,column=0)
+        self._input_entry = Entry(self)
+        self._input_entry.grid(sticky='we',row=1,column=1)
+        self._expected_lbl = Label(self, text='Expected')
+        self._expected_lbl.grid(row=1,column=2)
+        self._expected_entry = Entry(self, width=12)
+        self._expected_entry.grid(row=1,column=3)
+        self._add_test_btn = Button(self, text='Add test', command=self._add_test)
+        self._add_test_btn.grid(row=1,column=4,columnspan=2,padx=2)
+        # counts and failed tests
+        self._counts_lbl = Label(self, text='No suite')
+        self._counts_lbl.grid(sticky='w',row=2,column=0,columnspan=6)
+        self._failures = Listbox(self, height=4)
+        self._failures.grid(sticky='we',row=3,column=0,columnspan=5,pady=2)
+        self._failures_bar = Scrollbar(self, orient='vertical', command=self._failures.yview)
+        self._failures_bar.grid(sticky='ns',row=3,column=5)
+        self._failures.config(yscrollcommand=self._failures_bar.set)
+
+    def _load(self):
+        # attach the suite in the file of the entry to the machine,
+        # replacing the current suite
+        try:
+            suite = RegressionSuite.load(self.machine, self._path_entry.get())
+        except (OSError, ValueError):
+            self.info_manager.update_status('Cannot load suite')
+            return
+        except Exception as e:
+            self.info_manager.update_status(str(e))
+            return
+        if self.suite is None:
+            self.after(SUITE_REFRESH_MS, self._refresh)
+        else:
+            self.suite.close()
+        self.suite = suite
+        self._shown_version = None
+        self.info_manager.update_status('Loaded {} tests'.format(len(suite.tests)))
+
+    def _save(self):
+        # save the suite to the file of the entry
+        if self.suite is None:
+            self.info_manager.update_status('No suite')
+            return
+        try:
+            self.suite.save(self._path_entry.get())
+            self.info_manager.update_status('Saved suite')
+        except OSError:
+            self.info_manager.update_status('Cannot save suite')
+
+    def _add_test(self):
+        # add a test of the entries to the suite, starting a suite if there
+        # is none; the expected entry is accept or reject, or else the
+        # output tape of a suite used as a function
+        expected = self._expected_entry.get()
+        if self.suite is None:
+            as_function = expected not in ('accept', 'reject')
+            self.suite = RegressionSuite(self.machine, as_function=as_function)
+            self.after(SUITE_REFRESH_MS, self._refresh)
+        if not self.suite.as_function:
+            if expected not in ('accept', 'reject'):
+                self.info_manager.update_status('Enter accept or reject')
+                return
+            expected = expected == 'accept'
+        self.suite.add_test(self._input_entry.get(), expected)
+        self._input_entry.delete(0, 'end')
+
+    def _refresh(self):
+        # show the counts and failed tests of the suite if they changed
+        self.after(SUITE_REFRESH_MS, self._refresh)
+        if self.suite.version == self._shown_version:
+            return
+        self._shown_version = self.suite.version
+        counts = self.suite.counts()
+        self._counts_lbl.config(text='{} passed, {} failed, {} pending'.format(
+            counts[PASSED], counts[FAILED], counts[PENDING]),
+            fg='red' if counts[FAILED] != 0 else ('black' if counts[PENDING] != 0 else 'green'))
+        self._failures.delete(0, 'end')
+        for test in self.suite.failures(SUITE_MAX_LISTED):
+            self._failures.insert('end', self._describe(test))
+
+    def _describe(self, test):
+        # return a line describing a failed test
+        if self.suite.as_function:
+            expected = repr(test.expected)
+            got = repr(test.result.output) if test.result is not None else 'no output'
+        else:
+            expected = 'accept' if test.expected else 'reject'
+            got = 'reject' if test.result is None or not test.result.accepted else 'accept'
+        if test.result is not None and not test.result.halted:
+            got = test.result.reason
+        return '{}: expected {}, got {}'.format(repr(test.string), expected, got)
+
+class TapeView(Frame):
+    """This is a class to show a tape of the machine, around its head.
+
+    The tape is drawn as a row of fixed-size cells on a canvas, with only the
+    cells in view drawn; each redraw updates only the cells whose symbol,
+    index or highlight changed, so the size of the tape does not matter. The
+    view follows the head unless the user scrolls it out of view, and
+    follows it again once the user scrolls back to it. The symbols of the
+    tracks of a multi-track tape are stacked in each cell.
+
+    Attributes:
+        tape (core.Tape): The tape shown, None if there is none.
+        index (int): The index of the head, None if it is not shown.
+        follow (bool): Whether or not the view follows the head.
+        tracks (core.TrackLayout): The tracks of the tape, None for a single
+            track.
+    """
+
+    def __init__(self, master):
+        """Initialize an empty tape view."""
+        super().__init__(master=master)
+        self.tape = None
+        self.index = None
+        self.follow = True
+        self.tracks = None
+        self._canvas = Canvas(self, height=TAPE_CELL_SIZE+16, bg='white', highlightthickness=0)
+        self._canvas.pack(fill='x')
+        self._xsb = Scrollbar(self, orient='horizontal', command=self._scroll)
+        self._xsb.pack(fill='x')
+        # index of the leftmost cell in view
+        self._first = 0
+        # cells in view, left to right, as [rectangle id, symbol id, index id,
+        # symbol, fill, index label] so that only changes are redrawn
+        self._cells = []
+        self._canvas.bind('<Configure>', self._resize)
+        self._canvas.bind('<ButtonPress-1>', self._drag_start)
+        self._canvas.bind('<B1-Motion>', self._drag_exec)
+        self._canvas.bind('<MouseWheel>', lambda event: self._scroll('scroll', -1 if event.delta > 0 else 1, 'units'))
+        self._canvas.bind('<Button-4>', lambda event: self._scroll('scroll', -1, 'units'))
+        self._canvas.bind('<Button-5>', lambda event: self._scroll('scroll', 1, 'units'))
+        self._drag_x = 0
+
+    def show(self, tape, index=None):
+        """Show the given core.Tape, with the head at the given index if any."""
+        self.tape = tape
+        self.index = index
+        count = len(self._cells)
+        if self.follow and index is not None and count != 0:
+            margin = count // 8
+            if index < self._first + margin or index >= self._first + count - margin:
+                self._first = index - count // 2
+        self._redraw()
+
+    def clear(self):
+        """Show no tape."""
+        self.follow = True
+        self.show(None)
+
+    def set_tracks(self, tracks):
+        """Show tapes with the given core.TrackLayout, None for a single track,
+        resizing the cells to stack the symbols of the tracks."""
+        self.tracks = tracks
+        height = self._cell_height()
+        self._canvas.config(height=height+16)
+        for offset, cell in enumerate(self._cells):
+            x = offset * TAPE_CELL_SIZE
+            self._canvas.coords(cell[0], x, 14, x + TAPE_CELL_SIZE, 14 + height)
+            self._canvas.coords(cell[1], x + TAPE_CELL_SIZE // 2, 14 + height // 2)
+            cell[3] = None
+        self._redraw()
+
+    def _cell_height(self):
+        # return the height of a cell, holding a symbol per track
+        return TAPE_CELL_SIZE * (1 if self.tracks is None else self.tracks.count)
+
+    def scroll_to(self, index):
+        """Center the view on the cell at the given index."""
+        self._first = index - len(self._cells) // 2
+        self._user_scrolled()
+
+    def _resize(self, event):
+        # create or delete cells so that they fill the canvas
+        count = event.width // TAPE_CELL_SIZE + 1
+        canvas = self._canvas
+        height = self._cell_height()
+        while len(self._cells) < count:
+            x = len(self._cells) * TAPE_CELL_SIZE
+            self._cells.append([
+                canvas.create_rectangle(x, 14, x + TAPE_CELL_SIZE, 14 + height, fill='white'),
+                canvas.create_text(x + TAPE_CELL_SIZE // 2, 14 + height // 2, text=''),
+                canvas.create_text(x + 2, 7, text='', anchor='w', font=('TkDefaultFont', 7)),
+                '', 'white', ''])
+        while len(self._cells) > count:
+            for item in self._cells.pop()[:3]:
+                canvas.delete(item)
+        self.show(self.tape, self.index)
+
+    def _redraw(self):
+        # update the cells in view whose contents changed, and the scrollbar
+        tape = self.tape
+        canvas = self._canvas
+        for offset, cell in enumerate(self._cells):
+            index = self._first + offset
+            if tape is None:
+                symbol, fill, label = '', 'white', ''
+            elif index < 0 and not tape.two_way:
+                symbol, fill, label = '', 'gray', ''
+            else:
+                symbol = tape[index]
+                if self.tracks is not None:
+                    symbol = '\n'.join(self.tracks.unpack(symbol))
+                fill = 'gold' if index == self.index else 'white'
+                label = str(index) if index % 5 == 0 else ''
+            if symbol != cell[3]:
+                canvas.itemconfig(cell[1], text=symbol)
+                cell[3] = symbol
+            if fill != cell[4]:
+                canvas.itemconfig(cell[0], fill=fill)
+                cell[4] = fill
+            if label != cell[5]:
+                canvas.itemconfig(cell[2], text=label)
+                cell[5] = label
+        self._xsb.set(*self._scroll_fractions())
+
+    def _scroll_range(self):
+        # return the indices (low, high) of the scrollable part of the tape;
+        # the used part of the tape and the cells in view
+        count = len(self._cells)
+        if self.tape is None:
+            return (self._first, self._first + count)
+        return (min(self.tape.start, self._first), max(self.tape.end, self._first + count))
+
+    def _scroll_fractions(self):
+        # return the fractions of the scrollable part of the tape where the
+        # view starts and ends
+        low, high = self._scroll_range()
+        # no cells are in view until the canvas is first laid out
+        if high == low:
+            return (0.0, 1.0)
+        return ((self._first - low) / (high - low), (self._first + len(self._cells) - low) / (high - low))
+
+    def _scroll(self, action, amount, unit=None):
+        # scroll the view as told by the scrollbar or the mouse wheel
+        if action == 'moveto':
+            low, high = self._scroll_range()
+            self._first = low + int(float(amount) * (high - low))
+        elif unit == 'pages':
+            self._first += int(amount) * max(len(self._cells) - 1, 1)
+        else:
+            self._first += int(amount)
+        self._user_scrolled()
+
+    def _drag_start(self, event):
+        # start dragging the tape with the mouse
+        self._drag_x = event.x
+
+    def _drag_exec(self, event):
+        # drag the tape by whole cells with the mouse
+        cells = (self._drag_x - event.x) // TAPE_CELL_SIZE
+        if cells != 0:
+            self._drag_x -= cells * TAPE_CELL_SIZE
+            self._first += cells
+            self._user_scrolled()
+
+    def _user_scrolled(self):
+        # redraw after the user scrolled, following the head only if it is in view
+        if self.index is not None:
+            self.follow = self._first <= self.index < self._first + len(self._cells)
+        self._redraw()
+
+class InfoManager(Frame):
+    """This is a class to manage the information panel in the GUI.
+
+    The information panel shows the main information of the machine, all the
+    transitions in the selected transition, if any, and the status bar.
+
+    Attributes:
+        machine (core.Machine): The machine of the user.
+    """
+
+    def __init__(self, master, machine):
+        """Initialize this manager with the given machine and update the info
+        that is shown to the user.
+
+        Parameters:
+            machine (core.Machine): The machine of the user.
+        """
+        super().__init__(master=master)
+        self.pack(side='right', fill='y')
+        self.machine = machine
+        self._info_frame = LabelFrame(self, text='Main Info', labelanchor='n')
+        self._info_frame.pack()
+        # number of states
+        self._info_label1 = Label(self._info_frame, text='# of states')
+        self._info_label1.grid(row=0,column=0)
+        self._info_var1 = StringVar(self._info_frame)
+        self._machine_info1 = Label(self._info_frame, textvariable=self._info_var1, width=3)
+        self._machine_info1.grid(row=0,column=1)
+        # init state
+        self._info_label2 = Label(self._info_frame, text='Initial state')
+        self._info_label2.grid(row=1,column=0)
+        self._info_var2 = StringVar(self._info_frame)
+        self._machine_info2 = Label(self._info_frame, textvariable=self._info_var2, width=3)
+        self._machine_info2.grid(row=1,column=1)
+        # nonfinal states
+        self._info_label3 = Label(self._info_frame, text='# of non-final states')
+        self._info_label3.grid(row=2,column=0)
+        self._info_var3 = StringVar(self._info_frame)
+        self._machine_info3 = Label(self._info_frame, textvariable=self._info_var3, width=3)
+        self._machine_info3.grid(row=2,column=1)
+        # final states
+        self._info_label4 = Label(self._info_frame, text='# of final states')
+        self._info_label4.grid(row=3,column=0)
+        self._info_var4 = StringVar(self._info_frame)
+        self._machine_info4 = Label(self._info_frame, textvariable=self._info_var4, width=3)
+        self._machine_info4.grid(row=3,column=1)
+        # number of transitions
+        self._info_label5 = Label(self._info_frame, text='# of transitions')
+        self._info_label5.grid(row=4,column=0)
+        self._info_var5 = StringVar(self._info_frame)
+        self._machine_info5 = Label(self._info_frame, textvariable=self._info_var5, width=3)
+        self._machine_info5.grid(row=4,column=1)
+        # transitions info
+        self._trans_frame = LabelFrame(self, text='Transitions Info', labelanchor='n')
+        self._trans_frame.pack(fill='both', expand=True)
+        self._trans_info1 = Label(self._trans_frame, anchor='n')
+        self._trans_info1.pack(side='top')
+        self._trans_info2 = Label(self._trans_frame, anchor='n')
+        self._trans_info2.pack(side='top')
+        # status bar
+        self._status_bar = Label(self)
+        self._status_bar.pack()
+        # update the info
+        self.update_info()
+
+    def update_info(self):
+        """Update the info that is shown to the user."""
+        info = self.machine.get_info()
+        self._info_var1.set(info['# of states'])
+        self._info_var2.set(info['Initial state'])
+        self._info_var3.set(info['# of non-final states'])
+        self._info_var4.set(info['# of final states'])
+        self._info_var5.set(info['# of transitions'])
+
+    def update_status(self, text):
+        """Update the status bar with the given text
+
+        Parameters:
+            text (str): The text to be displayed in the status bar.
+        """
+        self._status_bar.config(text=text)
+
+    def clear_status(self):
+        """Clear the status bar."""
+        self._status_bar.config(text='')
+
+    def show_transitions(self, from_state, to_state):
+        """Show the transitions pertaining to (from_state -> to_state).
+
+        Parameters:
+            from_state (int): The state number of the source of the transition.
+            to_state (int): The state number of the target of the transition.
+        """
+        info1 = None
+        info2 = None
+        if self.machine.get_transition_count(from_state, to_state) > 0:
+            info1 = '{} -> {}\n'.format(from_state, to_state)
+            info1 += '\n'.join(self.machine.get_transitions(from_state,to_state))
+        try:
+            if from_state != to_state and from_state in self.machine.transitions[to_state]:
+                info2 = '{} -> {}\n'.format(to_state,from_state)
+                info2 += '\n'.join(self.machine.get_transitions(to_state,from_state))
+        except KeyError: pass
+        if info2 is not None and info1 is None:
+            self._trans_info1.config(text=info2)
+            self._trans_info2.config(text='')
+        elif info2 is None and info1 is not None:
+            self._trans_info1.config(text=info1)
+            self._trans_info2.config(text='')
+        elif info1 is None and info2 is None:
+            self._trans_info1.config(text='')
+            self._trans_info2.config(text='')
+        else:
+            if from_state > to_state:
+                temp = info1
+                info1 = info2
+                info2 = temp
+            self._trans_info1.config(text=info1)
+            self._trans_info2.config(text=info2)
+
+    def hide_transitions(self):
+        """Clear the transition info shown to the user."""
+        self._trans_info1.config(text='')
+        self._trans_info2.config(text='')
+
+class Display(Canvas):
+    """This is a class that manages the display of the GUI.
+
+    The display of the GUI implements a canvas where the user can visually
+    see the states of the machine and the transitions between them. The user
+    is able to freely move around the states for a better view and select
+    transitions to view their information.
+
+    Attributes:
+        machine (core.Machine): The machine of the user.
+        info_manager (InfoManager): THe object that handles the info section
+            of the GUI.
+        journal (journal.Journal): The journal the positions of the states
+            are recorded to, None if there is none.
+    """
+
+    def __init__(self, master, machine):
+        """Initialize this display with the user's machine.
+
+        Parameters:
+            machine (core.Machine): The machine of the user.
+        """
+        super().__init__(master=master, bg='light gray')
+        self.machine = machine
+        self.info_manager = InfoManager(self, machine)
+        self.journal = None
+        self.pack(fill='both', expand=True)
+        # scrollbars for the canvas
+        self._xsb = Scrollbar(self, orient='horizontal', command=self.xview)
+        self._ysb = Scrollbar(self, orient='vertical', command=self.yview)
+        self.config(xscrollcommand=self._xsb.set, yscrollcommand=self._ysb.set, scrollregion=(0,0,1000,1000))
+        self._xsb.pack(side='bottom', fill='x')
+        self._ysb.pack(side='right', fill='y')
+        # bindings to allow a pannable canvas
+        self.bind('<ButtonPress-1>', self._pan_start)
+        self.bind('<B1-Motion>', self._pan_exec)
+        # boolean to indicate the user is moving a state instead of panning the canvas
+        self._moving_obj = False
+        # maps state_num to state_id
+        self._id_map = {}
+        # set of line_ids of lines between two states close to each other
+        self._mini_lines = set([])
+        # set of all loop transitions
+        self._loops = set([])
+        # id of init state
+        self._init_id = None
+        # config used by lines/transitions in the canvas
+        self._lines_config = {
+            'arrow': 'last',
+            'width': 2,
+            'activewidth': 4,
+            'activefill': 'gray40'
+        }
+        # id of highlighted state, for sequential tests
+        self._highlighted_state_id = None
+        # default color of states
+        self._default_state_fill = 'linen'
+        # color of a highlighted state
+        self._highlight_fill = 'gold'
+        # lines less than threshold are mini lines, connecting states center to center
+        self._line_thrshld = 35
+
+    def _pan_start(self, event):
+        # start the panning of the canvas if the user is not moving a state
+        if not self._moving_obj:
+            self.scan_mark(event.x, event.y)
+
+    def _pan_exec(self, event):
+        # execute the panning of the canvas is the user is not moving a state
+        if not self._moving_obj:
+            self.scan_dragto(event.x, event.y, gain=1)
+    
+    def _get_line_dist(self, x1, y1, x2, y2):
+        # return the distance between two points
+        return sqrt((x2-x1)**2 + (y2-y1)**2)
+
+    def _get_raw_linecoords(self, *coords):
+        # return the centers of the circles the coordinates pertain to;
+        # lines drawn on the canvas do not overlap the circles/states, so
+        # this function returns the coordinates as if they were center to center
+        head = (coords[2], coords[3])
+        tail = (coords[0], coords[1])
+        y = head[1] - tail[1]
+        y_sgn = -1 if y < 0 else 1
+        x = head[0] - tail[0]
+        x_sgn = -1 if x < 0 else 1
+        try:
+            theta = atan(abs(y)/abs(x))
+            # circle radius = 13
+            x_offset = x_sgn * 13 * cos(theta)
+            y_offset = y_sgn * 13 * sin(theta)
+        except ZeroDivisionError:
+            x_offset = 0
+            y_offset = y_sgn * 13
+        return (tail[0]-x_offset, tail[1]-y_offset, head[0]+x_offset, head[1]+y_offset)
+
+    def _get_mod_linecoords(self, *coords):
+        # return the modified line coordinates to draw on the canvas,
+        # pertaining to the two circles/states specified by the given coords
+        head = (coords[2], coords[3])
+        tail = (coords[0], coords[1])
+        dist = sqrt((head[0]-tail[0])**2 + (head[1]-tail[1])**2)
+        if dist <= self._line_thrshld: return coords
+        ratio = 13 / dist
+        x_offset = ratio * (head[0] - tail[0])
+        y_offset = ratio * (head[1] - tail[1])
+        return (tail[0]+x_offset, tail[1]+y_offset, head[0]-x_offset, head[1]-y_offset)
+
+    def _drag_line_head(self, line_id, event):
+        # drag the head of the line specified by the line_id
+        # to the coordinates of the event
+        line_coords = self.coords(line_id)
+        raw_linecoords = (line_coords[0],line_coords[1],self.canvasx(event.x),self.canvasy(event.y))
+        if line_id not in self._mini_lines: # states are separated enough
+            raw_linecoords = self._get_raw_linecoords(*line_coords)
+            new_coords = (raw_linecoords[0],raw_linecoords[1],self.canvasx(event.x),self.canvasy(event.y))
+            mod_linecoords = self._get_mod_linecoords(*new_coords)
+            if mod_linecoords == new_coords: # line became small enough
+                self._mini_lines.add(line_id)
+        elif self._get_line_dist(*raw_linecoords) >= self._line_thrshld: # new line is large enough
+            self._mini_lines.remove(line_id)
+            mod_linecoords = self._get_mod_linecoords(*raw_linecoords)
+        else: # keep drawing small line
+            mod_linecoords = raw_linecoords
+        self.coords(line_id, *mod_linecoords)
+
+    def _drag_loop(self, line_id, event):
+        # drag a loop specified by the line_id to the coordinates of the event
+        event_coords = (self.canvasx(event.x), self.canvasy(event.y))
+        coords = (
+            event_coords[0]-7,event_coords[1]-11,
+            event_coords[0]-22,event_coords[1]-36,
+            event_coords[0]+18,event_coords[1]-36,
+            event_coords[0]+3,event_coords[1]-11)
+        self.coords(line_id, *coords)
+
+    def _drag_line_tail(self, line_id, event):
+        # drag the tail of a line specified by the line_id
+        # to the coordinates of the event
+        if line_id in self._loops:
+            return self._drag_loop(line_id, event)
+        line_coords = self.coords(line_id)
+        raw_linecoords = (self.canvasx(event.x),self.canvasy(event.y),line_coords[2],line_coords[3])
+        if line_id not in self._mini_lines: # states are separated enough
+            raw_linecoords = self._get_raw_linecoords(*line_coords)
+            new_coords = (self.canvasx(event.x),self.canvasy(event.y),raw_linecoords[2],raw_linecoords[3])
+            mod_linecoords = self._get_mod_linecoords(*new_coords)
+            if mod_linecoords == new_coords: # line became small enough
+                self._mini_lines.add(line_id)
+        elif self._get_line_dist(*raw_linecoords) >= self._line_thrshld: # new line is large enough
+            self._mini_lines.remove(line_id)
+            mod_linecoords = self._get_mod_linecoords(*raw_linecoords)
+        else: # keep drawing small line
+            mod_linecoords = raw_linecoords
+        self.coords(line_id, *mod_linecoords)
+
+    def _drag(self, event, state_id):
+        # drag the state around the canvas
+        self._moving_obj = True
+        coords = (
+            self.canvasx(event.x)-12,
+            self.canvasy(event.y)-12,
+            self.canvasx(event.x)+13,
+            self.canvasy(event.y)+13)
+        self.coords(state_id, *coords)
+        self.coords(str(state_id)+'t', coords[0]+12, coords[1]+12)
+        self.coords(str(state_id)+'f', coords[0]-3, coords[1]-3, coords[2]+3, coords[3]+3)
+        self.coords(str(state_id)+'i', coords[0]-20, coords[1]-20, coords[0], coords[1])
+        try:
+            for line_id in self.find_withtag('-'+str(state_id)):
+                self._drag_line_head(line_id, event)
+        except KeyError: pass
+        try:
+            for line_id in self.find_withtag(str(state_id)+'-'):
+                self._drag_line_tail(line_id, event)
+        except KeyError: pass
+
+    def _drop(self, event, state_num):
+        # drop the state, recording where it was moved to in the journal
+        if self._moving_obj and self.journal is not None:
+            self.journal.record_position(state_num, *self.state_position(state_num))
+        self._moving_obj = False
+
+    def _update_status(self, state_num):
+        # update the status bar with the specified state number
+        if not self._moving_obj:
+            self.info_manager.update_status('State {}'.format(state_num))
+
+    def _clear_status(self):
+        # clear the status bar if not moving a state
+        if not self._moving_obj:
+            self.info_manager.clear_status()
+
+    def add_state(self, state_num, as_init, position=None):
+        """Add a state to the display.
+
+        Parameters:
+            state_num (int): The state number of the newly added state.
+            as_init (bool): Whether or not the newly added state is an initial state.
+            position (tuple): The (x, y) canvas coordinates to draw the state at,
+                or None for a random place in view. (default None)
+        """
+        if position is None:
+            x,y = self.canvasx(75+randrange(150)),self.canvasy(75+randrange(200))
+        else:
+            x,y = position
+        coords = (x, y, x+25, y+25)
+        state_id = self.create_oval(*coords, fill=self._default_state_fill)
+        tag = str(state_id) + 't'
+        self.create_text(coords[0]+13,coords[1]+13, text=str(state_num), tags=tag)
+        self._id_map[state_num] = state_id
+        self.tag_bind(state_id, '<B1-Motion>', lambda e: self._drag(e,state_id))
+        self.tag_bind(state_id, '<ButtonRelease-1>', lambda e: self._drop(e,state_num))
+        self.tag_bind(state_id, '<Enter>', lambda e: self._update_status(state_num))
+        self.tag_bind(state_id, '<Leave>', lambda e: self._clear_status())
+        self.tag_bind(tag, '<B1-Motion>', lambda e: self._drag(e,state_id))
+        self.tag_bind(tag, '<ButtonRelease-1>', lambda e: self._drop(e,state_num))
+        self.tag_bind(tag, '<Enter>', lambda e: self._update_status(state_num))
+        self.info_manager.update_status('Added State {}'.format(state_num))
+        if self.journal is not None:
+            self.journal.record_position(state_num, x, y)
+        if as_init:
+            # draw init arrow to show as init state
+            self.create_line(x-20,y-20,x,y,
+                arrow=self._lines_config['arrow'], tags=str(state_id)+'i', width=self._lines_config['width'])
+            self._init_id = state_id
+
+    def del_state(self, state_num, init_deleted):
+        """Delete a state from the display.
+
+        Parameters:
+            state_num (int): The number of the state to delete.
+            init_deleted (bool): Whether or not the state to delete is an initial state.
+        """
+        state_id = self._id_map[state_num]
+        core_tag = str(state_id)
+        self.delete(state_id)
+        for line_id in self.find_withtag(core_tag+'-'):
+            self._mini_lines.discard(line_id)
+            self._loops.discard(line_id)
+            self.delete(line_id)
+        for line_id in self.find_withtag('-'+core_tag):
+            self._mini_lines.discard(line_id)
+            self.delete(line_id)
+        self.delete(core_tag+'f')
+        self.delete(core_tag+'t')
+        if init_deleted:
+            self.delete(str(state_id)+'i')
+            if self.machine.init_state != 0:
+                self.set_init(self.machine.init_state)
+
+    def draw_machine(self, positions):
+        """Draw all the states and transitions of the machine on the empty display.
+
+        Parameters:
+            positions (dict): Mapping state numbers to the (x, y) canvas coordinates
+                to draw them at; states not in it are drawn at random places.
+        """
+        for state_num in sorted(self.machine.states):
+            self.add_state(state_num, state_num == self.machine.init_state, positions.get(state_num))
+            if self.machine.final_states[state_num]:
+                self.set_final(state_num)
+        for from_state in self.machine.transitions:
+            for to_state, transition_set in self.machine.transitions[from_state].items():
+                for transition in transition_set:
+                    self.add_transition(from_state, to_state, transition.cnf)
+        self.info_manager.update_info()
+        self.info_manager.clear_status()
+
+    def state_position(self, state_num):
+        """Return the (x, y) canvas coordinates the specified state is drawn at."""
+        x,y,_,_ = self.coords(self._id_map[state_num])
+        return (x, y)
+
+    def set_init(self, state_num):
+        """Set the specified state as initial.
+
+        The initial state has an arrow pointing to it with no source,
+        indicating the entry point of the machine.
+
+        Parameters:
+            state_num (int): The number of the state to set as initial.
+        """
+        self.delete(str(self._init_id)+'i')
+        state_id = self._id_map[state_num]
+        tag = str(state_id) + 'i'
+        x,y,_,_ = self.coords(state_id)
+        self.create_line(x-20,y-20,x,y,
+            arrow=self._lines_config['arrow'], tags=tag, width=self._lines_config['width'])
+        self._init_id = state_id
+
+    def set_final(self, state_num):
+        """Set the specified state as final.
+
+        A final state is enclosed in another circle. In other words, a final state
+        is indicated with another circle forming the outer edge of the original inner
+        circle.
+
+        Parameters:
+            state_num (int): The number of the state to set as final.
+        """
+        state_id = self._id_map[state_num]
+        tag = str(state_id) + 'f'
+        if len(self.find_withtag(tag)) == 0:
+            state_coords = self.coords(state_id)
+            coords = (state_coords[0]-3, state_coords[1]-3, state_coords[2]+3, state_coords[3]+3)
+            self.create_oval(*coords, tags=tag)
+
+    def set_nonfinal(self, state_num):
+        """Set the specified state as non-final.
+
+        Parameters:
+            state_num (int): The number of the state to set as non-final.
+        """
+        state_id = self._id_map[state_num]
+        tag = str(state_id) + 'f'
+        self.delete(tag)
+
+    def _add_loop(self, state_num):
+        # add a loop transition to the specified state
+        state_coords = self.coords(self._id_map[state_num])
+        coords = (
+            state_coords[0]+6,state_coords[1]+2,
+            state_coords[0]-9,state_coords[1]-23,
+            state_coords[0]+31,state_coords[1]-23,
+            state_coords[0]+16,state_coords[1]+2)
+        tag1 = str(self._id_map[state_num]) + '-'
+        tag2 = '{}-{}'.format(state_num,state_num)
+        line_id = self.create_line(*coords, smooth=True, tags=(tag1,tag2), **self._lines_config)
+        self.tag_bind(line_id, '<ButtonPress-1>', lambda e: self.info_manager.show_transitions(state_num,state_num))
+        self._loops.add(line_id)
+
+    def add_transition(self, from_state, to_state, cnf):
+        """Add a transition to the display.
+
+        Parameters:
+            from_state (int): The state number of the source of the transition.
+            to_state (int): The state number of the target of the transition.
+            cnf (str): The configuration of the transition.
+        """
+        # may not need cnf
+        find_result = self.find_withtag('{}-{}'.format(from_state,to_state))
+        if len(find_result) == 1:
+            line = find_result[0]
+            if self.itemcget(line, 'arrow') == 'first':
+                self.itemconfig(line, arrow='both')
+            return
+        elif len(self.find_withtag('{}-{}'.format(to_state,from_state))) == 1:
+            line_id = self.find_withtag('{}-{}'.format(to_state,from_state))[0]
+            self.itemconfig(line_id, arrow='both')
+            return
+        if from_state == to_state:
+            return self._add_loop(from_state)
+        f_coords = self.coords(self._id_map[from_state])
+        f_coords = (f_coords[0]+13, f_coords[1]+13)
+        t_coords = self.coords(self._id_map[to_state])
+        t_coords = (t_coords[0]+13, t_coords[1]+13)
+        coords = (f_coords[0], f_coords[1], t_coords[0], t_coords[1])
+        mini_line = self._get_line_dist(*coords) <= self._line_thrshld
+        line_coords = self._get_mod_linecoords(*coords) if not mini_line else coords
+        tag1 = str(self._id_map[from_state]) + '-'
+        tag2 = '-' + str(self._id_map[to_state])
+        tag3 = '{}-{}'.format(from_state,to_state)
+        line_id = self.create_line(line_coords, tags=(tag1,tag2,tag3), **self._lines_config)
+        if mini_line: self._mini_lines.add(line_id)
+        self.tag_bind(line_id, '<ButtonPress-1>', lambda e: self.info_manager.show_transitions(from_state,to_state))
+
+    def del_transition(self, from_state, to_state, cnf):
+        """Delete a transition to the display.
+
+        Parameters:
+            from_state (int): The state number of the source of the transition.
+            to_state (int): The state number of the target of the transition.
+            cnf (str): The configuration of the transition.
+        """
+        # may not need cnf
+        if self.machine.get_transition_count(from_state, to_state) != 0:
+            return
+        find_result1 = self.find_withtag('{}-{}'.format(from_state,to_state))
+        find_result2 = self.find_withtag('{}-{}'.format(to_state,from_state))
+        if len(find_result1) == 0 and len(find_result2) == 0: # transition does not exist
+            return
+        elif len(find_result1) == 1: # 'from_state-to_state' is tag
+            line_id = find_result1[0]
+            arrow_cnf = self.itemcget(line_id, 'arrow')
+            if arrow_cnf == 'both':
+                self.itemconfig(line_id, arrow='first')
+            elif arrow_cnf == 'first': # line exists, but transition does not exist
+                return
+            else:
+                self._mini_lines.discard(line_id)
+                self._loops.discard(line_id)
+                self.delete(line_id)
+        else: # 'to_state-from_state' is tag
+            line_id = find_result2[0]
+            arrow_cnf = self.itemcget(line_id, 'arrow')
+            if arrow_cnf == 'both':
+                self.itemconfig(line_id, arrow='last')
+            elif arrow_cnf == 'last': # line exists, but transition does not exist
+                return
+            else:
+                self._mini_lines.discard(line_id)
+                self._loops.discard(line_id)
+                self.delete(line_id)
+    
+    def highlight_state(self, state_num):
+        """Highlight the specified state in the display.
+
+        This is used during the sequential tests to indicate which state the
+        machine is currently in.
+
+        Parameters:
+            state_num (int): The state number to highlight.
+        """
+        if self._highlighted_state_id is not None:
+            self.itemconfig(self._highlighted_state_id, fill=self._default_state_fill)
+        state_id = self._id_map[state_num]
+        self.itemconfig(state_id, fill=self._highlight_fill)
+        self._highlighted_state_id = state_id
+
+    def clear_highlight(self):
+        """Clear the  highlighted state, if any."""
+        if self._highlighted_state_id is not None:
+            self.itemconfig(self._highlighted_state_id, fill=self._default_state_fill)
+            self._highlighted_state_id = None
+
+def main():
+    """Start the application with the machine recovered from the journal, or
+    an empty machine if there is none."""
+    # machine obj, as it was when the application last stopped
+    recovery_error = None
+    try:
+        machine, positions, generation = Journal.recover(JOURNAL_PATH)
+    except Exception as e:
+        # keep the files that could not be recovered, which a new journal replaces
+        machine, positions, generation = Machine(0), {}, 0
+        suffix = Journal.set_aside(JOURNAL_PATH)
+        recovery_error = 'Journal not recovered ({}), files kept as {}*{}'.format(e, JOURNAL_PATH, suffix)
+
+    # initialize window
+    root = Tk()
+    root.title('DTM Simulator')
+    root_width = root.winfo_reqwidth()
+    root_height = root.winfo_reqheight()
+    x_offset = int(root.winfo_screenwidth() / 3 - root_width / 3)
+    y_offset = int(root.winfo_screenheight() / 3 - root_height / 3)
+    root.geometry('500x500+{}+{}'.format(x_offset, y_offset))
+    root.minsize(480,440)
+
+    # intialize display and control of the GUI, journaling every edit from now on
+    display = Display(root, machine)
+    display.draw_machine(positions)
+    if recovery_error is not None:
+        display.info_manager.update_status(recovery_error)
+    display.journal = Journal(JOURNAL_PATH, machine, positions, generation)
+    control = Notebook(root)
+    control.pack(side='bottom', fill='x')
+
+    # initialize the panels of the control
+    states_panel = StatesPanel(control, machine, display.info_manager, display)
+    trans_panel = TransitionsPanel(control, machine, display.info_manager, display)
+    test_panel = TestingPanel(control, machine, display.info_manager, display)
+    batch_panel = BatchPanel(control, machine, display.info_manager, test_panel)
+    suite_panel = SuitePanel(control, machine, display.info_manager)
+
+    # set the panels as a notebook
+    control.add(states_panel, text='States')
+    control.add(trans_panel, text='Transitions')
+    control.add(test_panel, text='Testing')
+    control.add(batch_panel, text='Batch')
+    control.add(suite_panel, text='Suite')
+
+    root.mainloop()
+    display.journal.close()
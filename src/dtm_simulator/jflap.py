@@ -0,0 +1,188 @@
+"""
+Import and export of single-tape Turing machines in JFLAP's .jff format.
+
+The importer reads the file incrementally, dropping each state and
+transition once it is added to the machine, so memory does not grow with
+the size of the file. JFLAP's state ids become state numbers from 1 in the
+order the states are first mentioned, and their coordinates are kept for
+the display. JFLAP tapes are infinite in both directions and an empty
+read or write symbol is the blank, so imported machines use a two-way tape
+and the given blank symbol.
+
+What cannot be imported is reported rather than failing the import:
+transitions that stay in place or read or write several symbols are
+skipped, and a machine with several transitions from a state on the same
+symbol is made non-deterministic.
+
+Usage: python3 -m dtm_simulator.jflap machine.jff machine.json
+       python3 -m dtm_simulator.jflap machine.json machine.jff
+"""
+
+import argparse
+import xml.etree.ElementTree as ElementTree
+from xml.sax.saxutils import escape
+from .core import Machine, Transition, TWO_WAY, WRITE_SAME, load_machine, save_machine
+
+def import_jff(path, blank='#'):
+    """Return (machine, positions, warnings) read from the JFLAP file at path:
+    the machine, a dictionary mapping its state numbers to their (x, y)
+    coordinates in JFLAP, and a list of what could not be imported as is.
+
+    Parameters:
+        path (str): The path of the .jff file.
+        blank (str): The blank symbol of the machine, which empty read and
+            write symbols become. (default '#')
+    """
+    machine = Machine(0, blank, tape_model=TWO_WAY)
+    positions = {}
+    warnings = []
+    numbers = {}
+    def number(state_id):
+        # return the state number of a JFLAP state id, adding the state if new
+        if state_id not in numbers:
+            machine.add_state()
+            numbers[state_id] = machine.max_state_num
+        return numbers[state_id]
+    # open elements, outermost first, so that each state and transition of the
+    # machine, and not of a building block, is dropped from its parent once read
+    stack = []
+    try:
+        for event, elem in ElementTree.iterparse(path, events=('start', 'end')):
+            if event == 'start':
+                stack.append(elem)
+                continue
+            stack.pop()
+            tag = elem.tag
+            if len(stack) != 2 or stack[1].tag != 'automaton':
+                if tag == 'type' and elem.text is not None and elem.text.strip() != 'turing':
+                    raise Exception('Not a Turing machine')
+                if tag == 'tapes' and elem.text is not None and elem.text.strip() != '1':
+                    raise Exception('Multi-tape machine')
+                continue
+            if tag == 'state' or tag == 'block':
+                state_num = number(elem.get('id'))
+                x, y = elem.findtext('x'), elem.findtext('y')
+                if x is not None and y is not None:
+                    positions[state_num] = (float(x), float(y))
+                if elem.find('initial') is not None:
+                    machine.set_init_state(state_num)
+                if elem.find('final') is not None:
+                    machine.set_final_state(state_num)
+            elif tag == 'transition':
+                _import_transition(machine, elem, number, warnings)
+            stack[-1].remove(elem)
+    except ElementTree.ParseError as e:
+        raise Exception('Invalid JFLAP file: {}'.format(e))
+    return (machine, positions, warnings)
+
+def _import_transition(machine, elem, number, warnings):
+    # add the transition of a <transition> element to the machine, or tell
+    # why it cannot be in the warnings
+    from_state = number(elem.findtext('from'))
+    to_state = number(elem.findtext('to'))
+    read = elem.findtext('read') or machine.blank
+    write = elem.findtext('write') or machine.blank
+    move = (elem.findtext('move') or '').strip().upper()
+    description = '{} -> {} ({},{},{})'.format(from_state, to_state, read, write, move)
+    if move not in ('L', 'R'):
+        warnings.append('Skipped {}: cannot stay in place'.format(description))
+        return
+    if len(read) != 1 or len(write) != 1 or read.isspace() or write.isspace():
+        warnings.append('Skipped {}: symbols must be single characters'.format(description))
+        return
+    cnf = '({},{},{})'.format(read, write, move)
+    try:
+        machine.add_transition(from_state, to_state, cnf)
+    except Exception as e:
+        if str(e) == 'Invalid configuration':
+            warnings.append('Skipped {}: invalid symbols'.format(description))
+        elif str(e) == 'Duplicate transition' or (str(e) == 'Non-determinism'
+                and Transition(from_state, to_state, cnf) in machine.transitions[from_state].get(to_state, ())):
+            warnings.append('Skipped {}: duplicate'.format(description))
+        elif str(e) == 'Non-determinism':
+            machine.set_nondeterministic(True)
+            machine.add_transition(from_state, to_state, cnf)
+            warnings.append('Non-deterministic on {} from state {}'.format(read, from_state))
+        else:
+            raise
+
+def export_jff(machine, path, positions=None):
+    """Write the machine to the file at path in JFLAP's .jff format, and return
+    a list of what could not be exported as is.
+
+    JFLAP has no patterns, so a transition reading a set of symbols becomes a
+    transition per symbol, and one reading all but some symbols a transition
+    per other symbol the machine reads or writes.
+
+    Parameters:
+        machine (core.Machine): The machine to export.
+        path (str): The path of the .jff file to write.
+        positions (dict): Mapping state numbers to their (x, y) coordinates.
+            (default states placed in a grid)
+    """
+    if machine.tracks is not None:
+        raise Exception('Multi-track machine cannot be exported')
+    warnings = []
+    if machine.tape_model != TWO_WAY:
+        warnings.append('JFLAP tapes are infinite in both directions')
+    symbols = set([machine.blank])
+    for from_state in machine.transitions:
+        for transition_set in machine.transitions[from_state].values():
+            for t in transition_set:
+                symbols.update(t.symbols)
+                if t.write != WRITE_SAME:
+                    symbols.add(t.write)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n')
+        f.write('<structure>\n\t<type>turing</type>\n\t<automaton>\n')
+        for i, state_num in enumerate(sorted(machine.states)):
+            if positions is not None and state_num in positions:
+                x, y = positions[state_num]
+            else:
+                x, y = 100 + 100 * (i % 10), 100 + 100 * (i // 10)
+            f.write('\t\t<block id="{0}" name="q{0}">\n\t\t\t<tag>Machine{0}</tag>\n'.format(state_num))
+            f.write('\t\t\t<x>{}</x>\n\t\t\t<y>{}</y>\n'.format(float(x), float(y)))
+            if state_num == machine.init_state:
+                f.write('\t\t\t<initial/>\n')
+            if machine.final_states[state_num]:
+                f.write('\t\t\t<final/>\n')
+            f.write('\t\t</block>\n')
+        for from_state in sorted(machine.transitions):
+            for to_state, transition_set in sorted(machine.transitions[from_state].items()):
+                for t in sorted(transition_set, key=lambda t: t.cnf):
+                    if t.negated:
+                        warnings.append('Expanded {} -> {} {} over the symbols {}'.format(
+                            from_state, to_state, t.cnf, ''.join(sorted(symbols))))
+                    for symbol in sorted(s for s in symbols if t.matches(s)) if t.negated else sorted(t.symbols):
+                        f.write(_transition_element(machine, from_state, to_state, symbol,
+                            t.write_for(symbol), t.move.upper()))
+        f.write('\t</automaton>\n</structure>\n')
+    return warnings
+
+def _transition_element(machine, from_state, to_state, read, write, move):
+    # return the <transition> element of a transition, the blank being empty
+    def symbol_element(tag, symbol):
+        if symbol == machine.blank:
+            return '<{}/>'.format(tag)
+        return '<{0}>{1}</{0}>'.format(tag, escape(symbol))
+    return ('\t\t<transition>\n\t\t\t<from>{}</from>\n\t\t\t<to>{}</to>\n\t\t\t{}\n\t\t\t{}\n'
+        '\t\t\t<move>{}</move>\n\t\t</transition>\n').format(from_state, to_state,
+        symbol_element('read', read), symbol_element('write', write), move)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Convert a Turing machine between JFLAP .jff and JSON, by the file extensions.')
+    parser.add_argument('source', help='.jff or .json file to read')
+    parser.add_argument('target', help='.json or .jff file to write')
+    args = parser.parse_args()
+    if args.source.endswith('.jff'):
+        machine, _, warnings = import_jff(args.source)
+        save_machine(machine, args.target)
+    else:
+        warnings = export_jff(load_machine(args.source), args.target)
+    for warning in warnings:
+        print(warning)
+    return 0
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,288 @@
+"""
+Append-only journal of the edits of a machine, to recover it after a crash.
+
+Every change of the machine, and every move of a state on the display, is
+appended to the journal file as a compact JSON record on its own line:
+
+    ["s+"]                    add a state
+    ["s-", state]             delete a state
+    ["t+", from, to, cnf]     add a transition
+    ["t-", from, to, cnf]     delete a transition
+    ["i", state]              set the initial state
+    ["f", state]              set a state as final
+    ["n", state]              set a state as non-final
+    ["d", nondeterministic]   set whether the machine is non-deterministic
+    ["m", tape_model]         set the tape model
+    ["k", count, alphabet]    set the tracks of the tape
+    ["p", state, x, y]        move a state on the display
+
+Records are written as they come and synced to disk in batches, at most
+sync_interval seconds apart. Once the journal holds max_records records, it
+is compacted: a new journal is started and a snapshot of the machine and the
+positions of its states is written in the background, after which the old
+journal is deleted.
+
+The first line of a journal is ["g", generation], the generation of the
+snapshot its records apply to. Recovery loads the snapshot, then replays the
+old journal and the journal whose generation is not older than the
+snapshot's, so a crash at any point of a compaction loses no edit; a record
+cut short by the crash is ignored. Files that cannot be recovered are set
+aside with set_aside() rather than replaced by a new journal.
+"""
+
+import json
+import os
+import threading
+import time
+from .core import Machine
+
+class Journal():
+    """This is a class to journal the edits of a machine to a file.
+
+    Attributes:
+        path (str): The path of the journal file. The old journal and the
+            snapshot are kept next to it, ending with '.old' and '.snapshot'.
+        machine (core.Machine): The machine journaled.
+        positions (dict): Mapping each state number to its (x, y) position on
+            the display, for the states that have one.
+        sync_interval (float): The longest time, in seconds, a record waits to
+            be synced to disk.
+        max_records (int): The number of records that starts a compaction.
+    """
+
+    def __init__(self, path, machine, positions=None, generation=0, sync_interval=1.0, max_records=10000):
+        """Start journaling the edits of the machine, from a snapshot of it as it
+        is now; any journal already at path, which must have been recovered into
+        the machine (see recover()), is replaced.
+
+        Parameters:
+            path (str): The path of the journal file.
+            machine (core.Machine): The machine to journal.
+            positions (dict): Mapping each state number to its (x, y) position
+                on the display. (default no positions)
+            generation (int): The generation given by recover(). (default 0)
+            sync_interval (float): The longest time, in seconds, a record
+                waits to be synced to disk. (default 1.0)
+            max_records (int): The number of records that starts a compaction.
+                (default 10000)
+        """
+        self.path = path
+        self.machine = machine
+        self.positions = {} if positions is None else dict(positions)
+        self.sync_interval = sync_interval
+        self.max_records = max_records
+        self._generation = generation + 1
+        self._write_snapshot(self._generation, machine.to_dict(), self.positions)
+        for old_path in (path + '.old', path):
+            if os.path.exists(old_path):
+                os.remove(old_path)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._file = None
+        self._records = 0
+        self._unsynced = False
+        self._compaction = None
+        self._closed = False
+        self._start_file()
+        machine.add_listener(self._changed)
+        self._syncer = threading.Thread(target=self._sync_loop, daemon=True)
+        self._syncer.start()
+
+    @staticmethod
+    def recover(path):
+        """Return (machine, positions, generation) recovered from the journal at
+        path and its snapshot: a new empty machine, no positions and generation 0
+        if there is neither. Give them to Journal() to keep journaling."""
+        machine = Machine(0)
+        positions = {}
+        generation = 0
+        try:
+            with open(path + '.snapshot') as f:
+                snapshot = json.load(f)
+            machine = Machine.from_dict(snapshot['machine'])
+            positions = {state: (x, y) for state, x, y in snapshot['positions']}
+            generation = snapshot['generation']
+        except OSError:
+            pass
+        except (ValueError, KeyError, TypeError):
+            raise Exception('Invalid journal snapshot')
+        snapshot_generation = generation
+        for journal_path in (path + '.old', path):
+            try:
+                with open(journal_path) as f:
+                    records = _read_records(f)
+                    header = next(records, None)
+                    if header is None or header[0] != 'g' or header[1] < snapshot_generation:
+                        continue
+                    generation = max(generation, header[1])
+                    for record in records:
+                        _apply(machine, positions, record)
+            except OSError:
+                pass
+        return (machine, positions, generation)
+
+    @staticmethod
+    def set_aside(path):
+        """Rename the snapshot and journals at path that could not be recovered,
+        adding '.corrupt-' and the current time to their names so that a new
+        Journal at path does not replace them, and return the suffix added, None
+        if there were no files."""
+        suffix = time.strftime('.corrupt-%Y%m%d-%H%M%S')
+        moved = False
+        for old_path in (path + '.snapshot', path + '.old', path):
+            if os.path.exists(old_path):
+                os.replace(old_path, old_path + suffix)
+                moved = True
+        return suffix if moved else None
+
+    def record_position(self, state_num, x, y):
+        """Record that the given state was moved to (x, y) on the display."""
+        self.positions[state_num] = (x, y)
+        self._append(['p', state_num, x, y])
+
+    def close(self):
+        """Stop journaling, syncing the records not synced yet and waiting for
+        a compaction in progress."""
+        self.machine.remove_listener(self._changed)
+        with self._lock:
+            self._closed = True
+            self._sync()
+            self._file.close()
+            compaction = self._compaction
+        self._wake.set()
+        self._syncer.join()
+        if compaction is not None:
+            compaction.join()
+
+    def _changed(self, change, state_num, transition):
+        # listener of the machine; append the record of the change
+        machine = self.machine
+        if change == 'add_state':
+            record = ['s+']
+        elif change == 'del_state':
+            self.positions.pop(state_num, None)
+            record = ['s-', state_num]
+        elif change == 'add_transition':
+            record = ['t+', state_num, transition.to_state, transition.cnf]
+        elif change == 'del_transition':
+            record = ['t-', state_num, transition.to_state, transition.cnf]
+        elif change == 'set_init_state':
+            record = ['i', state_num]
+        elif change == 'set_final_state':
+            record = ['f', state_num]
+        elif change == 'set_nonfinal_state':
+            record = ['n', state_num]
+        elif change == 'set_nondeterministic':
+            record = ['d', machine.nondeterministic]
+        elif change == 'set_tracks':
+            tracks = machine.tracks
+            record = ['k', 1, ''] if tracks is None else ['k', tracks.count, tracks.alphabet]
+        else:
+            record = ['m', machine.tape_model]
+        self._append(record)
+
+    def _append(self, record):
+        # write a record, compacting the journal if it has grown too large
+        with self._lock:
+            if self._closed:
+                return
+            self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+            self._records += 1
+            self._unsynced = True
+            compact = self._records >= self.max_records and self._compaction is None
+        if compact:
+            self._compact()
+
+    def _start_file(self):
+        # start the journal file of the current generation
+        self._file = open(self.path, 'w')
+        self._file.write(json.dumps(['g', self._generation]) + '\n')
+        self._records = 0
+        self._sync()
+
+    def _sync(self):
+        # flush the journal file and sync it to disk
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = False
+
+    def _sync_loop(self):
+        # sync the records written at most sync_interval seconds apart
+        while True:
+            self._wake.wait(self.sync_interval)
+            with self._lock:
+                if self._closed:
+                    return
+                if self._unsynced:
+                    self._sync()
+
+    def _compact(self):
+        # start a journal of the next generation, and write the snapshot it
+        # applies to in the background; taking a core.MachineSnapshot costs
+        # little, and it is serialized on the background thread
+        with self._lock:
+            if self._closed or self._compaction is not None:
+                return
+            machine = self.machine.snapshot()
+            positions = dict(self.positions)
+            self._sync()
+            self._file.close()
+            os.replace(self.path, self.path + '.old')
+            self._generation += 1
+            self._start_file()
+            self._compaction = threading.Thread(target=self._finish_compaction,
+                args=(self._generation, machine, positions), daemon=True)
+            self._compaction.start()
+
+    def _finish_compaction(self, generation, machine, positions):
+        # write the snapshot of a compaction and delete the old journal
+        self._write_snapshot(generation, machine.to_dict(), positions)
+        os.remove(self.path + '.old')
+        with self._lock:
+            self._compaction = None
+
+    def _write_snapshot(self, generation, data, positions):
+        # write a snapshot of the given generation, replacing the last one at once
+        temp_path = self.path + '.snapshot.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'generation': generation, 'machine': data,
+                'positions': [[state, x, y] for state, (x, y) in positions.items()]}, f,
+                separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path + '.snapshot')
+
+def _read_records(f):
+    # yield the records of a journal file, stopping at one cut short
+    for line in f:
+        try:
+            yield json.loads(line)
+        except ValueError:
+            return
+
+def _apply(machine, positions, record):
+    # replay a record of a journal on the machine and positions
+    kind = record[0]
+    if kind == 's+':
+        machine.add_state()
+    elif kind == 's-':
+        machine.del_state(record[1])
+        positions.pop(record[1], None)
+    elif kind == 't+':
+        machine.add_transition(record[1], record[2], record[3])
+    elif kind == 't-':
+        machine.del_transition(record[1], record[2], record[3])
+    elif kind == 'i':
+        machine.set_init_state(record[1])
+    elif kind == 'f':
+        machine.set_final_state(record[1])
+    elif kind == 'n':
+        machine.set_nonfinal_state(record[1])
+    elif kind == 'd':
+        machine.set_nondeterministic(record[1])
+    elif kind == 'm':
+        machine.set_tape_model(record[1])
+    elif kind == 'k':
+        machine.set_tracks(record[1], record[2])
+    elif kind == 'p':
+        positions[record[1]] = (record[2], record[3])
@@ -0,0 +1,185 @@
+"""
+Breadth-first search over the configurations of a non-deterministic Turing
+machine.
+
+A configuration is the current state, the index of the head, the symbol
+under the head and the cells to either side of it, each kept as a stack
+growing away from the head. The stacks are hash-consed: a stack is a number
+identifying a (symbol, rest of stack) pair, and equal stacks always get the
+same number. Sibling branches therefore share every cell they have in common
+and configurations are hashed and compared in constant time.
+"""
+
+from collections import deque
+from .core import TWO_WAY
+
+class SearchResult():
+    """This is a class to represent the result of a configuration search.
+
+    Attributes:
+        accepted (bool): True if some branch accepted the string, False if
+            every branch rejected it, None if the search was stopped first.
+        reason (str): Why the search ended; 'accept', 'reject', 'budget'
+            if the step, frontier or configuration budget ran out or 'aborted'.
+        path (list): The transitions taken by the accepting branch, in order.
+            Empty unless accepted is True.
+        tape (str): The tape of the accepting branch, starting at the
+            leftmost cell in use. Empty unless accepted is True.
+        steps (int): The number of steps searched, which is the length of
+            the path if accepted is True.
+        configurations (int): The number of distinct configurations visited.
+    """
+
+    def __init__(self, accepted, reason, steps, configurations, path=None, tape=''):
+        """Initialize this result with the given values."""
+        self.accepted = accepted
+        self.reason = reason
+        self.steps = steps
+        self.configurations = configurations
+        self.path = path if path is not None else []
+        self.tape = tape
+
+    def path_states(self):
+        """Return the state numbers visited by the accepting branch, in order."""
+        if len(self.path) == 0:
+            return []
+        return [self.path[0].from_state] + [t.to_state for t in self.path]
+
+class _CellStacks():
+    # hash-consed stacks of tape cells; stack 0 is the empty stack, which
+    # stands for an endless run of blanks, so a blank is never pushed onto it
+
+    def __init__(self, blank):
+        self.blank = blank
+        self._ids = {}
+        self._symbols = [blank]
+        self._rests = [0]
+
+    def push(self, symbol, stack):
+        # return the stack with symbol on top of the given stack
+        if stack == 0 and symbol == self.blank:
+            return 0
+        key = (symbol, stack)
+        try:
+            return self._ids[key]
+        except KeyError:
+            new_stack = len(self._symbols)
+            self._symbols.append(symbol)
+            self._rests.append(stack)
+            self._ids[key] = new_stack
+            return new_stack
+
+    def pop(self, stack):
+        # return the symbol on top of the given stack and the rest of it
+        return self._symbols[stack], self._rests[stack]
+
+    def to_list(self, stack):
+        # return the symbols of the given stack, top first
+        symbols = []
+        while stack != 0:
+            symbols.append(self._symbols[stack])
+            stack = self._rests[stack]
+        return symbols
+
+def search(machine, string, max_steps=10000, max_frontier=100000, max_configurations=1000000):
+    """Search the configurations of the machine on the given string breadth-first.
+
+    The search ends as soon as a configuration in a final state is found, when
+    every branch has halted, or when the next level of the search would go
+    past max_steps steps or hold more than max_frontier configurations.
+    Configurations already visited are not searched again, so every one is
+    kept, with the cell it added to the stacks, until the search ends; the
+    search also ends once it has visited more than max_configurations, which
+    bounds its memory. Setting the machine's abort flag stops the search.
+
+    Parameters:
+        machine (core.Machine): The machine to search with. Must not be empty.
+        string (str): The string to compute.
+        max_steps (int): The number of steps to search at most. (default 10000)
+        max_frontier (int): The number of configurations a level of the search
+            can hold at most. (default 100000)
+        max_configurations (int): The number of configurations the search can
+            visit at most. (default 1000000)
+    """
+    blank = machine.blank
+    two_way = machine.tape_model == TWO_WAY
+    final_states = machine.final_states
+    # transitions of each state grouped by their read symbol, and those
+    # reading all but some symbols, which are checked on every step
+    by_read = {}
+    negated = {}
+    for from_state in machine.transitions:
+        reads = by_read[from_state] = {}
+        negated[from_state] = []
+        for transition_set in machine.transitions[from_state].values():
+            for transition in transition_set:
+                if transition.negated:
+                    negated[from_state].append(transition)
+                    continue
+                for symbol in transition.symbols:
+                    reads.setdefault(symbol, []).append(transition)
+    stacks = _CellStacks(blank)
+    right = 0
+    for symbol in reversed(string[1:]):
+        right = stacks.push(symbol, right)
+    start = (machine.init_state, 0, 0, string[0] if len(string) != 0 else blank, right)
+    # maps each visited configuration to its parent and the transition taken
+    parents = {start: None}
+    frontier = [start]
+    steps = 0
+    accepting = start if final_states[start[0]] else None
+    machine.abort = False
+    while accepting is None and len(frontier) != 0:
+        if machine.abort:
+            machine.abort = False
+            return SearchResult(None, 'aborted', steps, len(parents))
+        if steps == max_steps:
+            return SearchResult(None, 'budget', steps, len(parents))
+        next_frontier = []
+        for config in frontier:
+            state, index, left, symbol, right = config
+            transitions = by_read[state].get(symbol, [])
+            if len(negated[state]) != 0:
+                transitions = transitions + [t for t in negated[state] if t.matches(symbol)]
+            for transition in transitions:
+                write = transition.write_for(symbol)
+                if transition.move == 'r' or transition.move == 'R':
+                    next_symbol, next_right = stacks.pop(right)
+                    next_config = (transition.to_state, index+1,
+                        stacks.push(write, left), next_symbol, next_right)
+                elif index > 0 or two_way:
+                    next_symbol, next_left = stacks.pop(left)
+                    next_config = (transition.to_state, index-1,
+                        next_left, next_symbol, stacks.push(write, right))
+                else: # branch moved past the left end of the tape
+                    continue
+                if next_config in parents:
+                    continue
+                parents[next_config] = (config, transition)
+                if len(parents) > max_configurations:
+                    return SearchResult(None, 'budget', steps, len(parents))
+                if final_states[transition.to_state]:
+                    accepting = next_config
+                    break
+                next_frontier.append(next_config)
+            if accepting is not None:
+                break
+        steps += 1
+        if accepting is None and len(next_frontier) > max_frontier:
+            return SearchResult(None, 'budget', steps, len(parents))
+        frontier = next_frontier
+    if accepting is None:
+        return SearchResult(False, 'reject', steps, len(parents))
+    # walk back from the accepting configuration to recover its path
+    path = deque()
+    config = accepting
+    while parents[config] is not None:
+        config, transition = parents[config]
+        path.appendleft(transition)
+    _, index, left, symbol, right = accepting
+    left_cells = stacks.to_list(left)
+    left_cells.reverse()
+    if not two_way and len(left_cells) < index:
+        left_cells = [blank] * (index - len(left_cells)) + left_cells
+    tape = ''.join(left_cells) + symbol + ''.join(stacks.to_list(right))
+    return SearchResult(True, 'accept', len(path), len(parents), list(path), tape)
@@ -0,0 +1,245 @@
+"""
+Optimization of deterministic machines into smaller machines that compute
+the same way in fewer or as many steps.
+
+The pass works on the behaviour of each state: what it writes, where it
+moves and which state it goes to for each symbol the machine mentions, and
+for any other symbol. It
+
+- removes the states the initial state cannot reach
+- collapses bounces: a transition moving right into a state that moves left
+  on every symbol without writing, then continuing from the state reached,
+  becomes a single transition (also left then right on a two-way tape);
+  longer chains of moves cannot be collapsed, as a step moves one cell
+- merges equivalent states by partition refinement: states are split by
+  finality and what they write and where they move on each symbol, then
+  repeatedly by the blocks of the states they go to, until no block splits
+- renumbers the remaining states densely, in breadth-first order from the
+  initial state
+"""
+
+from collections import deque
+from .core import Machine, WRITE_SAME, TWO_WAY
+
+def optimize(machine, as_function=False):
+    """Return (optimized, mapping): an optimized copy of the deterministic
+    machine, and a dictionary mapping each state of the machine that was
+    kept to its number in the copy. Merged states map to the same number.
+
+    Parameters:
+        machine (core.Machine): The machine to optimize. Must be deterministic.
+        as_function (bool): Whether or not the copy must also compute the same
+            when used as a function. If False, the transitions of final states,
+            which are never used otherwise, are dropped. (default False)
+    """
+    if len(machine.states) == 0:
+        raise Exception('empty machine')
+    if machine.nondeterministic:
+        raise Exception('Non-deterministic machine cannot be optimized')
+    if machine.tracks is not None:
+        raise Exception('Multi-track machine cannot be optimized')
+    symbols = set([machine.blank])
+    for from_state in machine.transitions:
+        for transition_set in machine.transitions[from_state].values():
+            for transition in transition_set:
+                symbols.update(transition.symbols)
+    symbols = sorted(symbols)
+    final_states = machine.final_states
+    rules = {}
+    dispatch = machine._compile()
+    for state in machine.states:
+        if final_states[state] and not as_function:
+            rules[state] = ({}, None)
+            continue
+        reads = dispatch.get(state)
+        if reads is None:
+            rules[state] = ({}, None)
+            continue
+        explicit = {}
+        for symbol in symbols:
+            target = reads[symbol]
+            if target is not None:
+                explicit[symbol] = target
+        rules[state] = (explicit, reads.default)
+    # transitions of states whose rules are unchanged are kept as they are
+    changed = _collapse_bounces(rules, final_states, machine.tape_model == TWO_WAY, set(symbols))
+    reachable = _reachable(rules, machine.init_state)
+    blocks = _refine(rules, reachable, final_states, symbols)
+    # number the blocks breadth-first from the initial state
+    numbers = {blocks[machine.init_state]: 1}
+    representatives = [machine.init_state]
+    queue = deque([machine.init_state])
+    while len(queue) != 0:
+        explicit, default = rules[queue.popleft()]
+        targets = [target for _, _, target in explicit.values()]
+        if default is not None:
+            targets.append(default[2])
+        for target in targets:
+            if blocks[target] not in numbers:
+                numbers[blocks[target]] = len(numbers) + 1
+                representatives.append(target)
+                queue.append(target)
+    mapping = {state: numbers[blocks[state]] for state in reachable}
+    optimized = Machine(len(numbers), machine.blank, 1, machine.tape_model)
+    for state in representatives:
+        number = mapping[state]
+        if final_states[state]:
+            optimized.set_final_state(number)
+        if state in changed:
+            cnfs = _to_cnfs(rules[state], symbols, mapping)
+        elif final_states[state] and not as_function:
+            cnfs = []
+        else:
+            cnfs = [(mapping[t.to_state], t.cnf) for transition_set in machine.transitions[state].values()
+                for t in transition_set]
+        for to_state, cnf in cnfs:
+            optimized.add_transition(number, to_state, cnf)
+    return (optimized, mapping)
+
+def _lookup(rules, state, symbol, symbols):
+    # return (write, step, to_state) of the state on the symbol, with the
+    # symbol written back resolved, or None if it has no transition on it
+    explicit, default = rules[state]
+    if symbol in explicit:
+        return explicit[symbol]
+    if default is None or symbol in symbols:
+        return None
+    return (symbol if default[0] == WRITE_SAME else default[0], default[1], default[2])
+
+def _pure_move(rules, state, symbols):
+    # return (step, to_state) if the state moves the same way to the same
+    # state on every symbol without writing, otherwise None
+    explicit, default = rules[state]
+    if default is None or default[0] != WRITE_SAME or len(explicit) != len(symbols):
+        return None
+    for symbol, (write, step, to_state) in explicit.items():
+        if write != symbol or step != default[1] or to_state != default[2]:
+            return None
+    return (default[1], default[2])
+
+def _collapse_bounces(rules, final_states, two_way, symbols):
+    # collapse the bounces of every state in place, returning the set of
+    # states whose rules changed
+    pure = {}
+    for state in rules:
+        if not final_states[state]:
+            move = _pure_move(rules, state, symbols)
+            if move is not None:
+                pure[state] = move
+    changed = set([])
+    for state, (explicit, default) in rules.items():
+        new_explicit = {}
+        for symbol, target in explicit.items():
+            new_explicit[symbol] = _follow_bounces(rules, pure, final_states, two_way, symbols, target)
+        new_default = default
+        if default is not None:
+            new_default = _follow_bounces(rules, pure, final_states, two_way, symbols, default)
+        if new_explicit != explicit or new_default != default:
+            rules[state] = (new_explicit, new_default)
+            if _to_cnfs(rules[state], sorted(symbols), None) is None:
+                rules[state] = (explicit, default)
+            else:
+                changed.add(state)
+    return changed
+
+def _follow_bounces(rules, pure, final_states, two_way, symbols, target):
+    # return the target (write, step, to_state) of a transition after
+    # collapsing the bounces it leads into; a write of WRITE_SAME stands for
+    # the symbol read, not in symbols
+    seen = set([])
+    while True:
+        write, step, to_state = target
+        bounce = pure.get(to_state)
+        if bounce is None or bounce[0] != -step or (step == -1 and not two_way):
+            return target
+        back_state = bounce[1]
+        if final_states[back_state] or (to_state, back_state) in seen:
+            return target
+        seen.add((to_state, back_state))
+        if write == WRITE_SAME:
+            explicit, default = rules[back_state]
+            next_target = default
+        else:
+            next_target = _lookup(rules, back_state, write, symbols)
+        if next_target is None:
+            return target
+        target = next_target
+
+def _reachable(rules, init_state):
+    # return the set of states reachable from the initial state
+    reachable = set([init_state])
+    stack = [init_state]
+    while len(stack) != 0:
+        explicit, default = rules[stack.pop()]
+        targets = [target for _, _, target in explicit.values()]
+        if default is not None:
+            targets.append(default[2])
+        for target in targets:
+            if target not in reachable:
+                reachable.add(target)
+                stack.append(target)
+    return reachable
+
+def _refine(rules, states, final_states, symbols):
+    # return a dictionary mapping each of the states to the number of its
+    # block of equivalent states
+    def behaviour(target):
+        return None if target is None else (target[0], target[1])
+    keys = {}
+    for state in states:
+        explicit, default = rules[state]
+        keys[state] = (final_states[state], tuple(behaviour(explicit.get(symbol)) for symbol in symbols),
+            behaviour(default))
+    blocks = _number(keys)
+    while True:
+        for state in states:
+            explicit, default = rules[state]
+            keys[state] = (blocks[state],
+                tuple(blocks[explicit[symbol][2]] if symbol in explicit else None for symbol in symbols),
+                None if default is None else blocks[default[2]])
+        new_blocks = _number(keys)
+        if len(set(new_blocks.values())) == len(set(blocks.values())):
+            return new_blocks
+        blocks = new_blocks
+
+def _number(keys):
+    # return a dictionary mapping each state to the number of its key
+    numbers = {}
+    return {state: numbers.setdefault(key, len(numbers)) for state, key in keys.items()}
+
+def _to_cnfs(rule, symbols, mapping):
+    # return the transitions of a state with the given rule as (to_state,
+    # cnf), to_state being mapped by mapping if given; symbols that behave
+    # alike are read with one pattern, and the default reads all symbols
+    # behaving differently from it. None if a pattern would need ']'
+    explicit, default = rule
+    def cnf(read, write, step, to_state):
+        return (to_state if mapping is None else mapping[to_state],
+            '({},{},{})'.format(read, write, 'R' if step == 1 else 'L'))
+    def group_key(symbol, target):
+        # writing back the symbol read is shared by symbols writing themselves
+        write, step, to_state = target
+        return (WRITE_SAME if write == symbol else write, step, to_state)
+    cnfs = []
+    groups = {}
+    excluded = []
+    for symbol in symbols:
+        target = explicit.get(symbol)
+        if default is not None and target is not None and group_key(symbol, target) == default:
+            continue
+        excluded.append(symbol)
+        if target is not None:
+            groups.setdefault(group_key(symbol, target), []).append(symbol)
+    for (write, step, to_state), group in groups.items():
+        if len(group) == 1:
+            write = group[0] if write == WRITE_SAME else write
+            cnfs.append(cnf(group[0], write, step, to_state))
+        elif ']' in group:
+            return None
+        else:
+            cnfs.append(cnf('[{}]'.format(''.join(group)), write, step, to_state))
+    if default is not None:
+        if ']' in excluded:
+            return None
+        cnfs.append(cnf('[^{}]'.format(''.join(excluded)), *default))
+    return cnfs
@@ -0,0 +1,58 @@
+"""
+Helpers to run work on machines in a pool of worker processes.
+
+Each worker process builds its machines once, from the dictionaries given by
+Machine.to_dict(), and keeps them for every chunk of work it is given.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from .core import Machine
+
+# machines of a worker process, set by init_worker()
+machines = None
+
+def init_worker(*machine_dicts):
+    """Build the machines of a worker process from their dictionaries."""
+    global machines
+    machines = [Machine.from_dict(data) for data in machine_dicts]
+
+def run_with_machines(function, *args):
+    """Return function(*machines, *args) using the machines of this worker
+    process. The function must be defined at the top level of a module."""
+    return function(*machines, *args)
+
+def imap_chunks(function, chunks, workers, machine_dicts=(), prefetch=4):
+    """Yield function(*machines, *chunk) for each chunk, in order, computed on
+    a pool of worker processes holding the given machines.
+
+    At most workers * prefetch chunks are queued at a time, so chunks can be
+    produced lazily and memory does not grow with their number. Closing the
+    generator early cancels the chunks still queued.
+
+    Parameters:
+        function (function): The function to call, defined at the top level
+            of a module.
+        chunks (iterable): The arguments of each call after the machines,
+            as tuples.
+        workers (int): The number of worker processes.
+        machine_dicts (tuple): The dictionaries of the machines to pass to
+            each call. (default no machines)
+        prefetch (int): The number of chunks to queue per worker. (default 4)
+    """
+    pool = ProcessPoolExecutor(workers, initializer=init_worker, initargs=tuple(machine_dicts))
+    try:
+        chunks = iter(chunks)
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(run_with_machines, function, *chunk))
+            if len(pending) == workers * prefetch:
+                break
+        while len(pending) != 0:
+            result = pending.popleft().result()
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append(pool.submit(run_with_machines, function, *chunk))
+            yield result
+    finally:
+        pool.shutdown(cancel_futures=True)
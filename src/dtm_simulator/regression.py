@@ -0,0 +1,294 @@
+"""
+Regression test suites attached to a machine, rerun in the background as the
+machine is edited.
+
+Each test remembers the (state, read symbol) lookups its last run made,
+including the one that found no transition, and the states it was in. An
+edit of the machine only reruns the tests it can change:
+
+- adding or deleting a transition of a state reruns the tests that looked up
+  a symbol the transition reads in that state
+- deleting a state, or changing whether it is final, reruns the tests that
+  were in it (a final flag only matters to tests of acceptance)
+- changing the initial state, the tape model or the determinism of the
+  machine reruns every test
+
+A suite file is JSON: {"as_function": false, "max_steps": 10000,
+"tests": [[input, expected], ...]}, expected being true or false for
+acceptance or, as a function, the output tape without its blanks.
+"""
+
+import json
+import threading
+from .core import NO_TRANSITION
+
+# statuses of a test
+PENDING = 'pending'
+PASSED = 'passed'
+FAILED = 'failed'
+
+# number of tests the worker runs on a snapshot before taking the next one
+BATCH_SIZE = 256
+
+class RegressionTest():
+    """This is a class to represent a test of a regression suite.
+
+    Attributes:
+        string (str): The input of the test.
+        expected (bool or str): Whether the input must be accepted or, as a
+            function, the output tape it must leave.
+        status (str): PENDING until the test has run on the current machine,
+            then PASSED or FAILED.
+        result (core.RunResult): The result of the last run, None if the test
+            has not run or the machine is non-deterministic.
+        reads (set): (state, read symbol) of every transition looked up by the
+            last run, None if it is unknown.
+        states (set): The states the last run was in.
+    """
+
+    def __init__(self, string, expected):
+        """Initialize this test, not yet run.
+
+        Parameters:
+            string (str): The input of the test.
+            expected (bool or str): Whether the input must be accepted or, as a
+                function, the output tape it must leave.
+        """
+        self.string = string
+        self.expected = expected
+        self.status = PENDING
+        self.result = None
+        self.reads = None
+        self.states = set([])
+
+    def affected_by(self, change, state_num, transition, as_function):
+        """Return True if the given change of the machine (see
+        core.Machine.add_listener()) can change the last run of this test."""
+        if self.reads is None:
+            return True
+        if change == 'add_state':
+            return False
+        if change == 'add_transition' or change == 'del_transition':
+            return any(state == state_num and transition.matches(symbol) for state, symbol in self.reads)
+        if change == 'set_final_state' or change == 'set_nonfinal_state':
+            return not as_function and state_num in self.states
+        if change == 'del_state':
+            return state_num in self.states
+        return True
+
+class RegressionSuite():
+    """This is a class to represent a regression test suite attached to a machine.
+
+    The suite listens to the changes of the machine and reruns the tests they can
+    affect on a worker thread, on a snapshot of the machine taken after the change.
+    The machine should only be changed from one thread.
+
+    Attributes:
+        machine (core.Machine): The machine the suite is attached to.
+        tests (list): The RegressionTest objects of the suite.
+        as_function (bool): Whether or not the tests use the machine as a function.
+        max_steps (int): The number of steps a run is limited to; a run reaching
+            it fails.
+        version (int): Incremented every time a test changes status, so a
+            display can tell when to refresh.
+    """
+
+    def __init__(self, machine, tests=(), as_function=False, max_steps=10000):
+        """Attach a suite of the given tests to the machine and start running them.
+
+        Parameters:
+            machine (core.Machine): The machine to attach the suite to.
+            tests (iterable): The (input, expected) pairs of the tests. (default ())
+            as_function (bool): Whether or not the tests use the machine as a
+                function. (default False)
+            max_steps (int): The number of steps a run is limited to. (default 10000)
+        """
+        self.machine = machine
+        self.tests = [RegressionTest(string, expected) for string, expected in tests]
+        self.as_function = as_function
+        self.max_steps = max_steps
+        self.version = 0
+        self._condition = threading.Condition()
+        self._dirty = set(range(len(self.tests)))
+        # state -> read symbol -> indices of the tests whose last run looked it up,
+        # state -> indices of the tests whose last run was in it, and the indices
+        # of the tests whose lookups are unknown
+        self._readers = {}
+        self._visitors = {}
+        self._unindexed = set([])
+        # snapshot of the machine to run tests on and the number of changes it
+        # includes, along with the changes made while the worker is running
+        self._snapshot = machine.snapshot()
+        self._generation = 0
+        self._changes = []
+        self._running = False
+        self._closed = False
+        machine.add_listener(self._changed)
+        self._worker = threading.Thread(target=self._work, daemon=True)
+        self._worker.start()
+
+    @classmethod
+    def load(cls, machine, path):
+        """Attach the suite saved in the given file (see save()) to the machine."""
+        with open(path) as f:
+            data = json.load(f)
+        try:
+            return cls(machine, [(string, expected) for string, expected in data['tests']],
+                data.get('as_function', False), data.get('max_steps', 10000))
+        except (KeyError, TypeError, ValueError):
+            raise Exception('Invalid suite file')
+
+    def save(self, path):
+        """Save the tests of the suite to the given file as JSON."""
+        with open(path, 'w') as f:
+            json.dump({'as_function': self.as_function, 'max_steps': self.max_steps,
+                'tests': [[test.string, test.expected] for test in self.tests]}, f)
+
+    def add_test(self, string, expected):
+        """Add a test to the suite, to be run in the background."""
+        with self._condition:
+            self.tests.append(RegressionTest(string, expected))
+            self._mark([len(self.tests) - 1])
+
+    def counts(self):
+        """Return a dictionary mapping PENDING, PASSED and FAILED to the number of
+        tests with that status."""
+        counts = {PENDING: 0, PASSED: 0, FAILED: 0}
+        with self._condition:
+            for test in self.tests:
+                counts[test.status] += 1
+        return counts
+
+    def failures(self, limit=None):
+        """Return the tests that failed, at most limit of them if given."""
+        failures = []
+        with self._condition:
+            for test in self.tests:
+                if test.status == FAILED:
+                    failures.append(test)
+                    if limit is not None and len(failures) == limit:
+                        break
+        return failures
+
+    def wait(self, timeout=None):
+        """Wait until every test has run on the current machine, at most timeout
+        seconds if given. Returns True if they have, False otherwise."""
+        with self._condition:
+            return self._condition.wait_for(lambda: len(self._dirty) == 0 and not self._running, timeout)
+
+    def close(self):
+        """Detach the suite from its machine and stop its worker."""
+        self.machine.remove_listener(self._changed)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._worker.join()
+
+    def _changed(self, change, state_num, transition):
+        # listener of the machine; mark the tests the change can affect and
+        # take a snapshot of the machine for the worker to run them on
+        with self._condition:
+            if change == 'add_state':
+                return
+            if change in ('add_transition', 'del_transition'):
+                affected = set(self._unindexed)
+                for symbol, indices in self._readers.get(state_num, {}).items():
+                    if transition.matches(symbol):
+                        affected.update(indices)
+            elif change in ('set_final_state', 'set_nonfinal_state', 'del_state'):
+                affected = set(self._unindexed)
+                if change == 'del_state' or not self.as_function:
+                    affected.update(self._visitors.get(state_num, ()))
+            else:
+                affected = range(len(self.tests))
+            self._mark(affected)
+            self._generation += 1
+            if self._running:
+                self._changes.append((self._generation, change, state_num, transition))
+            if self._running or len(self._dirty) != 0:
+                self._snapshot = self.machine.snapshot()
+
+    def _mark(self, indices):
+        # mark the tests with the given indices to be rerun
+        for i in indices:
+            if self.tests[i].status != PENDING:
+                self.tests[i].status = PENDING
+                self.version += 1
+            self._dirty.add(i)
+        self._condition.notify_all()
+
+    def _work(self):
+        # run the marked tests on the latest snapshot of the machine, in batches
+        while True:
+            with self._condition:
+                self._running = False
+                self._changes = []
+                self._condition.notify_all()
+                while len(self._dirty) == 0 and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                self._running = True
+                snapshot = self._snapshot
+                generation = self._generation
+                batch = [self._dirty.pop() for _ in range(min(BATCH_SIZE, len(self._dirty)))]
+            for i in batch:
+                test = self.tests[i]
+                record = self._run(snapshot, test)
+                with self._condition:
+                    if self._closed:
+                        return
+                    self._record(i, *record)
+                    if any(g > generation and test.affected_by(change, state_num, transition, self.as_function)
+                            for g, change, state_num, transition in self._changes):
+                        self._mark([i])
+
+    def _run(self, snapshot, test):
+        # return (status, result, reads, states) of a run of the test on the
+        # snapshot, reads being None if they are unknown
+        if len(snapshot.states) == 0:
+            return (FAILED, None, None, set([]))
+        if snapshot.nondeterministic:
+            if self.as_function:
+                return (FAILED, None, None, set([]))
+            accepted = snapshot.search(test.string, self.max_steps).accepted
+            return (PASSED if accepted is test.expected else FAILED, None, None, set([]))
+        reads = set([])
+        result = snapshot.run(test.string, self.as_function, self.max_steps, coverage=reads)
+        if result.reason == NO_TRANSITION:
+            reads.add((result.state, result.tape[result.index]))
+        states = set(state for state, _ in reads)
+        states.add(snapshot.init_state)
+        states.add(result.state)
+        if not result.halted:
+            passed = False
+        elif self.as_function:
+            passed = result.output == test.expected
+        else:
+            passed = result.accepted == test.expected
+        return (PASSED if passed else FAILED, result, reads, states)
+
+    def _record(self, i, status, result, reads, states):
+        # store the outcome of a run of the test with the given index,
+        # replacing the lookups of its last run in the indices
+        test = self.tests[i]
+        if test.reads is None:
+            self._unindexed.discard(i)
+        else:
+            for state, symbol in test.reads:
+                self._readers[state][symbol].discard(i)
+        for state in test.states:
+            self._visitors[state].discard(i)
+        test.result = result
+        test.reads = reads
+        test.states = states
+        if reads is None:
+            self._unindexed.add(i)
+        else:
+            for state, symbol in reads:
+                self._readers.setdefault(state, {}).setdefault(symbol, set([])).add(i)
+        for state in states:
+            self._visitors.setdefault(state, set([])).add(i)
+        if i not in self._dirty and test.status != status:
+            test.status = status
+            self.version += 1
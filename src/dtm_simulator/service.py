@@ -0,0 +1,414 @@
+"""
+A local simulation service, so that scripts can run machines on batches of
+inputs without each building its own machine and process pool.
+
+The service speaks JSON over HTTP on the local host:
+
+    POST   /jobs                 submit a job; the body holds "machine" (as
+                                 given by Machine.to_dict()) or "machine_hash"
+                                 of a machine submitted before, "inputs",
+                                 and optionally "as_function", "max_steps"
+                                 and "detect_loops"
+    GET    /jobs/<id>?since=N    status of a job and its results from the
+                                 Nth on; add &wait=S to wait up to S seconds
+                                 for new results
+    GET    /jobs/<id>/stream     results as newline-delimited JSON, streamed
+                                 as they complete
+    DELETE /jobs/<id>            cancel a job, or forget a finished one
+    GET    /machines/<hash>      whether a machine is cached by the service
+
+Jobs are queued and their inputs run in chunks on a pool of worker processes.
+Machines are cached by hash both in the service and in each worker, so a
+machine submitted again is neither parsed nor built again. A job keeps its
+machine, so it runs even if the machine is dropped from the cache while the
+job is queued.
+
+Usage: python3 -m dtm_simulator.service --port 8765
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from .core import Machine
+
+# machines built by a worker process, by hash, least recently used first
+_worker_machines = OrderedDict()
+
+def _run_chunk(digest, machine_text, inputs, as_function, max_steps, detect_loops, cache_size):
+    # run the inputs on the machine in a worker process, building the
+    # machine only if this worker has not built it before
+    try:
+        machine = _worker_machines.pop(digest)
+    except KeyError:
+        machine = Machine.from_dict(json.loads(machine_text))
+    _worker_machines[digest] = machine
+    while len(_worker_machines) > cache_size:
+        _worker_machines.popitem(last=False)
+    results = []
+    for string in inputs:
+        if machine.nondeterministic:
+            result = machine.search(string, max_steps)
+            results.append({'input': string, 'accepted': result.accepted, 'reason': result.reason,
+                'steps': result.steps, 'output': result.tape.strip(machine.blank)})
+        else:
+            result = machine.run(string, as_function, max_steps, detect_loops=detect_loops)
+            results.append(dict(result.stats(), input=string, output=result.output))
+    return results
+
+class Job():
+    """This is a class to represent a batch of inputs to run on a machine.
+
+    Attributes:
+        id (str): The identifier of the job.
+        digest (str): The hash of the machine of the job.
+        inputs (list): The inputs to run.
+        as_function (bool): Whether or not the machine is used as a function.
+        max_steps (int): The number of steps each run can take at most.
+        detect_loops (bool): Whether or not to stop runs found to loop.
+        status (str): 'queued', 'running', 'done' or 'cancelled'.
+        results (list): The results of the inputs completed so far, in the
+            order of the inputs.
+    """
+
+    def __init__(self, job_id, digest, inputs, as_function, max_steps, detect_loops=False,
+            machine_text=None):
+        """Initialize a queued job with the given values, and the JSON text of
+        its machine as cached by the service."""
+        self.id = job_id
+        self.digest = digest
+        self._machine_text = machine_text
+        self.inputs = inputs
+        self.as_function = as_function
+        self.max_steps = max_steps
+        self.detect_loops = detect_loops
+        self.status = 'queued'
+        self.results = []
+        self._futures = []
+        # results of chunks that completed ahead of earlier chunks, by start
+        self._waiting_chunks = {}
+        self._changed = threading.Condition()
+
+    @property
+    def finished(self):
+        """True if the job is done or cancelled."""
+        return self.status == 'done' or self.status == 'cancelled'
+
+    def _add_chunk(self, start, results):
+        # add the results of the chunk starting at the given input,
+        # appending every chunk that is now next in order
+        with self._changed:
+            if self.finished:
+                return
+            self._waiting_chunks[start] = results
+            while len(self.results) in self._waiting_chunks:
+                self.results.extend(self._waiting_chunks.pop(len(self.results)))
+            if len(self.results) == len(self.inputs):
+                self.status = 'done'
+            self._changed.notify_all()
+
+    def cancel(self):
+        """Cancel the job, keeping the results completed so far."""
+        with self._changed:
+            if self.finished:
+                return
+            self.status = 'cancelled'
+            for future in self._futures:
+                future.cancel()
+            self._changed.notify_all()
+
+    def wait(self, since, timeout=None):
+        """Wait until there are more than since results or the job is finished,
+        for at most timeout seconds."""
+        with self._changed:
+            self._changed.wait_for(lambda: len(self.results) > since or self.finished, timeout)
+
+    def to_dict(self, since=0):
+        """Return the status of the job with its results from the given one on."""
+        with self._changed:
+            return {
+                'id': self.id,
+                'machine_hash': self.digest,
+                'status': self.status,
+                'total': len(self.inputs),
+                'completed': len(self.results),
+                'since': since,
+                'results': self.results[since:]
+            }
+
+class SimulationService():
+    """This is a class to queue jobs and run them on a pool of worker processes.
+
+    Attributes:
+        jobs (dict): The jobs known to the service, by id.
+    """
+
+    def __init__(self, workers=None, chunk_size=256, max_steps=1000000, cache_size=64, max_jobs=1000):
+        """Initialize this service and start its worker processes.
+
+        Parameters:
+            workers (int): The number of worker processes.
+                (default None for the number of CPUs)
+            chunk_size (int): The number of inputs given to a worker at a time.
+                (default 256)
+            max_steps (int): The step limit of a run, also used when a job
+                gives none or a larger one. (default 1000000)
+            cache_size (int): The number of machines cached. (default 64)
+            max_jobs (int): The number of jobs kept; the oldest finished jobs
+                are forgotten beyond it. (default 1000)
+        """
+        workers = workers or os.cpu_count() or 1
+        self.jobs = OrderedDict()
+        self._chunk_size = chunk_size
+        self._max_steps = max_steps
+        self._cache_size = cache_size
+        self._max_jobs = max_jobs
+        self._machines = OrderedDict()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._queue = queue.Queue()
+        self._pool = ProcessPoolExecutor(workers)
+        # limits the chunks handed to the pool so that later jobs are not stuck
+        # behind every chunk of a large job queued before them
+        self._slots = threading.BoundedSemaphore(workers * 2)
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    def _cache_machine(self, data):
+        # validate the machine and cache its JSON text, returning its hash and
+        # the text
+        text = json.dumps(data, sort_keys=True, separators=(',', ':'))
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        with self._lock:
+            if digest in self._machines:
+                self._machines.move_to_end(digest)
+                return (digest, self._machines[digest])
+        Machine.from_dict(data)
+        with self._lock:
+            self._machines[digest] = text
+            while len(self._machines) > self._cache_size:
+                self._machines.popitem(last=False)
+        return (digest, text)
+
+    def has_machine(self, digest):
+        """Return True if the machine with the given hash is cached."""
+        with self._lock:
+            return digest in self._machines
+
+    def submit(self, request):
+        """Queue a job described by the given dictionary and return it.
+
+        An Exception is raised if the request is invalid.
+        """
+        if not isinstance(request, dict):
+            raise Exception('Request must be an object')
+        if 'machine' in request:
+            digest, text = self._cache_machine(request['machine'])
+        elif 'machine_hash' in request:
+            digest = request['machine_hash']
+            with self._lock:
+                text = self._machines.get(digest)
+                if text is not None:
+                    self._machines.move_to_end(digest)
+            if text is None:
+                raise Exception('Unknown machine hash')
+        else:
+            raise Exception('Missing machine')
+        inputs = request.get('inputs')
+        if not isinstance(inputs, list) or not all(isinstance(s, str) for s in inputs):
+            raise Exception('Inputs must be a list of strings')
+        max_steps = request.get('max_steps', self._max_steps)
+        if type(max_steps) is not int or max_steps < 0:
+            raise Exception('Invalid max_steps')
+        job = Job(str(next(self._ids)), digest, inputs, bool(request.get('as_function', False)),
+            min(max_steps, self._max_steps), bool(request.get('detect_loops', False)), text)
+        with self._lock:
+            self.jobs[job.id] = job
+            finished = [j for j in self.jobs.values() if j.finished]
+            for old_job in finished[:max(len(self.jobs) - self._max_jobs, 0)]:
+                del self.jobs[old_job.id]
+        if len(inputs) == 0:
+            job.status = 'done'
+        else:
+            self._queue.put(job)
+        return job
+
+    def get(self, job_id):
+        """Return the job with the given id, None if there is none."""
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Cancel the job with the given id, or forget it if it is finished.
+
+        Returns False if there is no such job.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return False
+        if job.finished:
+            with self._lock:
+                self.jobs.pop(job_id, None)
+        else:
+            job.cancel()
+        return True
+
+    def _dispatch(self):
+        # hand the chunks of the queued jobs to the pool, one job at a time
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            with job._changed:
+                if job.finished:
+                    continue
+                job.status = 'running'
+            for start in range(0, len(job.inputs), self._chunk_size):
+                self._slots.acquire()
+                if job.finished:
+                    self._slots.release()
+                    break
+                future = self._pool.submit(_run_chunk, job.digest, job._machine_text,
+                    job.inputs[start:start+self._chunk_size], job.as_function,
+                    job.max_steps, job.detect_loops, self._cache_size)
+                job._futures.append(future)
+                future.add_done_callback(lambda f, job=job, start=start: self._chunk_done(job, start, f))
+
+    def _chunk_done(self, job, start, future):
+        # record the results of a chunk run by the pool
+        self._slots.release()
+        if future.cancelled():
+            return
+        try:
+            results = future.result()
+        except Exception as e:
+            results = [{'input': s, 'error': str(e)}
+                for s in job.inputs[start:start+self._chunk_size]]
+        job._add_chunk(start, results)
+
+    def shutdown(self):
+        """Cancel every job and stop the worker processes."""
+        for job in list(self.jobs.values()):
+            job.cancel()
+        self._queue.put(None)
+        self._pool.shutdown(cancel_futures=True)
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    # handles the HTTP requests of the service, given by the server
+
+    protocol_version = 'HTTP/1.1'
+
+    def _send_json(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self):
+        # return the parts of the path and the query parameters
+        url = urlparse(self.path)
+        return [p for p in url.path.split('/') if p != ''], parse_qs(url.query)
+
+    def do_POST(self):
+        parts, _ = self._route()
+        if parts != ['jobs']:
+            return self._send_json(404, {'error': 'Not found'})
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length))
+            job = self.server.service.submit(request)
+        except Exception as e:
+            return self._send_json(400, {'error': str(e)})
+        self._send_json(201, {'id': job.id, 'machine_hash': job.digest, 'total': len(job.inputs)})
+
+    def do_GET(self):
+        parts, query = self._route()
+        service = self.server.service
+        if len(parts) == 2 and parts[0] == 'machines':
+            if service.has_machine(parts[1]):
+                return self._send_json(200, {'machine_hash': parts[1]})
+            return self._send_json(404, {'error': 'Unknown machine hash'})
+        job = service.get(parts[1]) if len(parts) >= 2 and parts[0] == 'jobs' else None
+        if job is None or len(parts) > 3 or (len(parts) == 3 and parts[2] != 'stream'):
+            return self._send_json(404, {'error': 'Not found'})
+        if len(parts) == 3:
+            return self._stream(job)
+        try:
+            since = int(query.get('since', ['0'])[0])
+            wait = float(query.get('wait', ['0'])[0])
+        except ValueError:
+            return self._send_json(400, {'error': 'Invalid query'})
+        if wait > 0:
+            job.wait(since, wait)
+        self._send_json(200, job.to_dict(since))
+
+    def _stream(self, job):
+        # send the results of the job as they complete, one JSON object per
+        # line in a chunked response, followed by the final status
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        sent = 0
+        while True:
+            job.wait(sent, 1.0)
+            status = job.to_dict(sent)
+            lines = [json.dumps(r) for r in status['results']]
+            sent += len(lines)
+            if job.finished and sent == len(job.results):
+                del status['results']
+                lines.append(json.dumps(status))
+            if len(lines) != 0:
+                data = ('\n'.join(lines) + '\n').encode('utf-8')
+                self.wfile.write('{:x}\r\n'.format(len(data)).encode('ascii') + data + b'\r\n')
+                self.wfile.flush()
+            if 'results' not in status:
+                break
+        self.wfile.write(b'0\r\n\r\n')
+
+    def do_DELETE(self):
+        parts, _ = self._route()
+        if len(parts) == 2 and parts[0] == 'jobs' and self.server.service.cancel(parts[1]):
+            return self._send_json(200, {'id': parts[1]})
+        self._send_json(404, {'error': 'Not found'})
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(host='127.0.0.1', port=8765, **kwargs):
+    """Run the service on the given host and port until interrupted.
+
+    Other keyword arguments are given to SimulationService.
+    """
+    service = SimulationService(**kwargs)
+    server = ThreadingHTTPServer((host, port), _RequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the local simulation service.')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on')
+    parser.add_argument('-p', '--port', type=int, default=8765, help='port to listen on')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='number of worker processes')
+    parser.add_argument('-s', '--max-steps', type=int, default=1000000, help='step limit of each run')
+    args = parser.parse_args()
+    serve(args.host, args.port, workers=args.workers, max_steps=args.max_steps)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Statistics of runs of a machine, for capacity planning.
+
+Every run reports its steps, wall time, steps per second, the rightmost
+index of the head, the number of cells the head spanned, its final state and
+why it halted (see RunResult.stats()). A batch of runs adds histograms of
+these over all its runs. Both can be exported as JSON or CSV.
+
+Usage: python3 -m dtm_simulator.stats machine.json --inputs inputs.txt --json stats.json --csv runs.csv
+"""
+
+import argparse
+import csv
+import json
+import time
+from collections import Counter
+from .core import load_machine, iter_strings
+
+# columns of a run written as CSV, in order
+CSV_FIELDS = ['input', 'reason', 'accepted', 'steps', 'elapsed', 'steps_per_sec',
+    'max_index', 'cells_spanned', 'final_state', 'cycle_start', 'cycle_length']
+
+def _bucket(value):
+    # return the histogram bucket of a count; 0 for 0, otherwise the
+    # smallest power of two not below the value
+    return 0 if value <= 0 else 1 << (value - 1).bit_length()
+
+class BatchStats():
+    """This is a class to collect the statistics of a batch of runs.
+
+    Histograms of counts, such as steps, have power-of-two buckets; the
+    number of runs with a count in (bucket / 2, bucket] is kept under bucket.
+
+    Attributes:
+        runs (list): The statistics of each run, with its input under 'input',
+            in the order they were added.
+        reasons (Counter): The number of runs by halt reason.
+        final_states (Counter): The number of runs by final state.
+        steps (Counter): Histogram of the steps of the runs.
+        cells_spanned (Counter): Histogram of the tape cells spanned by the head.
+        total_steps (int): The steps of all runs.
+        total_elapsed (float): The wall time of all runs in seconds.
+    """
+
+    def __init__(self):
+        """Initialize statistics of an empty batch."""
+        self.runs = []
+        self.reasons = Counter()
+        self.final_states = Counter()
+        self.steps = Counter()
+        self.cells_spanned = Counter()
+        self.total_steps = 0
+        self.total_elapsed = 0.0
+
+    def add(self, string, result):
+        """Add the core.RunResult of running the given input to this batch."""
+        run = result.stats()
+        run['input'] = string
+        self.runs.append(run)
+        self.reasons[result.reason] += 1
+        self.final_states[result.state] += 1
+        self.steps[_bucket(result.steps)] += 1
+        self.cells_spanned[_bucket(result.cells_spanned)] += 1
+        self.total_steps += result.run_steps
+        self.total_elapsed += result.elapsed
+
+    @property
+    def steps_per_sec(self):
+        """The number of steps taken per second of wall time over all runs."""
+        return self.total_steps / self.total_elapsed if self.total_elapsed > 0 else 0.0
+
+    def to_dict(self):
+        """Return these statistics as a dictionary of plain values, ready to be
+        written as JSON."""
+        return {
+            'count': len(self.runs),
+            'total_steps': self.total_steps,
+            'total_elapsed': self.total_elapsed,
+            'steps_per_sec': self.steps_per_sec,
+            'max_steps': max((run['steps'] for run in self.runs), default=0),
+            'max_cells_spanned': max((run['cells_spanned'] for run in self.runs), default=0),
+            'reasons': dict(self.reasons),
+            'final_states': {str(state): count for state, count in sorted(self.final_states.items())},
+            'steps_histogram': {str(bucket): count for bucket, count in sorted(self.steps.items())},
+            'cells_spanned_histogram': {str(bucket): count
+                for bucket, count in sorted(self.cells_spanned.items())},
+            'runs': self.runs
+        }
+
+    def write_json(self, path):
+        """Write these statistics, with those of every run, as JSON to the file at path."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def write_csv(self, path):
+        """Write the statistics of every run as CSV to the file at path, one row per run."""
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.runs)
+
+def run_batch(machine, strings, as_function=False, max_steps=None, detect_loops=False):
+    """Run the deterministic machine on each of the given inputs and return
+    their BatchStats. The machine may be edited meanwhile, as a snapshot of it
+    is run."""
+    machine = machine.snapshot()
+    batch = BatchStats()
+    for string in strings:
+        batch.add(string, machine.run(string, as_function, max_steps, detect_loops=detect_loops))
+    return batch
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run a machine on a batch of inputs and report statistics of the runs.')
+    parser.add_argument('machine', help='JSON file of the machine')
+    parser.add_argument('-i', '--inputs', default=None, help='file of inputs, one per line')
+    parser.add_argument('-a', '--alphabet', default=None, help='input symbols, e.g. ab')
+    parser.add_argument('-l', '--max-len', type=int, default=8,
+        help='length of the longest input, if no file of inputs is given')
+    parser.add_argument('-f', '--as-function', action='store_true', help='use the machine as a function')
+    parser.add_argument('-s', '--max-steps', type=int, default=None, help='step limit of each run')
+    parser.add_argument('--detect-loops', action='store_true', help='stop runs found to loop')
+    parser.add_argument('--json', default=None, help='file to write the statistics to as JSON')
+    parser.add_argument('--csv', default=None, help='file to write each run to as CSV')
+    args = parser.parse_args()
+    machine = load_machine(args.machine)
+    if args.inputs is not None:
+        with open(args.inputs) as f:
+            strings = [line.rstrip('\n') for line in f]
+    else:
+        alphabet = machine.input_alphabet() if args.alphabet is None else args.alphabet
+        strings = iter_strings(alphabet, args.max_len)
+    started = time.monotonic()
+    batch = run_batch(machine, strings, args.as_function, args.max_steps, args.detect_loops)
+    print('{} runs in {:.1f}s, {} steps ({:.0f}/s)'.format(len(batch.runs),
+        time.monotonic() - started, batch.total_steps, batch.steps_per_sec))
+    for reason, count in batch.reasons.most_common():
+        print('{}: {}'.format(reason, count))
+    if args.json is not None:
+        batch.write_json(args.json)
+    if args.csv is not None:
+        batch.write_csv(args.csv)
+    return 0
+
+if __name__ == '__main__':
+    exit(main())
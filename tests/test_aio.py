@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from dtm_simulator import Machine
+from dtm_simulator.aio import run_many
+from dtm_simulator.core import iter_strings
+
+def marker():
+    # a machine marking the a's of its input one by one, walking to the end
+    # and back each time, accepting once none is left and looping on a b
+    machine = Machine(4)
+    machine.set_init_state(1)
+    machine.set_final_state(4)
+    machine.add_transition(1, 2, '(a,x,R)')
+    machine.add_transition(1, 1, '(x,x,R)')
+    machine.add_transition(1, 4, '(#,#,R)')
+    machine.add_transition(1, 1, '(b,b,L)')
+    machine.add_transition(2, 2, '([abx],[=],R)')
+    machine.add_transition(2, 3, '(#,#,L)')
+    machine.add_transition(3, 3, '([abx],[=],L)')
+    machine.add_transition(3, 1, '(#,#,R)')
+    machine.set_tape_model('two-way')
+    return machine
+
+def outcome(result):
+    return (result.reason, result.state, result.index, result.steps, result.min_index,
+        result.max_index, result.tape.to_string())
+
+def test_results_match_sync_runs():
+    machine = marker()
+    strings = ['a' * 40, 'ab', '', 'aax']
+
+    async def main():
+        computed = [await machine.compute_async(s, slice_steps=7) for s in strings if 'b' not in s]
+        run = [await machine.run_async(s, max_steps=500, slice_steps=7) for s in strings]
+        many = await run_many(machine, iter_strings('ax', 5), max_steps=300, limit=3, slice_steps=5)
+        return computed, run, many
+
+    computed, run, many = asyncio.run(main())
+    assert computed == [machine.compute(s) for s in strings if 'b' not in s]
+    assert computed[0] == (True, '#' + 'x' * 40 + '##...')
+    assert [outcome(r) for r in run] == [outcome(machine.run(s, max_steps=500)) for s in strings]
+    assert [outcome(r) for r in many] == [outcome(machine.run(s, max_steps=300))
+        for s in iter_strings('ax', 5)]
+
+def test_cancelled_between_slices():
+    machine = marker()
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.ensure_future(ticker())
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(machine.compute_async('ab', slice_steps=100), 0.2)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(run_many(machine, ['a', 'ab', 'aa'], slice_steps=100), 0.2)
+        task.cancel()
+
+    asyncio.run(main())
+    assert len(ticks) > 10
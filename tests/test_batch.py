@@ -0,0 +1,76 @@
+import itertools
+import random
+import time
+import pytest
+from dtm_simulator import Machine, TWO_WAY
+from dtm_simulator.batch import BatchRun, run_chunk, run_chunk_shared, OUTCOME
+
+def walker():
+    # a machine walking right into blanks until its step limit
+    machine = Machine(1)
+    machine.set_init_state(1)
+    machine.add_transition(1, 1, '([^],[=],R)')
+    return machine
+
+@pytest.mark.parametrize('share_prefixes', [False, True])
+def test_cancel_stops_between_inputs(share_prefixes):
+    batch = BatchRun(walker(), ['a' * n for n in range(16)], max_steps=10 ** 7, workers=1,
+        chunk_size=4, share_prefixes=share_prefixes)
+    time.sleep(0.2)
+    started = time.monotonic()
+    batch.cancel()
+    assert batch.wait(5)
+    assert time.monotonic() - started < 2
+    assert len(batch.rows) % 4 == 0
+    assert all(row[OUTCOME] != 'aborted' for row in batch.rows)
+
+def test_shared_rows_match():
+    # a machine that walks back over its input after each symbol
+    machine = Machine(5)
+    machine.set_init_state(1)
+    machine.set_final_state(3)
+    machine.set_tape_model(TWO_WAY)
+    for from_state, to_state, cnf in [(1, 2, '(a,A,L)'), (1, 2, '(b,B,L)'), (1, 3, '(#,#,R)'),
+            (2, 2, '([^#],[=],L)'), (2, 4, '(#,#,R)'), (4, 4, '([AB],[=],R)'),
+            (4, 5, '([ab#],[=],L)'), (5, 1, '([^],[=],R)')]:
+        machine.add_transition(from_state, to_state, cnf)
+    strings = [''.join(t) for n in range(8) for t in itertools.product('ab', repeat=n)]
+    for max_steps in (5, 100, None):
+        expected = [row[:4] for row in run_chunk(machine, strings, False, max_steps)]
+        assert [row[:4] for row in run_chunk_shared(machine, strings, False, max_steps)] == expected
+
+def test_shared_rows_match_in_input_order():
+    # strings out of order, repeated and with long common prefixes, on a
+    # machine halting on its first c, one writing past its input and one
+    # reading its input only once
+    rng = random.Random(50)
+    strings = [''.join(rng.choice('abc') for _ in range(rng.randrange(12))) for _ in range(300)]
+    strings += strings[:20] + ['ab' * 30, 'ab' * 30 + 'c', '']
+    rng.shuffle(strings)
+    first_c = Machine(2)
+    first_c.set_init_state(1)
+    first_c.set_final_state(2)
+    first_c.add_transition(1, 1, '([ab],[=],R)')
+    first_c.add_transition(1, 2, '(c,c,L)')
+    copier = Machine(3)
+    copier.set_init_state(1)
+    copier.add_transition(1, 2, '([^#],x,R)')
+    copier.add_transition(2, 2, '([^#],[=],R)')
+    copier.add_transition(2, 3, '(#,y,L)')
+    copier.add_transition(3, 3, '([^#],[=],L)')
+    copier.add_transition(3, 1, '(#,#,R)')
+    copier.set_tape_model(TWO_WAY)
+    for machine, as_function in [(first_c, False), (copier, True), (walker(), True)]:
+        for max_steps in (3, 50, 1000):
+            expected = [row[:4] for row in run_chunk(machine, strings, as_function, max_steps)]
+            rows = run_chunk_shared(machine, strings, as_function, max_steps)
+            assert [row[:4] for row in rows] == expected
+
+def test_shared_rows_cancelled():
+    strings = ['b', 'a', 'ab', 'ba', 'aa']
+    calls = []
+    rows = run_chunk_shared(walker(), strings, False, 10, lambda: len(calls.append(None) or calls) > 2)
+    expected = run_chunk(walker(), strings, False, 10)
+    done = [i for i, row in enumerate(rows) if row is not None]
+    assert 0 < len(done) < len(strings)
+    assert all(rows[i][:4] == expected[i][:4] for i in done)
@@ -0,0 +1,52 @@
+import pytest
+from dtm_simulator import Machine
+from dtm_simulator.checkpoint import Checkpoint, Checkpointer
+
+def marker():
+    # a machine marking the a's of its input one by one, walking to the end
+    # and back each time, accepting once none is left
+    machine = Machine(4)
+    machine.set_init_state(1)
+    machine.set_final_state(4)
+    machine.add_transition(1, 2, '(a,x,R)')
+    machine.add_transition(1, 1, '(x,x,R)')
+    machine.add_transition(1, 4, '(#,#,R)')
+    machine.add_transition(2, 2, '([ax],[=],R)')
+    machine.add_transition(2, 3, '(#,#,L)')
+    machine.add_transition(3, 3, '([ax],[=],L)')
+    machine.add_transition(3, 1, '(#,#,R)')
+    machine.set_tape_model('two-way')
+    return machine
+
+def test_resume_equals_uninterrupted_run(tmp_path):
+    machine = marker()
+    string = 'a' * 150
+    expected = machine.run(string)
+    assert expected.accepted and expected.steps > 20000
+    path = str(tmp_path / 'run.checkpoint')
+    stopped = machine.run(string, max_steps=12345, checkpointer=Checkpointer(path))
+    assert stopped.accepted is None and stopped.steps == 12345
+    checkpoint = Checkpoint.load(path)
+    assert checkpoint.steps == 12345
+    # resume twice, checkpointing on the way, to check a resumed run resumes
+    resumed = machine.resume(path, max_steps=5000, checkpointer=Checkpointer(path))
+    assert resumed.steps == 17345
+    resumed = machine.resume(path)
+    assert (resumed.reason, resumed.state, resumed.index, resumed.steps) == (
+        expected.reason, expected.state, expected.index, expected.steps)
+    assert resumed.tape.to_string() == expected.tape.to_string()
+    assert resumed.run_steps == expected.steps - 17345
+
+def test_resume_of_another_machine(tmp_path):
+    machine = marker()
+    path = str(tmp_path / 'run.checkpoint')
+    machine.run('aaaa', max_steps=10, checkpointer=Checkpointer(path))
+    machine.add_transition(4, 4, '(#,#,R)')
+    with pytest.raises(Exception, match='Checkpoint is of another machine'):
+        machine.resume(path)
+
+def test_invalid_checkpoint_file(tmp_path):
+    path = tmp_path / 'run.checkpoint'
+    path.write_bytes(b'DTMC1\nnot compressed')
+    with pytest.raises(Exception, match='Invalid checkpoint file'):
+        Checkpoint.load(str(path))
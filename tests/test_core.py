@@ -0,0 +1,92 @@
+import pytest
+from dtm_simulator import Machine, core
+
+def scanner():
+    # a machine accepting a string of a's and b's once its head is on the blank after it
+    machine = Machine(3)
+    machine.set_init_state(1)
+    machine.set_final_state(3)
+    machine.add_transition(1, 1, '([ab],[=],R)')
+    machine.add_transition(1, 2, '(#,#,L)')
+    machine.add_transition(2, 3, '([ab],[=],R)')
+    return machine
+
+def test_nondeterministic_compute_shows_same_tape():
+    machine = scanner()
+    assert machine.compute('aaab') == (True, 'aaab#...')
+    machine.set_nondeterministic(True)
+    assert machine.compute('aaab') == (True, 'aaab#...')
+    assert machine.compute('a' * 60) == (True, 'a' * 50 + '...?')
+
+def test_sequential_empty_input_tape():
+    machine = Machine(1)
+    machine.set_init_state(1)
+    machine.set_final_state(1)
+    testing_state = core.TestingState('', False, machine.init_state)
+    assert testing_state.tape == ''
+    machine.compute_one(testing_state)
+    assert testing_state.done and testing_state.result is True
+    assert testing_state.tape == '#...'
+
+def branching():
+    # a non-deterministic machine writing every string of a's and b's forever
+    machine = Machine(2)
+    machine.set_init_state(1)
+    machine.set_final_state(2)
+    machine.set_nondeterministic(True)
+    machine.add_transition(1, 1, '(#,a,R)')
+    machine.add_transition(1, 1, '(#,b,R)')
+    return machine
+
+def test_nondeterministic_compute_undecided():
+    with pytest.raises(Exception, match='Search stopped before deciding'):
+        branching().compute('')
+
+def test_nondeterministic_compute_unsupported_arguments():
+    machine = branching()
+    for kwargs in [{'as_function': True}, {'stats': {}}, {'detect_loops': True},
+            {'checkpointer': object()}]:
+        with pytest.raises(Exception, match='Non-deterministic machine'):
+            machine.compute('', **kwargs)
+
+def test_search_configurations_bounded():
+    result = branching().search('', max_steps=100, max_configurations=500)
+    assert result.accepted is None and result.reason == 'budget'
+    assert result.configurations <= 501
+
+def test_snapshot_unaffected_by_edits():
+    machine = scanner()
+    snapshot = machine.snapshot()
+    machine.add_transition(1, 3, '(c,c,R)')
+    machine.del_transition(2, 3, '([ab],[=],R)')
+    assert machine.compute('ab') == (False, 'ab#...')
+    assert snapshot.compute('ab') == (True, 'ab#...')
+    assert machine.snapshot().compute('c')[0] is True
+    assert snapshot.compute('c')[0] is False
+    with pytest.raises(Exception, match='Snapshot is read-only'):
+        snapshot.add_transition(1, 1, '(c,c,R)')
+
+def sequential_states(machine, string, as_function, step):
+    # the (done, result, state, index, tape) of a sequential test after every
+    # call of step, until it is done
+    testing_state = core.TestingState(string, as_function, machine.init_state, machine.blank)
+    states = []
+    while not testing_state.done:
+        step(testing_state)
+        states.append((testing_state.done, testing_state.result, testing_state.current_state,
+            testing_state.index, testing_state.tape))
+    return states
+
+def test_advance_equals_compute_one():
+    machine = scanner()
+    for string, as_function in [('abba', False), ('ab', True), ('abc', False), ('', False)]:
+        one = sequential_states(machine, string, as_function, machine.compute_one)
+        for n in [1, 3]:
+            advanced = sequential_states(machine, string, as_function,
+                lambda testing_state: machine.advance(testing_state, n))
+            assert advanced == one[n - 1::n] + ([one[-1]] if len(one) % n != 0 else [])
+        testing_state = core.TestingState(string, as_function, machine.init_state)
+        assert machine.advance(testing_state, 1000) == testing_state.steps > 0
+        assert (testing_state.done, testing_state.result, testing_state.tape) == (
+            one[-1][0], one[-1][1], one[-1][4])
+        assert machine.advance(testing_state, 1000) == 0
@@ -0,0 +1,34 @@
+import itertools
+from dtm_simulator import Machine, LOOPS, ACCEPT
+
+def scanner():
+    # a machine moving right over a's and accepting at a b
+    machine = Machine(2)
+    machine.set_init_state(1)
+    machine.set_final_state(2)
+    machine.add_transition(1, 1, '(a,a,R)')
+    machine.add_transition(1, 2, '(b,b,R)')
+    return machine
+
+def test_lazy_input_not_read_ahead():
+    chunks = itertools.chain(['a' * 10, 'b'], itertools.repeat('a' * 1000))
+    result = scanner().run(chunks, detect_loops=True)
+    assert result.reason == ACCEPT
+    assert result.tape.end < 2000
+
+def test_no_translated_cycle_inside_lazy_input():
+    chunks = itertools.chain(itertools.repeat('a' * 100, 50), ['b'])
+    assert scanner().run(chunks, max_steps=10 ** 6, detect_loops=True).reason == ACCEPT
+
+def test_cycle_start_on_lazy_input():
+    # a machine going back and forth between the first two cells after a run of a's
+    machine = Machine(3)
+    machine.set_init_state(1)
+    machine.add_transition(1, 1, '(a,a,R)')
+    machine.add_transition(1, 2, '(b,c,R)')
+    machine.add_transition(2, 3, '([^],[=],L)')
+    machine.add_transition(3, 2, '([^],[=],R)')
+    chunks = itertools.chain(['aaab'], itertools.repeat('b' * 100))
+    result = machine.run(chunks, max_steps=10000, detect_loops=True)
+    assert result.reason == LOOPS
+    assert (result.cycle_start, result.cycle_length, result.cycle_shift) == (4, 2, 0)
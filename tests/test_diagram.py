@@ -0,0 +1,78 @@
+import struct
+import zlib
+import pytest
+from dtm_simulator import Machine
+from dtm_simulator.diagram import write_diagram, BLANK_COLOR
+
+def scanner():
+    # a machine moving right over its input and back onto its last symbol
+    machine = Machine(3)
+    machine.set_init_state(1)
+    machine.set_final_state(3)
+    machine.add_transition(1, 1, '([ab],[=],R)')
+    machine.add_transition(1, 2, '(#,#,L)')
+    machine.add_transition(2, 3, '([ab],[=],R)')
+    return machine
+
+def read_ppm(path):
+    # return the width, height and rows of pixels of a binary PPM file
+    with open(path, 'rb') as f:
+        content = f.read()
+    magic, size, depth, pixels = content.split(b'\n', 3)
+    assert magic == b'P6' and depth == b'255'
+    width, height = map(int, size.split())
+    assert len(pixels) == 3 * width * height
+    return width, height, [pixels[3 * width * i:3 * width * (i + 1)] for i in range(height)]
+
+def read_png(path):
+    # return the width, height and rows of pixels of an 8-bit RGB PNG file,
+    # checking the CRC of every chunk
+    with open(path, 'rb') as f:
+        content = f.read()
+    assert content[:8] == b'\x89PNG\r\n\x1a\n'
+    position = 8
+    chunks = []
+    while position < len(content):
+        length, = struct.unpack('>I', content[position:position + 4])
+        kind = content[position + 4:position + 8]
+        data = content[position + 8:position + 8 + length]
+        crc, = struct.unpack('>I', content[position + 8 + length:position + 12 + length])
+        assert crc == zlib.crc32(kind + data)
+        chunks.append((kind, data))
+        position += 12 + length
+    assert chunks[0][0] == b'IHDR' and chunks[-1] == (b'IEND', b'')
+    width, height, bits, color = struct.unpack('>IIBB', chunks[0][1][:10])
+    assert (bits, color) == (8, 2)
+    data = zlib.decompress(b''.join(data for kind, data in chunks if kind == b'IDAT'))
+    stride = 3 * width + 1
+    assert len(data) == stride * height and all(data[stride * i] == 0 for i in range(height))
+    return width, height, [data[stride * i + 1:stride * (i + 1)] for i in range(height)]
+
+def test_diagram_rows_are_steps(tmp_path):
+    path = str(tmp_path / 'diagram.ppm')
+    result = write_diagram(scanner(), 'abba', path)
+    assert result.accepted and result.steps == 6
+    width, height, rows = read_ppm(path)
+    assert (width, height) == (5, 7)
+    # cells are colored by their symbol, but for the head, which moves a
+    # cell right a row, colored by the state
+    a, b = rows[1][0:3], rows[0][3:6]
+    assert a != b and BLANK_COLOR not in (a, b)
+    for row in range(5):
+        cells = [rows[row][3 * i:3 * i + 3] for i in range(5)]
+        assert cells[:row] + cells[row + 1:] == ([a, b, b, a, BLANK_COLOR][:row]
+            + [a, b, b, a, BLANK_COLOR][row + 1:])
+        assert cells[row] not in (a, b, BLANK_COLOR)
+    assert rows[1][:3] != rows[0][:3] == rows[4][12:15]
+
+def test_png_matches_ppm(tmp_path):
+    machine = scanner()
+    write_diagram(machine, 'ab' * 40, str(tmp_path / 'diagram.ppm'), width=16, height=32)
+    write_diagram(machine, 'ab' * 40, str(tmp_path / 'diagram.png'), width=16, height=32)
+    ppm = read_ppm(str(tmp_path / 'diagram.ppm'))
+    assert ppm[0] <= 16 and ppm[1] <= 32
+    assert read_png(str(tmp_path / 'diagram.png')) == ppm
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(Exception, match='Unknown image format'):
+        write_diagram(scanner(), 'ab', str(tmp_path / 'diagram.gif'))
@@ -0,0 +1,46 @@
+from dtm_simulator import Machine
+from dtm_simulator.core import count_strings, nth_string, iter_strings
+from dtm_simulator.equivalence import check_equivalence
+
+def counter(modulus, accepting):
+    # a machine counting the a's of its input modulo the modulus, skipping
+    # the b's, and accepting if the count is in accepting
+    machine = Machine(modulus + 1)
+    machine.set_init_state(1)
+    machine.set_final_state(modulus + 1)
+    for count in range(modulus):
+        machine.add_transition(count + 1, (count + 1) % modulus + 1, '(a,a,R)')
+        machine.add_transition(count + 1, count + 1, '(b,b,R)')
+        if count in accepting:
+            machine.add_transition(count + 1, modulus + 1, '(#,#,R)')
+    return machine
+
+def test_strings_by_position():
+    strings = list(iter_strings('ab', 3))
+    assert len(strings) == count_strings('ab', 3) == 15
+    assert strings[:7] == ['', 'a', 'b', 'aa', 'ab', 'ba', 'bb']
+    assert [nth_string('ab', n) for n in range(15)] == strings
+    assert list(iter_strings('ab', 3, 5, 9)) == strings[5:9]
+
+def test_equivalent_machines():
+    for workers in [1, 2]:
+        result = check_equivalence(counter(2, [0]), counter(4, [0, 2]), 'ab', 6,
+            workers=workers, chunk_size=16)
+        assert result.equivalent
+        assert result.checked == result.total == count_strings('ab', 6)
+
+def test_first_counterexamples():
+    for workers in [1, 2]:
+        result = check_equivalence(counter(2, [0]), counter(4, [0]), 'ab', 6,
+            workers=workers, max_counterexamples=3, chunk_size=4)
+        assert not result.equivalent
+        assert [c.string for c in result.counterexamples] == ['aa', 'aab', 'aba']
+        assert result.counterexamples[0].outcome_a == ('accept', None)
+        assert result.counterexamples[0].outcome_b == ('reject', None)
+
+def test_undecided_inputs():
+    looping = counter(2, [0])
+    looping.add_transition(2, 2, '(#,#,R)')
+    result = check_equivalence(counter(2, [0]), looping, 'a', 4, max_steps=100, workers=1)
+    assert result.equivalent
+    assert result.undecided == ['a', 'aaa'] and result.undecided_count == 2
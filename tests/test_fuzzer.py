@@ -0,0 +1,28 @@
+from dtm_simulator import Machine
+from dtm_simulator.fuzzer import Fuzzer
+
+def scanner():
+    # a machine taking a step per symbol of its input
+    machine = Machine(1)
+    machine.set_init_state(1)
+    machine.add_transition(1, 1, '(a,a,R)')
+    return machine
+
+def test_worst_kept_across_runs():
+    fuzzer = Fuzzer(scanner(), max_worst=3, seed=0)
+    fuzzer.run(iterations=0)
+    for length in (61, 41, 21):
+        fuzzer.add_seed('a' * length)
+    report = fuzzer.run(iterations=0)
+    assert [steps for steps, _ in report.worst] == [61, 41, 21]
+    fuzzer.add_seed('a' * 51)
+    report = fuzzer.run(iterations=0)
+    assert [steps for steps, _ in report.worst] == [61, 51, 41]
+
+def test_worst_after_fuzzing_twice():
+    fuzzer = Fuzzer(scanner(), max_worst=5, max_len=16, seed=1)
+    fuzzer.run(iterations=200)
+    report = fuzzer.run(iterations=200)
+    steps = [steps for steps, _ in report.worst]
+    assert steps == sorted(steps, reverse=True)
+    assert steps[0] == max(len(string) for string in report.corpus)
@@ -0,0 +1,54 @@
+import pytest
+from dtm_simulator.core import Tape, TrackLayout
+from dtm_simulator.gui import TapeView
+
+@pytest.fixture
+def root():
+    # a Tk root window, skipping the test where there is no display
+    tkinter = pytest.importorskip('tkinter')
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError:
+        pytest.skip('no display')
+    root.withdraw()
+    yield root
+    root.destroy()
+
+def test_scroll_fractions_without_cells():
+    # the state of a TapeView before its canvas is first laid out
+    view = TapeView.__new__(TapeView)
+    view.tape = None
+    view._first = 0
+    view._cells = []
+    assert view._scroll_fractions() == (0.0, 1.0)
+    view.tape = Tape('', '#')
+    assert view._scroll_fractions() == (0.0, 1.0)
+
+def test_tape_view_before_layout(root):
+    view = TapeView(root)
+    view.clear()
+    view.show(Tape('abc', '#'), 1)
+    view.show(Tape('', '#'), 0)
+
+class _Recorder():
+    # stands in for a canvas or scrollbar, accepting any call
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+def test_set_tracks_before_layout_without_display():
+    view = TapeView.__new__(TapeView)
+    view.tape = None
+    view.index = None
+    view.tracks = None
+    view._first = 0
+    view._cells = []
+    view._canvas = _Recorder()
+    view._xsb = _Recorder()
+    view.set_tracks(TrackLayout(2, 'ax', '#'))
+    view.set_tracks(None)
+
+def test_set_tracks_before_layout(root):
+    view = TapeView(root)
+    view.set_tracks(TrackLayout(2, 'ax', '#'))
+    view.show(Tape('aa', '#'), 0)
+    view.set_tracks(None)
@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+
+# importing the headless package must take at most this, as batch workers
+# import it on every start
+IMPORT_BUDGET_MS = 100
+# modules the headless package must not import
+HEAVY_MODULES = {'tkinter', 'concurrent', 'multiprocessing', 'http'}
+
+CODE = '''
+import sys
+import dtm_simulator, dtm_simulator.core, dtm_simulator.ntm, dtm_simulator.cycles, dtm_simulator.checkpoint
+print(' '.join(sorted(set(name.split('.')[0] for name in sys.modules))))
+'''
+
+def import_package():
+    # return (milliseconds, top-level modules) of importing the package in a
+    # fresh interpreter, timed by -X importtime
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+    env = dict(os.environ, PYTHONPATH=src)
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', CODE],
+        capture_output=True, text=True, check=True, env=env)
+    elapsed = 0
+    for line in process.stderr.splitlines():
+        fields = line.split('|')
+        # top-level imports of the package, whose nested imports their
+        # cumulative time includes
+        if len(fields) == 3 and fields[2].startswith(' dtm_simulator'):
+            elapsed += int(fields[1])
+    return (elapsed / 1000, set(process.stdout.split()))
+
+def test_no_heavy_imports():
+    _, modules = import_package()
+    assert modules & HEAVY_MODULES == set()
+
+def test_import_budget():
+    # best of a few runs, as the first may read from a cold disk
+    elapsed = min(import_package()[0] for _ in range(3))
+    assert 0 < elapsed <= IMPORT_BUDGET_MS
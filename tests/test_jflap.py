@@ -0,0 +1,73 @@
+import pytest
+from dtm_simulator import Machine
+from dtm_simulator.core import TWO_WAY, iter_strings
+from dtm_simulator.jflap import import_jff, export_jff
+
+def marker():
+    # a machine accepting the strings of a's and b's ending with b, marking
+    # each symbol on its way and walking back to the left end when done
+    machine = Machine(4, tape_model=TWO_WAY)
+    machine.set_init_state(1)
+    machine.set_final_state(4)
+    machine.add_transition(1, 1, '(a,x,R)')
+    machine.add_transition(1, 2, '(b,y,R)')
+    machine.add_transition(2, 1, '(a,x,R)')
+    machine.add_transition(2, 2, '(b,y,R)')
+    machine.add_transition(2, 3, '(#,#,L)')
+    machine.add_transition(3, 3, '([^#],[=],L)')
+    machine.add_transition(3, 4, '(#,#,R)')
+    return machine
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'machine.jff')
+    machine = marker()
+    positions = {1: (10.0, 20.0), 3: (30.5, 40.0)}
+    warnings = export_jff(machine, path, positions)
+    assert len(warnings) == 1 and warnings[0].startswith('Expanded 3 -> 3 ([^#],[=],L)')
+    imported, imported_positions, warnings = import_jff(path)
+    assert warnings == []
+    assert imported.tape_model == TWO_WAY and not imported.nondeterministic
+    assert imported.init_state == 1 and imported.final_states[4]
+    assert imported_positions[1] == (10.0, 20.0) and imported_positions[3] == (30.5, 40.0)
+    for string in iter_strings('ab', 6):
+        expected = machine.run(string)
+        result = imported.run(string)
+        assert (result.reason, result.index, result.steps) == (expected.reason, expected.index, expected.steps)
+        assert result.tape.to_string() == expected.tape.to_string()
+
+JFF = '''<?xml version="1.0" encoding="UTF-8" standalone="no"?>
+<structure><type>turing</type><automaton>
+<state id="7"><x>1.0</x><y>2.0</y><initial/></state>
+<state id="3"><final/></state>
+<transition><from>7</from><to>3</to><read>a</read><write/><move>R</move></transition>
+<transition><from>7</from><to>7</to><read>a</read><write>b</write><move>R</move></transition>
+<transition><from>7</from><to>3</to><read>a</read><write/><move>R</move></transition>
+<transition><from>7</from><to>3</to><read>b</read><write>b</write><move>S</move></transition>
+<transition><from>7</from><to>3</to><read>bb</read><write>b</write><move>L</move></transition>
+<transition><from>3</from><to>7</to><read/><write>c</write><move>L</move></transition>
+</automaton></structure>
+'''
+
+def test_import_reports_what_it_cannot_import(tmp_path):
+    path = tmp_path / 'machine.jff'
+    path.write_text(JFF)
+    machine, positions, warnings = import_jff(str(path))
+    assert positions == {1: (1.0, 2.0)}
+    assert machine.init_state == 1 and machine.final_states[2]
+    assert machine.nondeterministic
+    assert machine.get_transitions(1, 2) == ['(a,#,R)']
+    assert machine.get_transitions(2, 1) == ['(#,c,L)']
+    assert warnings == [
+        'Non-deterministic on a from state 1',
+        'Skipped 1 -> 2 (a,#,R): duplicate',
+        'Skipped 1 -> 2 (b,b,S): cannot stay in place',
+        'Skipped 1 -> 2 (bb,b,L): symbols must be single characters']
+
+def test_import_of_another_automaton(tmp_path):
+    path = tmp_path / 'machine.jff'
+    path.write_text(JFF.replace('turing', 'fa'))
+    with pytest.raises(Exception, match='Not a Turing machine'):
+        import_jff(str(path))
+    path.write_text(JFF[:200])
+    with pytest.raises(Exception, match='Invalid JFLAP file'):
+        import_jff(str(path))
@@ -0,0 +1,74 @@
+import os
+import time
+import pytest
+from dtm_simulator import Machine
+from dtm_simulator.journal import Journal
+
+def edit(machine, journal):
+    # make a few edits of each kind, on three new states
+    first = machine.max_state_num + 1
+    for _ in range(3):
+        machine.add_state()
+    machine.set_init_state(first)
+    machine.set_final_state(first + 2)
+    machine.add_transition(first, first + 1, '(a,b,R)')
+    machine.add_transition(first + 1, first + 2, '([^#],[=],L)')
+    machine.del_transition(first, first + 1, '(a,b,R)')
+    machine.add_transition(first, first + 1, '(a,a,R)')
+    journal.record_position(first + 1, 10.0, 20.0)
+
+def test_recover_after_crash(tmp_path):
+    path = str(tmp_path / 'journal')
+    machine, positions, generation = Journal.recover(path)
+    journal = Journal(path, machine, positions, generation, sync_interval=0.01)
+    edit(machine, journal)
+    time.sleep(0.2)
+    # recovered while the journal is still open, as after a crash
+    recovered, positions, generation = Journal.recover(path)
+    assert recovered.to_dict() == machine.to_dict()
+    assert positions == {2: (10.0, 20.0)}
+    journal.close()
+
+def test_record_cut_short_is_ignored(tmp_path):
+    path = str(tmp_path / 'journal')
+    machine = Machine(0)
+    journal = Journal(path, machine)
+    edit(machine, journal)
+    journal.close()
+    with open(path, 'a') as f:
+        f.write('["t+",1,')
+    assert Journal.recover(path)[0].to_dict() == machine.to_dict()
+
+def test_recover_after_compactions(tmp_path):
+    path = str(tmp_path / 'journal')
+    machine = Machine(0)
+    journal = Journal(path, machine, max_records=4)
+    for _ in range(5):
+        edit(machine, journal)
+        machine.del_state(machine.max_state_num)
+    journal.close()
+    assert not os.path.exists(path + '.old')
+    recovered, _, generation = Journal.recover(path)
+    assert recovered.to_dict() == machine.to_dict()
+    assert generation > 1
+
+def test_corrupt_journal_set_aside(tmp_path):
+    path = str(tmp_path / 'journal')
+    machine = Machine(0)
+    journal = Journal(path, machine)
+    edit(machine, journal)
+    journal.close()
+    with open(path, 'a') as f:
+        f.write('["t+",99,1,"(a,a,R)"]\n')
+    contents = {}
+    for name in (path, path + '.snapshot'):
+        with open(name) as f:
+            contents[name] = f.read()
+    with pytest.raises(Exception):
+        Journal.recover(path)
+    suffix = Journal.set_aside(path)
+    Journal(path, Machine(0)).close()
+    for name, content in contents.items():
+        with open(name + suffix) as f:
+            assert f.read() == content
+    assert Journal.recover(path)[0].to_dict() == Machine(0).to_dict()
@@ -0,0 +1,40 @@
+from dtm_simulator import Machine
+
+def even_as():
+    # a machine accepting the strings with an even number of a's, looping on
+    # those starting with b and an odd number of a's
+    machine = Machine(3)
+    machine.set_init_state(1)
+    machine.set_final_state(3)
+    machine.add_transition(1, 2, '(a,a,R)')
+    machine.add_transition(2, 1, '(a,a,R)')
+    machine.add_transition(1, 1, '(b,b,R)')
+    machine.add_transition(2, 2, '(b,b,R)')
+    machine.add_transition(1, 3, '(#,#,R)')
+    return machine
+
+def expected(max_len):
+    # the strings even_as() accepts, in length-lexicographic order
+    from dtm_simulator.core import iter_strings
+    return [s for s in iter_strings('ab', max_len) if s.count('a') % 2 == 0]
+
+def test_language_in_order():
+    machine = even_as()
+    assert list(machine.enumerate_language(5, chunk_size=7)) == expected(5)
+    assert list(machine.enumerate_language(5, workers=2, chunk_size=7)) == expected(5)
+
+def test_language_skips_runs_over_budget():
+    machine = even_as()
+    machine.add_transition(2, 2, '(#,#,R)')
+    assert list(machine.enumerate_language(4, max_steps=50)) == expected(4)
+
+def test_language_as_function():
+    machine = even_as()
+    pairs = list(machine.enumerate_language(2, 'ab', as_function=True))
+    assert [string for string, _ in pairs] == ['', 'a', 'b', 'aa', 'ab', 'ba', 'bb']
+    assert all(output == string for string, output in pairs)
+
+def test_language_closed_early():
+    language = even_as().enumerate_language(12, workers=2, chunk_size=64)
+    assert [next(language) for _ in range(4)] == expected(2)[:4]
+    language.close()
@@ -0,0 +1,62 @@
+import random
+import pytest
+from dtm_simulator import Machine
+from dtm_simulator.core import Transition
+
+READS = ['a', 'b', 'c', '[ab]', '[bc]', '[^a]', '[^ab]', '[^abc]']
+
+def transitions_of(machine):
+    # the transitions of the machine as (from_state, to_state, cnf)
+    return sorted((f, t, str(transition)) for f in machine.transitions
+        for t in machine.transitions[f] for transition in machine.transitions[f][t])
+
+def test_random_edits_match_a_scan():
+    # every edit is checked against a scan of all the transitions, as the
+    # machine checked them before it kept indices
+    rng = random.Random(43)
+    machine = Machine(6)
+    for _ in range(3000):
+        states = sorted(machine.states)
+        action = rng.random()
+        if action < 0.6:
+            f, t = rng.choice(states), rng.choice(states)
+            cnf = '({},x,{})'.format(rng.choice(READS), rng.choice('LR'))
+            new = Transition(f, t, cnf)
+            clash = any(new.overlaps(other) for targets in machine.transitions[f].values()
+                for other in targets)
+            if clash:
+                with pytest.raises(Exception, match='Non-determinism'):
+                    machine.add_transition(f, t, cnf)
+            else:
+                machine.add_transition(f, t, cnf)
+        elif action < 0.9:
+            existing = transitions_of(machine)
+            if len(existing) != 0:
+                f, t, cnf = rng.choice(existing)
+                assert machine.del_transition(f, t, cnf)
+                assert not machine.del_transition(f, t, cnf)
+        elif action < 0.95 or len(states) < 3:
+            machine.add_state()
+        else:
+            state = rng.choice(states)
+            assert machine.del_state(state)
+            assert machine.max_state_num == max(machine.states)
+            assert all(f != state and t != state for f, t, _ in transitions_of(machine))
+    assert len(transitions_of(machine)) != 0
+
+def test_deleted_state_leaves_no_transitions():
+    machine = Machine(3)
+    machine.add_transition(1, 3, '(a,a,R)')
+    machine.add_transition(2, 3, '(a,a,R)')
+    machine.add_transition(3, 3, '(a,a,R)')
+    machine.add_transition(3, 1, '(b,b,R)')
+    assert machine.del_state(3)
+    assert machine.max_state_num == 2 and transitions_of(machine) == []
+    # the states can read a again, and the machine be made deterministic
+    machine.add_transition(1, 2, '(a,a,R)')
+    machine.set_nondeterministic(True)
+    machine.add_transition(1, 1, '([^b],a,R)')
+    with pytest.raises(Exception, match='Non-determinism'):
+        machine.set_nondeterministic(False)
+    assert machine.del_transition(1, 1, '([^b],a,R)')
+    machine.set_nondeterministic(False)
@@ -0,0 +1,36 @@
+from dtm_simulator import Machine
+from dtm_simulator.core import iter_strings
+
+def redundant():
+    # a machine accepting the strings with an even number of a's, writing x
+    # over the b's, with four states counting where two would do, a state
+    # it never reaches and a bounce right and back on each a counted
+    machine = Machine(14)
+    machine.set_init_state(1)
+    machine.set_final_state(5)
+    for count in range(4):
+        machine.add_transition(count + 1, count + 6, '(a,y,R)')
+        machine.add_transition(count + 6, count + 10, '([^],[=],L)')
+        machine.add_transition(count + 10, (count + 1) % 4 + 1, '(y,a,R)')
+        machine.add_transition(count + 1, count + 1, '(b,x,R)')
+    for count in [0, 2]:
+        machine.add_transition(count + 1, 5, '(#,#,R)')
+    machine.add_transition(14, 1, '(a,b,R)')
+    return machine
+
+def outcomes(machine, max_len, as_function):
+    # the halt reason, final tape and steps of the machine on every input
+    runs = [machine.run(string, as_function) for string in iter_strings('ab', max_len)]
+    return [(run.reason, run.tape.to_string(), run.steps) for run in runs]
+
+def test_optimize_preserves_language():
+    machine = redundant()
+    for as_function in [False, True]:
+        optimized, mapping = machine.optimize(as_function)
+        assert len(optimized.states) < len(machine.states)
+        assert 14 not in mapping and mapping[1] == optimized.init_state == 1
+        before = outcomes(machine, 7, as_function)
+        after = outcomes(optimized, 7, as_function)
+        assert [run[:2] for run in after] == [run[:2] for run in before]
+        assert all(a[2] <= b[2] for a, b in zip(after, before))
+        assert sum(a[2] for a in after) < sum(b[2] for b in before)
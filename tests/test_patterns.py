@@ -0,0 +1,46 @@
+import pytest
+from dtm_simulator import Machine
+from dtm_simulator.core import Transition, iter_strings
+
+def build(transitions):
+    # a two-way machine with the given (from, to, cnf) transitions, accepting in state 3
+    machine = Machine(3, tape_model='two-way')
+    machine.set_init_state(1)
+    machine.set_final_state(3)
+    for from_state, to_state, cnf in transitions:
+        machine.add_transition(from_state, to_state, cnf)
+    return machine
+
+def test_patterns_compute_as_their_symbols():
+    # the same machine, with patterns and with a transition per symbol
+    patterns = build([(1, 1, '([ab],[=],R)'), (1, 2, '([^ab#],x,L)'), (2, 2, '([^],[=],L)'),
+        (1, 3, '(#,#,R)')])
+    symbols = build([(1, 1, '(a,a,R)'), (1, 1, '(b,b,R)'), (1, 2, '(c,x,L)'), (1, 2, '(d,x,L)'),
+        (2, 2, '(a,a,L)'), (2, 2, '(b,b,L)'), (2, 2, '(x,x,L)'), (2, 2, '(#,#,L)'),
+        (1, 3, '(#,#,R)')])
+    for string in iter_strings('abcd', 4):
+        expected = symbols.run(string, max_steps=50)
+        result = patterns.run(string, max_steps=50)
+        assert (result.reason, result.steps, result.tape.to_string()) == (
+            expected.reason, expected.steps, expected.tape.to_string())
+    # a symbol the machine never mentions is read by the negated patterns too
+    assert patterns.run('aé', max_steps=10).tape.to_string().endswith('#ax')
+    patterns.set_nondeterministic(True)
+    assert patterns.search('abab').accepted is True
+    assert patterns.search('abe', max_steps=20).accepted is None
+
+def test_overlapping_patterns_are_nondeterministic():
+    machine = build([(1, 1, '([ab],[=],R)'), (1, 2, '([^abc],x,L)')])
+    for cnf in ['(a,a,R)', '([bc],b,R)', '([^],a,R)', '([^c],a,L)', '(d,d,R)']:
+        with pytest.raises(Exception, match='Non-determinism'):
+            machine.add_transition(1, 3, cnf)
+    machine.add_transition(1, 3, '(c,c,R)')
+    assert Transition(1, 1, '([^a],a,R)').overlaps(Transition(1, 1, '([^b],a,R)'))
+    assert not Transition(1, 1, '([^ab],a,R)').overlaps(Transition(1, 1, '([ab],a,R)'))
+
+def test_invalid_patterns():
+    for cnf in ['([],a,R)', '([ab,a,R)', '(ab,a,R)', '(a,[ab],R)', '(a,[=],S)']:
+        with pytest.raises(Exception, match='Invalid configuration'):
+            Transition(1, 1, cnf)
+    assert Transition(1, 1, '([ba],[=],R)').read == '[ab]'
+    assert Transition(1, 1, '([^],[=],R)').matches('#')
@@ -0,0 +1,62 @@
+from dtm_simulator import Machine
+from dtm_simulator.regression import RegressionSuite, PASSED, FAILED, PENDING
+
+def even_as():
+    # a machine accepting the strings of a's and b's with an even number of a's
+    machine = Machine(3)
+    machine.set_init_state(1)
+    machine.set_final_state(3)
+    machine.add_transition(1, 2, '(a,a,R)')
+    machine.add_transition(2, 1, '(a,a,R)')
+    machine.add_transition(1, 1, '(b,b,R)')
+    machine.add_transition(2, 2, '(b,b,R)')
+    machine.add_transition(1, 3, '(#,#,R)')
+    return machine
+
+def statuses(suite):
+    return [test.status for test in suite.tests]
+
+def test_edits_rerun_affected_tests():
+    machine = even_as()
+    suite = RegressionSuite(machine, [('', True), ('a', False), ('ab', False), ('c', True), ('aa', True)])
+    try:
+        assert suite.wait(10)
+        assert statuses(suite) == [PASSED, PASSED, PASSED, FAILED, PASSED]
+        results = [test.result for test in suite.tests]
+        # only the test that looked up c in state 1 can change
+        machine.add_transition(1, 3, '(c,c,R)')
+        assert suite.wait(10)
+        assert statuses(suite) == [PASSED] * 5
+        rerun = [test.result is not result for test, result in zip(suite.tests, results)]
+        assert rerun == [False, False, False, True, False]
+        # only the tests that were in state 2 can change
+        results = [test.result for test in suite.tests]
+        machine.add_transition(2, 3, '(#,#,R)')
+        machine.add_transition(2, 2, '(c,c,R)')
+        assert suite.wait(10)
+        assert statuses(suite) == [PASSED, FAILED, FAILED, PASSED, PASSED]
+        rerun = [test.result is not result for test, result in zip(suite.tests, results)]
+        assert rerun == [False, True, True, False, False]
+        assert [test.string for test in suite.failures()] == ['a', 'ab']
+        # every test can change with the initial state
+        results = [test.result for test in suite.tests]
+        machine.set_init_state(2)
+        assert suite.wait(10)
+        assert suite.counts() == {PENDING: 0, PASSED: 3, FAILED: 2}
+        assert all(test.result is not result for test, result in zip(suite.tests, results))
+    finally:
+        suite.close()
+
+def test_suite_file_round_trip(tmp_path):
+    path = str(tmp_path / 'suite.json')
+    suite = RegressionSuite(even_as(), [('ab', 'ab'), ('', '')], as_function=True, max_steps=50)
+    suite.save(path)
+    suite.close()
+    loaded = RegressionSuite.load(even_as(), path)
+    try:
+        assert [(t.string, t.expected) for t in loaded.tests] == [('ab', 'ab'), ('', '')]
+        assert loaded.as_function and loaded.max_steps == 50
+        assert loaded.wait(10)
+        assert statuses(loaded) == [PASSED, PASSED]
+    finally:
+        loaded.close()
@@ -0,0 +1,57 @@
+import pytest
+from dtm_simulator import Machine
+from dtm_simulator.service import SimulationService
+
+def walker(symbol):
+    # a machine walking right, writing the symbol, until its step limit
+    machine = Machine(1)
+    machine.set_init_state(1)
+    machine.add_transition(1, 1, '([^],{},R)'.format(symbol))
+    return machine.to_dict()
+
+def acceptor():
+    # a machine accepting the strings starting with a
+    machine = Machine(2)
+    machine.set_init_state(1)
+    machine.set_final_state(2)
+    machine.add_transition(1, 2, '(a,a,R)')
+    return machine.to_dict()
+
+@pytest.fixture
+def service():
+    service = SimulationService(workers=1, chunk_size=2, cache_size=1)
+    yield service
+    service.shutdown()
+
+def test_job_results_in_order(service):
+    job = service.submit({'machine': acceptor(), 'inputs': ['a', 'b', '', 'ab', 'ba']})
+    job.wait(4, 10)
+    while not job.finished:
+        job.wait(len(job.results), 10)
+    assert job.status == 'done'
+    assert [(r['input'], r['accepted']) for r in job.results] == [
+        ('a', True), ('b', False), ('', False), ('ab', True), ('ba', False)]
+    again = service.submit({'machine_hash': job.digest, 'inputs': ['aa']})
+    again.wait(0, 10)
+    assert again.results[0]['accepted'] is True
+
+def test_job_runs_after_its_machine_is_evicted(service):
+    # the first job keeps the pool busy while the second is queued, and the
+    # third drops the machine of the second from the cache
+    slow = service.submit({'machine': walker('x'), 'inputs': [''] * 6, 'max_steps': 300000})
+    queued = service.submit({'machine': acceptor(), 'inputs': ['a', 'b']})
+    service.submit({'machine': walker('y'), 'inputs': ['']})
+    assert not service.has_machine(queued.digest)
+    with pytest.raises(Exception, match='Unknown machine hash'):
+        service.submit({'machine_hash': queued.digest, 'inputs': ['a']})
+    while not queued.finished:
+        queued.wait(len(queued.results), 30)
+    assert queued.status == 'done'
+    assert [r['accepted'] for r in queued.results] == [True, False]
+    slow.cancel()
+
+def test_invalid_requests(service):
+    for request in [[], {'inputs': ['a']}, {'machine': acceptor(), 'inputs': 'a'},
+            {'machine': acceptor(), 'inputs': ['a'], 'max_steps': -1}]:
+        with pytest.raises(Exception):
+            service.submit(request)
@@ -0,0 +1,36 @@
+import csv
+import json
+from dtm_simulator import Machine
+from dtm_simulator.stats import run_batch, CSV_FIELDS
+
+def bouncer():
+    # a machine going right to the end of its input and back to the start
+    machine = Machine(3)
+    machine.set_init_state(1)
+    machine.set_final_state(3)
+    machine.add_transition(1, 1, '([ab],[=],R)')
+    machine.add_transition(1, 2, '(#,#,L)')
+    machine.add_transition(2, 2, '([ab],[=],L)')
+    return machine
+
+def test_run_statistics():
+    result = bouncer().run('aba')
+    stats = result.stats()
+    assert (stats['steps'], stats['max_index'], stats['cells_spanned']) == (7, 3, 4)
+    assert stats['reason'] == 'left-edge' and stats['final_state'] == 2
+
+def test_export(tmp_path):
+    batch = run_batch(bouncer(), ['', 'a', 'abab'], max_steps=100)
+    assert [run['cells_spanned'] for run in batch.runs] == [1, 2, 5]
+    batch.write_json(str(tmp_path / 'stats.json'))
+    batch.write_csv(str(tmp_path / 'runs.csv'))
+    with open(str(tmp_path / 'stats.json')) as f:
+        data = json.load(f)
+    assert data['count'] == 3 and data['max_cells_spanned'] == 5
+    assert data['cells_spanned_histogram'] == {'1': 1, '2': 1, '8': 1}
+    assert data['total_steps'] == sum(run['steps'] for run in batch.runs)
+    with open(str(tmp_path / 'runs.csv'), newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == CSV_FIELDS
+    assert [row['input'] for row in rows] == ['', 'a', 'abab']
+    assert [int(row['cells_spanned']) for row in rows] == [1, 2, 5]
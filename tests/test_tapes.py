@@ -0,0 +1,62 @@
+import pytest
+from dtm_simulator import Machine
+from dtm_simulator.core import input_tape, MappedTape, TAPE_PAGE_SIZE
+
+def rewriter():
+    # a machine rewriting each a of its input as Ω, which does not fit in a
+    # byte, and each b as c, then writing d after it and walking back
+    machine = Machine(3, tape_model='two-way')
+    machine.set_init_state(1)
+    machine.set_final_state(3)
+    machine.add_transition(1, 1, '(a,Ω,R)')
+    machine.add_transition(1, 1, '(b,c,R)')
+    machine.add_transition(1, 2, '(#,d,L)')
+    machine.add_transition(2, 2, '([^#],[=],L)')
+    machine.add_transition(2, 3, '(#,#,R)')
+    return machine
+
+def chunks(string, size):
+    for start in range(0, len(string), size):
+        yield string[start:start + size]
+
+def outcome(result):
+    return (result.reason, result.index, result.steps, result.min_index, result.max_index,
+        result.tape.to_string())
+
+def test_mapped_inputs_match_strings(tmp_path):
+    machine = rewriter()
+    string = 'ab' * TAPE_PAGE_SIZE + 'b' * 1000
+    path = tmp_path / 'input.txt'
+    path.write_bytes(string.encode('ascii'))
+    expected = outcome(machine.run(string))
+    assert expected[-1] == '#' + 'Ωc' * TAPE_PAGE_SIZE + 'c' * 1000 + 'd'
+    for source in [string.encode('ascii'), bytearray(string.encode('ascii')), path,
+            chunks(string.encode('ascii'), 1000), chunks(string, 777)]:
+        assert outcome(machine.run(source)) == expected
+    assert machine.compute(path) == machine.compute(string)
+    empty = tmp_path / 'empty.txt'
+    empty.write_bytes(b'')
+    assert outcome(machine.run(empty)) == outcome(machine.run(''))
+
+def test_mapped_tape_reads_lazily():
+    read = []
+    def source():
+        for chunk in chunks(b'ab' * 5000, 100):
+            read.append(chunk)
+            yield chunk
+    tape = input_tape(source(), '#')
+    assert isinstance(tape, MappedTape) and not tape.complete
+    assert tape[150] == 'a' and len(read) < 5
+    copy = tape.copy()
+    assert tape.complete and len(read) == 100
+    copy[1] = 'Ω'
+    copy[10000] = 'x'
+    assert tape[1] == 'b' and tape.end == 10000
+    assert copy.to_string(0, 3) == 'aΩa' and copy.end == 10001
+
+def test_input_symbols_fit_in_a_byte():
+    tape = input_tape(iter(['ab', 'Ω']), '#')
+    with pytest.raises(Exception, match='Input symbols must fit in a byte'):
+        tape.to_string()
+    with pytest.raises(TypeError):
+        input_tape(42, '#')
@@ -0,0 +1,40 @@
+import itertools
+import pytest
+from dtm_simulator import Machine
+from dtm_simulator.core import TrackLayout
+
+def test_pack_unpack():
+    tracks = TrackLayout(3, 'abx', '#')
+    assert tracks.pack(('a', '#', '#')) == 'a'
+    for cell in itertools.product('#abx', repeat=3):
+        assert tracks.unpack(tracks.pack(cell)) == cell
+    packed = ''.join(tracks.pack(cell) for cell in [('a', 'x', '#'), ('b', '#', 'a')])
+    assert tracks.split(packed) == ['ab', 'x#', '#a']
+
+def test_invalid_layouts():
+    for count, alphabet in [(0, 'a'), (2, 'aa'), (2, 'a|'), (2, '#')]:
+        with pytest.raises(Exception):
+            TrackLayout(count, alphabet, '#')
+
+def test_marking_machine():
+    # accepts a^n b^n, marking the a and b matched on the second track
+    machine = Machine(6)
+    machine.set_init_state(1)
+    machine.set_final_state(5)
+    machine.set_tracks(2, 'abx')
+    for from_state, to_state, cnf in [
+            (1, 2, '(a|#,[=]|x,R)'), (1, 5, '(#|#,#|#,R)'),
+            (2, 2, '([ab]|[#x],[=]|[=],R)'), (2, 3, '(#|#,#|#,L)'),
+            (3, 3, '(b|x,[=]|[=],L)'), (3, 4, '(b|#,[=]|x,L)'),
+            (4, 4, '([ab]|[^x],[=]|[=],L)'), (4, 1, '(a|x,[=]|[=],R)'),
+            (1, 6, '(b|x,[=]|[=],R)'), (6, 6, '(b|x,[=]|[=],R)'), (6, 5, '(#|#,#|#,R)')]:
+        machine.add_transition(from_state, to_state, cnf)
+    with pytest.raises(Exception):
+        machine.set_tracks(3, 'ab')
+    for n in range(8):
+        for string in map(''.join, itertools.product('ab', repeat=n)):
+            expected = n % 2 == 0 and string == 'a' * (n // 2) + 'b' * (n // 2)
+            assert machine.run(string, max_steps=1000).accepted is expected, string
+    result = machine.run('aabb')
+    assert result.output == 'aabb|xxxx'
+    assert Machine.from_dict(machine.to_dict()).run('aabb').output == 'aabb|xxxx'